@@ -1,11 +1,90 @@
-from cosmogrb.config import cosmogrb_config
-from cosmogrb.io import GRBSave, grbsave_to_gbm_fits
-import cosmogrb.instruments.gbm as gbm
-
+import importlib
+import os
+import sys
 
-__all__ = ["gbm", "GRBSave", "grbsave_to_gbm_fits", "cosmogrb_config"]
+from cosmogrb.config import cosmogrb_config
 
 from ._version import get_versions
 
 __version__ = get_versions()["version"]
 del get_versions
+
+
+def _set_jit_cache_dir(version):
+
+    # if switched on, the numba kernels are cached on disk in a
+    # directory of this version, so a cache is never shared
+    # between versions. numba writes its cache files atomically
+    # so all the workers of a cluster can use the same directory.
+    # The directory of the user is kept and numba only reads its
+    # environment when it is imported
+
+    if not cosmogrb_config.jit_cache.on:
+
+        return
+
+    if ("NUMBA_CACHE_DIR" in os.environ) or ("numba" in sys.modules):
+
+        return
+
+    cache_dir = cosmogrb_config.jit_cache.cache_dir
+
+    if not cache_dir:
+
+        cache_dir = os.path.join("~", ".cosmogrb", "numba_cache")
+
+    cache_dir = os.path.join(os.path.expanduser(cache_dir), version)
+
+    # the environment is also passed on to new worker processes
+
+    os.environ["NUMBA_CACHE_DIR"] = cache_dir
+
+
+_set_jit_cache_dir(__version__)
+
+
+# the GBM machinery and the IO are only imported when they are
+# first used. Importing them reads the orbit and the response
+# database and pulls in the plotting stack
+
+_lazy_attributes = {
+    "gbm": ("cosmogrb.instruments.gbm", None),
+    "GRBSave": ("cosmogrb.io", "GRBSave"),
+    "grbsave_to_gbm_fits": ("cosmogrb.io", "grbsave_to_gbm_fits"),
+    "warmup": ("cosmogrb.utils.jit_warmup", "warmup"),
+}
+
+
+def __getattr__(name):
+
+    if name not in _lazy_attributes:
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _lazy_attributes[name]
+
+    value = importlib.import_module(module_name)
+
+    if attribute is not None:
+
+        value = getattr(value, attribute)
+
+    # cache it so that this is only called once
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+
+    return sorted(list(globals()) + list(_lazy_attributes))
+
+
+__all__ = [
+    "gbm",
+    "GRBSave",
+    "grbsave_to_gbm_fits",
+    "cosmogrb_config",
+    "warmup",
+]
@@ -39,6 +39,21 @@ class MultiProcess:
     n_grb_workers: int = 6
     n_universe_workers = 6
 
+    # average number of GRBs packed into one task by Universe.go.
+    # The batches are balanced by duration x peak flux and the
+    # detectors are simulated inside the task. 0 submits one
+    # task per GRB
+    grb_batch_size: int = 0
+
+    # the executors get the work in chunks of this many items
+    # and at most max_in_flight chunks are pending at once
+    chunk_size: int = 1
+    max_in_flight: int = 64
+
+    # threads that build the responses of the detectors of a
+    # GRB at the same time. 1 builds them one after the other
+    n_response_threads: int = 1
+
 
 @dataclass
 class Orbit:
@@ -46,10 +61,71 @@ class Orbit:
     use_random_time: bool = True
 
 
+@dataclass
+class ResponseCache:
+
+    # reuse the response of a detector for all GRBs in the same
+    # sky pixel (angular_tolerance degrees wide) and orbit time
+    # bin (time_tolerance seconds wide). The response is computed
+    # at the center of the pixel and bin
+    on: bool = False
+    angular_tolerance: float = 1.0
+    time_tolerance: float = 60.0
+    max_entries: int = 512
+
+    # also keep the responses in ~/.cosmogrb/response_cache
+    disk: bool = False
+
+
+@dataclass
+class ResponseAtlas:
+
+    # interpolate the responses from a precomputed atlas
+    # (see scripts/build_response_atlas.py) instead of
+    # generating them. An empty file name uses the atlas
+    # in ~/.cosmogrb/gbm_response_atlas.h5
+    on: bool = False
+    file_name: str = ""
+
+
 @dataclass
 class GBM:
 
     orbit: Orbit = Orbit()
+    response_cache: ResponseCache = ResponseCache()
+    response_atlas: ResponseAtlas = ResponseAtlas()
+
+
+@dataclass
+class Sampling:
+
+    # number of candidate times thinned per kernel call.
+    # 0 falls back to drawing one candidate at a time
+    thinning_block_size: int = 1024
+
+    # allowed interpolation error of the per detector rate
+    # table relative to the peak rate. 0 evaluates the
+    # folded rate for every candidate
+    rate_table_rtol: float = 1e-3
+    rate_table_max_points: int = 65537
+
+    # width in log(Ep) over which the photon energy CDF
+    # is reused. 0 falls back to rejection sampling
+    energy_cdf_resolution: float = 0.01
+
+
+@dataclass
+class JitCache:
+
+    # write the compiled numba kernels below this directory in
+    # one subdirectory per version of cosmogrb, so new processes
+    # load them instead of compiling. An empty path uses
+    # ~/.cosmogrb/numba_cache. This sets NUMBA_CACHE_DIR when
+    # cosmogrb is imported before numba, which also moves the
+    # caches of other libraries. Otherwise numba caches next to
+    # the sources. NUMBA_CACHE_DIR takes precedence
+    on: bool = False
+    cache_dir: str = ""
 
 
 @dataclass
@@ -58,6 +134,8 @@ class CosmogrbConfig:
     logging: Logging = Logging()
     gbm: GBM = GBM()
     multiprocess: MultiProcess = MultiProcess()
+    sampling: Sampling = Sampling()
+    jit_cache: JitCache = JitCache()
 
 
 # Read the default config
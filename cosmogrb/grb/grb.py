@@ -4,16 +4,16 @@ import abc
 import collections
 import logging
 
-import h5py
 import pandas as pd
-from dask.distributed import worker_client
-from IPython.display import display
 
 from cosmogrb import cosmogrb_config
+from cosmogrb.io.store import open_location
 from cosmogrb.sampler.source_function import SourceFunction
+from cosmogrb.utils.executor import executor_map
 from cosmogrb.utils.hdf5_utils import recursively_save_dict_contents_to_group
 from cosmogrb.utils.logging import setup_logger
 from cosmogrb.utils.meta import GRBMeta, RequiredParameter
+from cosmogrb.utils.rng import get_seed_sequence
 
 # from cosmogrb import cosmogrb_client
 
@@ -33,6 +33,7 @@ class GRB(object, metaclass=GRBMeta):
     def __init__(
         self,
         source_function_class=None,
+        seed=None,
         **kwargs,
     ):
         """
@@ -40,10 +41,13 @@ class GRB(object, metaclass=GRBMeta):
 
         :param name:
         :param verbose:
+        :param seed: an integer or SeedSequence from which all random streams of the GRB are derived
         :returns:
         :rtype:
 
         """
+
+        self._seed_sequence = get_seed_sequence(seed)
         self._source_params = {}
         self._required_params = {}
 
@@ -90,6 +94,10 @@ class GRB(object, metaclass=GRBMeta):
 
         pass
 
+    @property
+    def seed_sequence(self):
+        return self._seed_sequence
+
     def _add_background(self, name, background):
 
         self._backgrounds[name] = background
@@ -150,6 +158,15 @@ class GRB(object, metaclass=GRBMeta):
         ].display_energy_integrated_light_curve(time=time, ax=ax, **kwargs)
 
     def go(self, client=None, serial=False):
+        """
+        simulate the light curves of the GRB
+
+        :param client: a dask client or a concurrent.futures executor
+        :param serial: simulate the light curves one after the other
+        :returns:
+        :rtype:
+
+        """
 
         for key in self._required_names:
             assert (
@@ -168,33 +185,30 @@ class GRB(object, metaclass=GRBMeta):
             f"created a GRB with duration: {self.duration} and T0: {self.T0}"
         )
 
+        lightcurves = list(self._lightcurves.values())
+
         if not serial:
 
             if client is not None:
 
-                futures = client.map(
-                    process_lightcurve, self._lightcurves.values()
-                )
-
-                results = client.gather(futures)
+                results = executor_map(process_lightcurve, lightcurves, client)
 
             else:
 
-                with worker_client() as client:
+                # we are running inside a dask task so the
+                # light curves become tasks of their own
 
-                    futures = client.map(
-                        process_lightcurve, self._lightcurves.values()
-                    )
+                from dask.distributed import worker_client
 
-                    results = client.gather(futures)
+                with worker_client() as client:
 
-            del futures
+                    results = executor_map(
+                        process_lightcurve, lightcurves, client
+                    )
 
         else:
 
-            results = [
-                process_lightcurve(lc) for lc in self._lightcurves.values()
-            ]
+            results = executor_map(process_lightcurve, lightcurves)
 
         for lc in results:
 
@@ -204,16 +218,17 @@ class GRB(object, metaclass=GRBMeta):
 
     def save(self, file_name, clean_up=False):
         """
-        save the grb to an HDF5 file
+        save the grb to an HDF5 file or to a group
+        of a store (file.h5::/group)
 
 
-        :param file_name:
+        :param file_name: the location to save to
         :returns:
         :rtype:
 
         """
 
-        with h5py.File(file_name, "w") as f:
+        with open_location(file_name, "w") as f:
 
             # save the general
             f.attrs["grb_name"] = self.name
@@ -334,6 +349,8 @@ class GRB(object, metaclass=GRBMeta):
 
         if as_display:
 
+            from IPython.display import display
+
             std_df = pd.Series(data=std_dict, index=std_dict.keys())
 
             display(std_df.to_frame())
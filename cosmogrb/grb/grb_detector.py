@@ -1,9 +1,8 @@
 import abc
 
-import h5py
-
-from cosmogrb import GRBSave
-from cosmogrb.utils.hdf5_utils import recursively_save_dict_contents_to_group
+from cosmogrb.io.grb_save import GRBSave
+from cosmogrb.io.detector_save import DetectorSave
+from cosmogrb.io.store import detection_location
 
 
 class GRBDetector(object, metaclass=abc.ABCMeta):
@@ -18,7 +17,9 @@ class GRBDetector(object, metaclass=abc.ABCMeta):
 
         """
 
-        self._grb_save = GRBSave.from_file(grb_save_file_name)
+        # the detectors only need the events so they are read lazily
+
+        self._grb_save = GRBSave.from_file(grb_save_file_name, lazy=True)
 
         # make sure that this detector is correct for this instrument
 
@@ -32,9 +33,7 @@ class GRBDetector(object, metaclass=abc.ABCMeta):
         self._name = self._grb_save.name
         self._instrument = instrument
 
-        file_name_head = ".".join(grb_save_file_name.split(".")[:-1])
-
-        self._out_file_name = f"{file_name_head}_detection_info.h5"
+        self._out_file_name = detection_location(grb_save_file_name)
 
         self._extra_info = {}
 
@@ -49,19 +48,22 @@ class GRBDetector(object, metaclass=abc.ABCMeta):
 
         pass
 
-    def save(self):
+    def to_detector_save(self) -> DetectorSave:
+        """
+        the result of the detection
 
-        with h5py.File(self._out_file_name, "w") as f:
+        :returns:
+        :rtype:
 
-            f.attrs["is_detected"] = self._is_detected
-            f.attrs["name"] = self._name
-            f.attrs["instrument"] = self._instrument
+        """
 
-            # store any extra info if there is
-            # some.
+        return DetectorSave(
+            name=self._name,
+            is_detected=self._is_detected,
+            instrument=self._instrument,
+            extra_info=self._extra_info,
+        )
 
-            if self._extra_info:
+    def save(self):
 
-                recursively_save_dict_contents_to_group(
-                    f, "extra_info", self._extra_info
-                )
+        self.to_detector_save().write(self._out_file_name)
@@ -18,5 +18,9 @@ from cosmogrb.instruments.gbm.gbm_universe import (
     GBM_CPL_Constant_Universe,
     GBM_CPL_Universe,
 )
+from cosmogrb.instruments.gbm.response_atlas import (
+    ResponseAtlas,
+    build_response_atlas,
+)
 
 # __all__ = ["GBMGRB_CPL"]
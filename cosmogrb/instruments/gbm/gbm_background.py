@@ -1,3 +1,4 @@
+import functools
 import os
 
 from cosmogrb.sampler.background import Background, BackgroundSpectrumTemplate
@@ -21,8 +22,31 @@ _allowed_gbm_detectors = (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def get_background_spectrum_template(detector):
+    """
+    read the GBM background spectral template of a detector.
+    The template is only read once and then shared
+
+    :param detector:
+    :returns:
+    :rtype:
+
+    """
+
+    detector_file = get_path_of_data_file(
+        os.path.join("gbm_backgrounds", f"{detector}.h5")
+    )
+
+    return BackgroundSpectrumTemplate.from_file(
+        detector_file, start_at_one=False
+    )
+
+
 class GBMBackground(Background):
-    def __init__(self, tstart, tstop, average_rate=1000, detector=None):
+    def __init__(
+        self, tstart, tstop, average_rate=1000, detector=None, rng=None
+    ):
 
         assert (
             detector in _allowed_gbm_detectors
@@ -30,14 +54,8 @@ class GBMBackground(Background):
 
         # get the GBM background spectral template
 
-        detector_file = get_path_of_data_file(
-            os.path.join("gbm_backgrounds", f"{detector}.h5")
-        )
-
-        # create a template
-
-        background_spectrum_template = BackgroundSpectrumTemplate.from_file(
-            detector_file, start_at_one=False
+        background_spectrum_template = get_background_spectrum_template(
+            detector
         )
 
         # call the super class
@@ -47,4 +65,5 @@ class GBMBackground(Background):
             tstop=tstop,
             average_rate=average_rate,
             background_spectrum_template=background_spectrum_template,
+            rng=rng,
         )
@@ -0,0 +1,121 @@
+from typing import Tuple
+
+import numpy as np
+
+# the same conventions as gbm_drm_gen: the spacecraft axes
+# come from the attitude quaternion and the angles are an
+# azimuth in [0, 360) and an elevation above the x-y plane
+
+
+def radec_to_cartesian(ra: float, dec: float) -> np.ndarray:
+    """
+    the unit vector pointing to ra and dec
+
+    :param ra: in degrees
+    :param dec: in degrees
+    :returns:
+    :rtype:
+
+    """
+
+    ra = np.deg2rad(ra)
+    dec = np.deg2rad(dec)
+
+    return np.array(
+        [np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)]
+    )
+
+
+def spacecraft_axes(quaternion: np.ndarray) -> np.ndarray:
+    """
+    the x, y and z axes of the spacecraft in the sky frame.
+    The rows of the returned matrix rotate a sky vector into
+    the spacecraft frame
+
+    :param quaternion: (q1, q2, q3, q4) with q4 the scalar part
+    :returns:
+    :rtype:
+
+    """
+
+    q0, q1, q2, q3 = quaternion
+
+    return np.array(
+        [
+            [
+                q0 ** 2 - q1 ** 2 - q2 ** 2 + q3 ** 2,
+                2.0 * (q0 * q1 + q3 * q2),
+                2.0 * (q0 * q2 - q3 * q1),
+            ],
+            [
+                2.0 * (q0 * q1 - q3 * q2),
+                -(q0 ** 2) + q1 ** 2 - q2 ** 2 + q3 ** 2,
+                2.0 * (q1 * q2 + q3 * q0),
+            ],
+            [
+                2.0 * (q0 * q2 + q3 * q1),
+                2.0 * (q1 * q2 - q3 * q0),
+                -(q0 ** 2) - q1 ** 2 + q2 ** 2 + q3 ** 2,
+            ],
+        ]
+    )
+
+
+def _vector_to_angles(vector: np.ndarray) -> Tuple[float, float]:
+
+    az = np.arctan2(vector[1], vector[0])
+
+    if az < 0.0:
+
+        az += 2 * np.pi
+
+    zenith = np.arctan2(np.sqrt(vector[0] ** 2 + vector[1] ** 2), vector[2])
+
+    return np.rad2deg(az), 90.0 - np.rad2deg(zenith)
+
+
+def spacecraft_coordinates(
+    ra: float, dec: float, quaternion: np.ndarray
+) -> Tuple[float, float]:
+    """
+    the azimuth and elevation of a sky position in
+    the spacecraft frame
+
+    :param ra: in degrees
+    :param dec: in degrees
+    :param quaternion:
+    :returns: (az, el) in degrees
+    :rtype:
+
+    """
+
+    return _vector_to_angles(
+        spacecraft_axes(quaternion).dot(radec_to_cartesian(ra, dec))
+    )
+
+
+def earth_coordinates(
+    quaternion: np.ndarray, sc_pos: np.ndarray
+) -> Tuple[float, float]:
+    """
+    the azimuth and elevation of the center of the earth
+    in the spacecraft frame
+
+    :param quaternion:
+    :param sc_pos: the position of the spacecraft
+    :returns: (az, el) in degrees
+    :rtype:
+
+    """
+
+    geo_dir = -spacecraft_axes(quaternion).dot(np.asarray(sc_pos, float))
+
+    return _vector_to_angles(geo_dir / np.sqrt(geo_dir.dot(geo_dir)))
+
+
+__all__ = [
+    "radec_to_cartesian",
+    "spacecraft_axes",
+    "spacecraft_coordinates",
+    "earth_coordinates",
+]
@@ -1,15 +1,17 @@
+import functools
 import logging
+
 import numpy as np
-from time import time
 
+from cosmogrb import cosmogrb_config
 from cosmogrb.grb import GRB, SourceParameter
 from cosmogrb.instruments.gbm.gbm_background import GBMBackground
 from cosmogrb.instruments.gbm.gbm_lightcurve import GBMLightCurve
-from cosmogrb.instruments.gbm.gbm_orbit import gbm_orbit
 from cosmogrb.instruments.gbm.gbm_response import BGOResponse, NaIResponse
 from cosmogrb.sampler.constant_cpl import ConstantCPL
 from cosmogrb.sampler.cpl_source import CPLSourceFunction
 from cosmogrb.sampler.source import Source
+from cosmogrb.utils.executor import executor_map, thread_pool
 from cosmogrb.utils.logging import setup_logger
 
 logger = setup_logger(__name__)
@@ -64,6 +66,7 @@ class GBMGRB(GRB):
                 source_function,
                 z=self.z,
                 use_plaw_sample=self._use_plaw_sample,
+                rng=np.random.default_rng(self._source_seeds[key]),
             )
 
             lc = GBMLightCurve(
@@ -81,37 +84,82 @@ class GBMGRB(GRB):
 
             self._add_lightcurve(lc)
 
+    def _create_response(self, det, orbit_seed):
+        """
+        build the response of a detector. Every detector draws
+        from the same orbit stream so that all are at the same
+        time in orbit
+
+        :param det:
+        :param orbit_seed:
+        :returns:
+        :rtype:
+
+        """
+
+        rng = np.random.default_rng(orbit_seed)
+
+        if det[0] == "b":
+
+            logger.debug(f"creating BGO reponse for {det} via grb {self.name}")
+
+            return BGOResponse(
+                det, self.ra, self.dec, save=False, name=self.name, rng=rng
+            )
+
+        logger.debug(f"creating NAI reponse for {det} via GRB {self.name}")
+
+        return NaIResponse(
+            det, self.ra, self.dec, save=False, name=self.name, rng=rng
+        )
+
     def _setup(self):
 
-        # set a random seed to make sure that all detectors are set at same 
-        # same random time in orbit = same location in orbit for one GRB
+        # derive the streams of the orbit and of each detector
+        # from the seed of the GRB. The orbit stream is shared so that
+        # all detectors are set at the same random time in orbit
+        # = same location in orbit for one GRB
 
-        random_seed = int(str(int(time()))[::-1])
+        orbit_seed, *detector_seeds = self._seed_sequence.spawn(
+            len(self._gbm_detectors) + 1
+        )
 
-        for det in self._gbm_detectors:
+        self._source_seeds = {}
 
-            rng = np.random.default_rng(seed=random_seed)
+        background_seeds = {}
 
-            if det[0] == "b":
+        for det, detector_seed in zip(self._gbm_detectors, detector_seeds):
 
-                logger.debug(
-                    f"creating BGO reponse for {det} via grb {self.name}"
-                )
+            source_seed, background_seed = detector_seed.spawn(2)
 
-                rsp = BGOResponse(
-                    det, self.ra, self.dec, save=False, name=self.name, rng=rng
-                )
+            self._source_seeds[det] = source_seed
 
-            else:
+            background_seeds[det] = background_seed
 
-                logger.debug(
-                    f"creating NAI reponse for {det} via GRB {self.name}"
-                )
+        # the responses are independent of each other and
+        # are the most expensive part so they can be built
+        # by several threads
+
+        n_threads: int = cosmogrb_config.multiprocess.n_response_threads
+
+        create_response = functools.partial(
+            self._create_response, orbit_seed=orbit_seed
+        )
+
+        if n_threads > 1:
+
+            with thread_pool(n_threads) as executor:
 
-                rsp = NaIResponse(
-                    det, self.ra, self.dec, save=False, name=self.name, rng=rng
+                responses = executor_map(
+                    create_response, self._gbm_detectors, executor
                 )
 
+        else:
+
+            responses = executor_map(create_response, self._gbm_detectors)
+
+        for det, rsp in zip(self._gbm_detectors, responses):
+
             self._add_response(det, rsp)
 
             bkg = GBMBackground(
@@ -119,6 +167,7 @@ class GBMGRB(GRB):
                 self._background_stop,
                 average_rate=500,
                 detector=det,
+                rng=np.random.default_rng(background_seeds[det]),
             )
 
             self._add_background(det, bkg)
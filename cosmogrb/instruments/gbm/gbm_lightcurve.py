@@ -41,19 +41,19 @@ class GBMLightCurve(LightCurve):
 
     def _filter_deadtime(self):
 
-        n_intervals = len(self._times)
-        time, pha, selection = _gbm_dead_time(
-            self._times, self._pha, n_intervals
-        )
+        n_counts = len(self._times)
+
+        # the events are compacted in place
 
-        selection = np.array(selection, dtype=bool)
+        n_selected = _gbm_dead_time(self._times, self._pha, self._is_source)
 
         logger.debug(
-            f"{self._grb_name} {self._name}: now has {sum(selection)} from {len(selection)} counts"
+            f"{self._grb_name} {self._name}: now has {n_selected} from {n_counts} counts"
         )
 
-        self._times = time[selection]
-        self._pha = pha[selection]
+        self._times = self._times[:n_selected]
+        self._pha = self._pha[:n_selected]
+        self._is_source = self._is_source[:n_selected]
 
     def write_tte(self):
 
@@ -77,39 +77,54 @@ class GBMLightCurve(LightCurve):
         tte_file.writeto(f"{self._grb_name}_{self._name}.fits", overwrite=True)
 
 
-@nb.njit(fastmath=True)
-def _gbm_dead_time(time, pha, n_intervals):
+@nb.njit(fastmath=True, nogil=True, cache=True)
+def _gbm_dead_time(time, pha, is_source, overflow_channel=127):
+    """
+    filter the sorted events for the non-paralyzable GBM
+    dead time. Every recorded event blocks the detector for
+    2.6 us or 10.6 us if it lands in the overflow channel.
+    The recorded events are moved to the front of the arrays
+    in place and their number is returned
 
-    dead_time = 2.6e-6
-    overflow_dead_Time = 10.6e-6
-    par_dead_time = 0.5e-6
+    :param time:
+    :param pha:
+    :param is_source:
+    :param overflow_channel:
+    :returns: the number of recorded events
+    :rtype:
 
-    filtered_time = np.zeros(n_intervals)
-    filtered_pha = np.zeros(n_intervals)
-    selection = np.zeros(n_intervals)
+    """
 
-    filtered_time[0] = time[0]
-    filtered_pha[0] = pha[0]
-    selection[0] = True
+    dead_time = 2.6e-6
+    overflow_dead_time = 10.6e-6
 
-    if pha[0] == 127:
+    n_intervals = time.shape[0]
 
-        t_end = time[0] + overflow_dead_Time
+    n_selected = 0
 
-    else:
+    if n_intervals == 0:
+        return n_selected
 
-        t_end = time[0] + dead_time
+    # the detector is live before the first event
 
-    t_end_par = time[0] + par_dead_time
+    t_end = time[0] - 1.0
 
-    for i in range(1, n_intervals):
+    for i in range(n_intervals):
 
         if time[i] > t_end:
-            filtered_time[i] = time[i]
-            filtered_pha[i] = pha[i]
-            selection[i] = True
-            if pha[i] == 127:
 
-                t_end = time[i] + overflow_dead_Time
+            time[n_selected] = time[i]
+            pha[n_selected] = pha[i]
+            is_source[n_selected] = is_source[i]
+
+            n_selected += 1
+
+            if pha[i] == overflow_channel:
+
+                t_end = time[i] + overflow_dead_time
+
+            else:
+
+                t_end = time[i] + dead_time
 
-    return filtered_time, filtered_pha, selection
+    return n_selected
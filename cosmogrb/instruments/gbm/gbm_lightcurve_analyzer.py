@@ -1,12 +1,10 @@
 from typing import Any, Dict, List, Optional
 
-import dask
 import numba as nb
 import numpy as np
 
 from cosmogrb.lightcurve import LightCurveAnalyzer
 from cosmogrb.utils.logging import setup_logger
-from cosmogrb.utils.time_interval import TimeIntervalSet
 
 logger = setup_logger(__name__)
 
@@ -62,36 +60,21 @@ class GBMLightCurveAnalyzer(LightCurveAnalyzer):
 
     def _compute_detection(self):
 
-        # first we just need to compute the dead_time per intervals
-
-        bins, counts = self._lightcurve.binned_counts(
-            self._base_timescale, emin=None, emax=None, tmin=None, tmax=None
+        starts, band_counts, exposure = _trigger_binning(
+            self._lightcurve,
+            self._dead_time_per_event,
+            self._base_timescale,
+            list(self._trigger_energy_ranges.values()),
         )
 
-        starts = bins[:, 0]
-        stops = bins[:, 1]
-
-        dead_time_per_interval = [
-            self.dead_time_of_interval(x, y) for x, y in bins
-        ]
-
-        #        self._dead_time_per_interval = dask.compute(*dead_time_per_interval)
         # go thru each energy range and look for a detection
 
-        for k, (emin, emax) in self._trigger_energy_ranges.items():
+        for counts, (k, (emin, emax)) in zip(
+            band_counts, self._trigger_energy_ranges.items()
+        ):
 
             logger.debug(f"checking energy rage {emin}-{emax}")
 
-            _, counts = self._lightcurve.binned_counts(
-                self._base_timescale, emin, emax, tmin=None, tmax=None
-            )
-
-            # now build a time interval set
-
-            ts = TimeIntervalSet.from_starts_and_stops(
-                starts, stops, counts, dead_time_per_interval
-            )
-
             # now check each of the GBM trigger time scales
 
             if sum(counts) == 0:
@@ -102,28 +85,32 @@ class GBMLightCurveAnalyzer(LightCurveAnalyzer):
 
                 continue
 
-            for time_scale in self._trigger_time_scales[k]:
+            # check all the GBM trigger time scales in one sweep
 
-                logger.debug(f"checking time scale {time_scale}")
+            time_scales = self._trigger_time_scales[k]
 
-                n_bins_src = int(np.floor(time_scale / self._base_timescale))
+            n_bins_src = np.array(
+                [int(np.floor(t / self._base_timescale)) for t in time_scales]
+            )
 
-                detected, time = _run_trigger(
-                    self._n_bins_background,
-                    self._n_bins_pre,
-                    n_bins_src,
-                    starts,
-                    stops,
-                    counts,
-                    ts.exposures,
-                    self._threshold,
-                )
+            detected, times = _run_trigger(
+                self._n_bins_background,
+                self._n_bins_pre,
+                n_bins_src,
+                starts,
+                counts,
+                exposure,
+                self._threshold,
+            )
+
+            # the first time scale with a detection wins
+            # just as if they were searched in order
 
-                # if there is a detection we can stop
-                # because there is no need to search
-                # for more
+            for time_scale, is_detected, time in zip(
+                time_scales, detected, times
+            ):
 
-                if detected:
+                if is_detected:
 
                     logger.debug(
                         f"found detection for energy range {emin}-{emax} at timescale {time_scale}"
@@ -175,17 +162,196 @@ class GBMLightCurveAnalyzer(LightCurveAnalyzer):
 
         """
 
-        # get the selection of counts for this interval
-        idx = self._lightcurve.get_idx_over_interval(tmin, tmax)
-
-        dead_time = self._dead_time_per_event[idx].sum()
+        # the events are sorted so the interval is a slice
+        i_min, i_max = np.searchsorted(self._lightcurve.times, [tmin, tmax])
 
-        #        dead_time = _sum_dead_time(self._dead_time_per_event[idx], len(idx))
+        dead_time = self._dead_time_per_event[i_min:i_max].sum()
 
         return dead_time
 
 
-@nb.njit(fastmath=True, parallel=False, cache=False, nogil=True)
+def _trigger_binning(lightcurve, dead_time_per_event, dt, energy_ranges):
+    """
+    bin the light curve for the trigger. All energy ranges
+    and the dead time, which gives the exposure of each bin,
+    are binned in one pass over the events
+
+    :param lightcurve:
+    :param dead_time_per_event:
+    :param dt: the base time scale
+    :param energy_ranges: list of (emin, emax)
+    :returns: (starts, counts per energy range, exposure)
+    :rtype:
+
+    """
+
+    bins, band_counts, dead_time_per_interval = (
+        lightcurve.binned_counts_multi_band(
+            dt, energy_ranges, weights=dead_time_per_event
+        )
+    )
+
+    starts = bins[:, 0]
+    stops = bins[:, 1]
+
+    exposure = (stops - starts) - dead_time_per_interval
+
+    return starts, band_counts, exposure
+
+
+def evaluate_detectors(
+    lightcurves,
+    threshold: float = 4.5,
+    background_duration: float = 17,
+    pre_window: float = 4.0,
+    parallel: bool = False,
+):
+    """
+    run the GBM trigger on several light curves at once. For
+    each energy range, the significance of every window of all
+    detectors is computed in one batched kernel and the detections
+    are then read off the (detector x bin x time scale) cube. The
+    result is the same as running a GBMLightCurveAnalyzer on each
+    light curve
+
+    :param lightcurves: list of LightCurveStorage
+    :param threshold: the trigger threshold
+    :param background_duration: the duration of the background window
+    :param pre_window: the gap between the background and source windows
+    :param parallel: use numba prange over the detectors
+    :returns: (detected, detection_times, detection_time_scales)
+    :rtype:
+
+    """
+
+    n_detectors = len(lightcurves)
+
+    detected = np.zeros(n_detectors, dtype=bool)
+    detection_times = np.zeros(n_detectors)
+    detection_time_scales = np.zeros(n_detectors)
+
+    n_bins_background = int(np.floor(background_duration / _base_timescale))
+    n_bins_pre = int(np.floor(pre_window / _base_timescale))
+
+    # light curves without source counts can never trigger
+
+    active = [i for i, lc in enumerate(lightcurves) if lc.n_counts_source > 0]
+
+    if not active:
+
+        return detected, detection_times, detection_time_scales
+
+    binned = []
+
+    for i in active:
+
+        lc = lightcurves[i]
+
+        dead_time_per_event = _calculate_dead_time_per_event(lc.times, lc.pha)
+
+        binned.append(
+            _trigger_binning(
+                lc,
+                dead_time_per_event,
+                _base_timescale,
+                list(_trigger_energy_ranges.values()),
+            )
+        )
+
+    # pad the detectors to a common number of bins. Each keeps
+    # its own bins and windows never reach into the padding
+
+    n_bins = np.array([len(starts) for starts, _, _ in binned], dtype=np.int64)
+
+    max_bins = n_bins.max()
+
+    starts = np.zeros((len(active), max_bins))
+    exposure = np.zeros((len(active), max_bins))
+    counts = np.zeros(
+        (len(_trigger_energy_ranges), len(active), max_bins), dtype=np.int64
+    )
+
+    for row, (s, c, e) in enumerate(binned):
+
+        starts[row, : n_bins[row]] = s
+        exposure[row, : n_bins[row]] = e
+        counts[:, row, : n_bins[row]] = c
+
+    if parallel:
+
+        significance_cube = _significance_cube_parallel
+        first_detections = _first_detections_parallel
+
+    else:
+
+        significance_cube = _significance_cube
+        first_detections = _first_detections
+
+    for b, k in enumerate(_trigger_energy_ranges):
+
+        # only the detectors that have not triggered in a
+        # previous energy range and have counts in this one
+
+        rows = np.array(
+            [
+                row
+                for row, i in enumerate(active)
+                if (not detected[i]) and (counts[b, row].sum() > 0)
+            ],
+            dtype=np.int64,
+        )
+
+        if len(rows) == 0:
+
+            continue
+
+        time_scales = _trigger_time_scales[k]
+
+        n_bins_src = np.array(
+            [int(np.floor(t / _base_timescale)) for t in time_scales]
+        )
+
+        sig = significance_cube(
+            n_bins_background,
+            n_bins_pre,
+            n_bins_src,
+            n_bins[rows],
+            counts[b, rows],
+            exposure[rows],
+        )
+
+        found, times = first_detections(
+            sig,
+            starts[rows],
+            n_bins[rows],
+            n_bins_background,
+            n_bins_pre,
+            n_bins_src,
+            threshold,
+        )
+
+        # the first time scale with a detection wins
+
+        for j, row in enumerate(rows):
+
+            for time_scale, is_detected, time in zip(
+                time_scales, found[j], times[j]
+            ):
+
+                if is_detected:
+
+                    i = active[row]
+
+                    detected[i] = True
+                    detection_times[i] = time
+                    detection_time_scales[i] = time_scale
+
+                    break
+
+    return detected, detection_times, detection_time_scales
+
+
+@nb.njit(fastmath=True, parallel=False, cache=True, nogil=True)
 def _sum_dead_time(dead_time_per_event, N):
 
     dead_time = 0.0
@@ -196,53 +362,244 @@ def _sum_dead_time(dead_time_per_event, N):
     return dead_time
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def _run_trigger(
     n_bins_background,
-    n_bins_source,
     n_bins_pre,
+    n_bins_sources,
     starts,
-    stops,
     counts,
     exposure,
     threshold,
 ):
+    """
+    slide the background, pre and source windows over the
+    light curve for all source time scales at once. The window
+    sums come from cumulative sums so each is O(1)
+
+    :param n_bins_background: number of bins in the background window
+    :param n_bins_pre: number of bins between the background and source
+    :param n_bins_sources: array of the number of bins of each source window
+    :param starts: the starts of the bins
+    :param counts: the counts per bin
+    :param exposure: the exposure per bin
+    :param threshold: the significance threshold
+    :returns: (detected, time) for each source window
+    :rtype:
 
-    for i in range(len(counts)):
+    """
+
+    N = counts.shape[0]
+
+    n_time_scales = n_bins_sources.shape[0]
+
+    cum_counts = np.zeros(N + 1, dtype=np.int64)
+    cum_exposure = np.zeros(N + 1)
+
+    for i in range(N):
+
+        cum_counts[i + 1] = cum_counts[i] + counts[i]
+        cum_exposure[i + 1] = cum_exposure[i] + exposure[i]
+
+    detected = np.zeros(n_time_scales, dtype=np.bool_)
+    detection_times = np.zeros(n_time_scales)
+
+    # a time scale is done once it triggered or its
+    # windows have walked off the end of the light curve
+
+    done = np.zeros(n_time_scales, dtype=np.bool_)
+
+    n_left = n_time_scales
 
-        if i + n_bins_background + n_bins_pre + n_bins_source < len(stops):
+    for i in range(N):
 
-            # bkg_exposure = starts[i + n_bins_background] - starts[i]
-            bkg_exposure = exposure[i : i + n_bins_background].sum()
+        if n_left == 0:
+            break
 
-            background_counts = counts[i : i + n_bins_background].sum()
+        bkg_stop = i + n_bins_background
 
-            # src
+        bkg_exposure = cum_exposure[bkg_stop] - cum_exposure[i]
+
+        background_counts = cum_counts[bkg_stop] - cum_counts[i]
+
+        src_idx = bkg_stop + n_bins_pre
+
+        for j in range(n_time_scales):
+
+            if done[j]:
+                continue
+
+            if src_idx + n_bins_sources[j] >= N:
+
+                done[j] = True
+                n_left -= 1
+
+                continue
 
-            src_idx = i + n_bins_background + n_bins_pre
+            src_stop = src_idx + n_bins_sources[j]
 
-            # src_exposure = starts[src_idx + n_bins_source] - starts[src_idx]
-            src_exposure = exposure[src_idx : src_idx + n_bins_source].sum()
+            src_exposure = cum_exposure[src_stop] - cum_exposure[src_idx]
 
-            src_counts = counts[src_idx : src_idx + n_bins_source].sum()
+            src_counts = cum_counts[src_stop] - cum_counts[src_idx]
 
             sig = dumb_significance(
                 src_counts, background_counts, src_exposure, bkg_exposure
             )
 
-            # print(f"sig: {sig}")
             if (sig >= threshold) and (starts[src_idx] > -1.0):
 
-                return True, starts[src_idx]
+                detected[j] = True
+                detection_times[j] = starts[src_idx]
+
+                done[j] = True
+                n_left -= 1
+
+    return detected, detection_times
+
+
+def _significance_cube_kernel(
+    n_bins_background, n_bins_pre, n_bins_sources, n_bins, counts, exposure
+):
+    """
+    the significance of every source window of several light
+    curves. The windows are laid out as in _run_trigger with
+    the first index the start of the background window.
+    Windows that run off the end of a light curve are zero
+
+    :param n_bins_background: number of bins in the background window
+    :param n_bins_pre: number of bins between the background and source
+    :param n_bins_sources: array of the number of bins of each source window
+    :param n_bins: the number of bins of each light curve
+    :param counts: the (padded) counts per detector and bin
+    :param exposure: the (padded) exposure per detector and bin
+    :returns: significance (detector x bin x time scale)
+    :rtype:
+
+    """
+
+    n_detectors, max_bins = counts.shape
+
+    n_time_scales = n_bins_sources.shape[0]
+
+    sig = np.zeros((n_detectors, max_bins, n_time_scales))
+
+    for d in nb.prange(n_detectors):
+
+        N = n_bins[d]
+
+        cum_counts = np.zeros(N + 1, dtype=np.int64)
+        cum_exposure = np.zeros(N + 1)
+
+        for i in range(N):
+
+            cum_counts[i + 1] = cum_counts[i] + counts[d, i]
+            cum_exposure[i + 1] = cum_exposure[i] + exposure[d, i]
+
+        for i in range(N):
+
+            bkg_stop = i + n_bins_background
+
+            src_idx = bkg_stop + n_bins_pre
+
+            if src_idx >= N:
+                break
+
+            bkg_exposure = cum_exposure[bkg_stop] - cum_exposure[i]
+
+            background_counts = cum_counts[bkg_stop] - cum_counts[i]
+
+            for j in range(n_time_scales):
+
+                if src_idx + n_bins_sources[j] >= N:
+                    continue
+
+                src_stop = src_idx + n_bins_sources[j]
+
+                src_exposure = cum_exposure[src_stop] - cum_exposure[src_idx]
+
+                src_counts = cum_counts[src_stop] - cum_counts[src_idx]
+
+                sig[d, i, j] = dumb_significance(
+                    src_counts, background_counts, src_exposure, bkg_exposure
+                )
+
+    return sig
+
+
+def _first_detections_kernel(
+    sig,
+    starts,
+    n_bins,
+    n_bins_background,
+    n_bins_pre,
+    n_bins_sources,
+    threshold,
+):
+    """
+    find the first window above threshold of each detector
+    and time scale in a significance cube
+
+    :param sig: significance (detector x bin x time scale)
+    :param starts: the (padded) starts of the bins of each detector
+    :param n_bins: the number of bins of each light curve
+    :param n_bins_background: number of bins in the background window
+    :param n_bins_pre: number of bins between the background and source
+    :param n_bins_sources: array of the number of bins of each source window
+    :param threshold: the significance threshold
+    :returns: (detected, time) per detector and time scale
+    :rtype:
+
+    """
+
+    n_detectors = sig.shape[0]
+
+    n_time_scales = n_bins_sources.shape[0]
+
+    detected = np.zeros((n_detectors, n_time_scales), dtype=np.bool_)
+    detection_times = np.zeros((n_detectors, n_time_scales))
+
+    for d in nb.prange(n_detectors):
+
+        N = n_bins[d]
+
+        for j in range(n_time_scales):
+
+            for i in range(N):
+
+                src_idx = i + n_bins_background + n_bins_pre
+
+                if src_idx + n_bins_sources[j] >= N:
+                    break
+
+                if (sig[d, i, j] >= threshold) and (starts[d, src_idx] > -1.0):
+
+                    detected[d, j] = True
+                    detection_times[d, j] = starts[d, src_idx]
+
+                    break
+
+    return detected, detection_times
+
 
-                # return sig, starts[src_idx + n_bins_source]
+# numba keys its cache by the python function and not by
+# the flags, so only the serial variants are written to disk
 
-        else:
+_significance_cube = nb.njit(fastmath=True, cache=True)(
+    _significance_cube_kernel
+)
+_significance_cube_parallel = nb.njit(
+    fastmath=True, parallel=True, cache=False
+)(_significance_cube_kernel)
 
-            return False, 0
+_first_detections = nb.njit(fastmath=True, cache=True)(
+    _first_detections_kernel
+)
+_first_detections_parallel = nb.njit(
+    fastmath=True, parallel=True, cache=False
+)(_first_detections_kernel)
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def _calculate_dead_time_per_event(times, pha):
     """
     Computes an array of deadtimes following the perscription of Meegan et al. (2009).
@@ -261,7 +618,7 @@ def _calculate_dead_time_per_event(times, pha):
     return dead_time_per_event
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def dumb_significance(Non, Noff, on_exposure, off_exposure):
 
     alpha = on_exposure / off_exposure
@@ -1,3 +1,5 @@
+import threading
+
 import numpy as np
 from gbmgeometry import PositionInterpolator
 
@@ -48,6 +50,13 @@ class GBMOrbit(object):
         """
         return self._T0
 
+    @property
+    def maximum_time(self):
+        """
+        The latest time relative to T0 a GRB can occur at
+        """
+        return self._maximum_time
+
     def random_time(self,rng):
 
         # sample from chosen random number generator 
@@ -72,4 +81,42 @@ class GBMOrbit(object):
         return self._interpolator.met(time)
 
 
-gbm_orbit = GBMOrbit()
+# the orbit is read from the position history when it is first
+# used so that importing cosmogrb does not have to
+
+_gbm_orbit = None
+
+_gbm_orbit_lock = threading.Lock()
+
+
+def get_gbm_orbit() -> GBMOrbit:
+    """
+    the GBM orbit of this process. It is built on first use
+
+    :returns:
+    :rtype:
+
+    """
+
+    global _gbm_orbit
+
+    if _gbm_orbit is None:
+
+        with _gbm_orbit_lock:
+
+            if _gbm_orbit is None:
+
+                _gbm_orbit = GBMOrbit()
+
+    return _gbm_orbit
+
+
+def __getattr__(name):
+
+    # gbm_orbit is still a module attribute but is built lazily
+
+    if name == "gbm_orbit":
+
+        return get_gbm_orbit()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,8 +5,12 @@ from astropy.coordinates import SkyCoord
 from gbmgeometry import PositionInterpolator, gbm_detector_list
 
 from cosmogrb import cosmogrb_config
-from cosmogrb.instruments.gbm.gbm_orbit import gbm_orbit
-from cosmogrb.instruments.gbm.response_generator import gbm_response_generator
+from cosmogrb.instruments.gbm.gbm_geometry import spacecraft_coordinates
+from cosmogrb.instruments.gbm.gbm_orbit import get_gbm_orbit
+from cosmogrb.instruments.gbm.response_atlas import get_response_atlas
+from cosmogrb.instruments.gbm.response_generator import (
+    get_gbm_response_generator,
+)
 from cosmogrb.response.response import Response
 from cosmogrb.utils.package_utils import get_path_of_data_file
 
@@ -74,7 +78,7 @@ class GBMResponse(Response):
             # make sure to put all detectors at same position 
             # in orbit by passing random number generator
 
-            time: float = gbm_orbit.random_time(rng)
+            time: float = get_gbm_orbit().random_time(rng)
 
         else:
 
@@ -92,7 +96,7 @@ class GBMResponse(Response):
 
         self._setup_gbm_geometry(detector_name, ra, dec)
 
-        # tmin, tmax = gbm_orbit.position_interpolator.minmax_time()
+        # tmin, tmax = get_gbm_orbit().position_interpolator.minmax_time()
 
         # assert time < tmax, "the time specified is out of bounds for the poshist"
 
@@ -102,7 +106,7 @@ class GBMResponse(Response):
         self._detector_name: str = detector_name
 
         # compute the trigger time
-        self._trigger_time: float = gbm_orbit.met(time)
+        self._trigger_time: float = get_gbm_orbit().met(time)
 
         if save:
             assert name is not None, "if you want to save, you must have a name"
@@ -130,10 +134,12 @@ class GBMResponse(Response):
         self, detector_name: str, ra: float, dec: float
     ) -> None:
 
+        position_interpolator = get_gbm_orbit().position_interpolator
+
         # get the detector
         detector = gbm_detector_list[detector_name](
-            sc_pos=gbm_orbit.position_interpolator.sc_pos(self._time),
-            quaternion=gbm_orbit.position_interpolator.quaternion(self._time),
+            sc_pos=position_interpolator.sc_pos(self._time),
+            quaternion=position_interpolator.quaternion(self._time),
         )
 
         # make a scky coordinate
@@ -181,20 +187,54 @@ class GBMResponse(Response):
 
         """
 
-        # since this is now done with a singleton it
-        # may cause some race conditions
+        if cosmogrb_config.gbm.response_atlas.on:
+
+            return self._interpolate_matrix(detector_name, ra, dec)
+
+        # generating a response does not change the singleton
+        # so this is safe in threads. The matrix may come from
+        # its cache (see gbm.response_cache)
 
         # gbm_response_generator.set_time(self._time, detector_name)
         # matrix = gbm_response_generator.set_location(ra, dec, detector_name)
 
-        matrix = gbm_response_generator.generate_response(
+        response_generator = get_gbm_response_generator()
+
+        matrix = response_generator.generate_response(
             ra, dec, self._time, detector_name
         )
 
         return (
             matrix,
-            gbm_response_generator.mc_energies[detector_name],
-            gbm_response_generator.ebounds[detector_name],
+            response_generator.mc_energies[detector_name],
+            response_generator.ebounds[detector_name],
+        )
+
+    def _interpolate_matrix(self, detector_name, ra, dec):
+        """
+        interpolate the response matrix from the atlas after
+        rotating the GRB into the spacecraft frame
+
+        :param detector_name:
+        :param ra:
+        :param dec:
+        :returns:
+        :rtype:
+
+        """
+
+        atlas = get_response_atlas()
+
+        quaternion = get_gbm_orbit().position_interpolator.quaternion(
+            self._time
+        )
+
+        az, el = spacecraft_coordinates(ra, dec, quaternion)
+
+        return (
+            atlas.interpolate(detector_name, az, el),
+            atlas.mc_energies[detector_name],
+            atlas.ebounds[detector_name],
         )
 
     @property
@@ -217,7 +257,7 @@ class GBMResponse(Response):
     def T0(self):
 
         # THIS MIGHT BE WRONG!
-        return gbm_orbit.met(self._time)
+        return get_gbm_orbit().met(self._time)
 
     @property
     def detector_name(self) -> str:
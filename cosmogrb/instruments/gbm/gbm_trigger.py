@@ -5,6 +5,7 @@ import numpy as np
 from cosmogrb.grb.grb_detector import GRBDetector
 from cosmogrb.instruments.gbm.gbm_lightcurve_analyzer import (
     GBMLightCurveAnalyzer,
+    evaluate_detectors,
 )
 from cosmogrb.utils.logging import setup_logger
 
@@ -18,6 +19,8 @@ class GBMTrigger(GRBDetector):
         threshold: float = 4.5,
         simul_trigger_window: float = 0.5,
         max_n_dets: int = 12,
+        batched: bool = False,
+        parallel: bool = False,
     ) -> None:
         """
 
@@ -30,6 +33,8 @@ class GBMTrigger(GRBDetector):
         :param threshold: the trigger threshold to use
         :param simul_trigger_window: the +/- window for simultaneous triggers
         :param max_n_dets: the maximum number of detectors to test
+        :param batched: evaluate all the detectors at once in batched kernels
+        :param parallel: run the batched kernels in parallel over the detectors
         :returns:
         :rtype:
 
@@ -40,6 +45,8 @@ class GBMTrigger(GRBDetector):
         self._threshold: float = threshold
         self._simul_trigger_window: float = simul_trigger_window
         self._max_n_dets: int = max_n_dets
+        self._batched: bool = batched
+        self._parallel: bool = parallel
 
         self._triggered_times: List[float] = []
         self._triggered_detectors: List[int] = []
@@ -116,6 +123,50 @@ class GBMTrigger(GRBDetector):
 
         return detected
 
+    def _evaluate_serial(self, lc_names):
+        """
+        analyze the detectors one after the other. This is
+        lazy so that the detectors after a detection are
+        never analyzed
+
+        :param lc_names:
+        :returns:
+        :rtype:
+
+        """
+
+        for name in lc_names:
+
+            lc = self._grb_save[name]["lightcurve"]
+
+            lc_analyzer = GBMLightCurveAnalyzer(
+                lightcurve=lc, threshold=self._threshold
+            )
+
+            yield (
+                lc_analyzer.is_detected,
+                lc_analyzer.detection_time,
+                lc_analyzer.detection_time_scale,
+            )
+
+    def _evaluate_batched(self, lc_names):
+        """
+        analyze all the detectors at once
+
+        :param lc_names:
+        :returns:
+        :rtype:
+
+        """
+
+        lightcurves = [self._grb_save[name]["lightcurve"] for name in lc_names]
+
+        detected, detection_times, detection_time_scales = evaluate_detectors(
+            lightcurves, threshold=self._threshold, parallel=self._parallel
+        )
+
+        return zip(detected, detection_times, detection_time_scales)
+
     def process(self):
         """
         Process the GBM detectors to find
@@ -128,25 +179,23 @@ class GBMTrigger(GRBDetector):
 
         n_triggered = 0
 
-        n_tested = 0
+        lc_names = self._lc_names[: self._max_n_dets]
 
-        while (
-            (n_tested < len(self._lc_names))
-            and (not self._is_detected)
-            and (n_tested < self._max_n_dets)
-        ):
+        if self._batched:
 
-            lc = self._grb_save[self._lc_names[n_tested]]["lightcurve"]
+            results = self._evaluate_batched(lc_names)
 
-            lc_analyzer = GBMLightCurveAnalyzer(
-                lightcurve=lc, threshold=self._threshold
-            )
+        else:
+
+            results = self._evaluate_serial(lc_names)
 
-            if lc_analyzer.is_detected:
+        for name, (is_detected, detection_time, detection_time_scale) in zip(
+            lc_names, results
+        ):
+
+            if is_detected:
 
-                logger.debug(
-                    f"{self._lc_names[n_tested]} triggered at {lc_analyzer.detection_time}!"
-                )
+                logger.debug(f"{name} triggered at {detection_time}!")
                 # we saw something!
                 # add the name and the time
 
@@ -155,26 +204,24 @@ class GBMTrigger(GRBDetector):
                     # check the other trigger times to
                     # see if they are close to this one
 
-                    if self._check_simultaneous_triggers(
-                        lc_analyzer.detection_time
-                    ):
+                    if self._check_simultaneous_triggers(detection_time):
 
                         # ok, we found at least two triggers nearly the same time
 
                         self._is_detected = True
                         logger.debug(
-                            f"{self._lc_names[n_tested]} is simultaneous with another detector"
+                            f"{name} is simultaneous with another detector"
                         )
 
-                self._triggered_detectors.append(self._lc_names[n_tested])
-                self._triggered_times.append(lc_analyzer.detection_time)
-                self._triggered_time_scales.append(
-                    lc_analyzer.detection_time_scale
-                )
+                self._triggered_detectors.append(name)
+                self._triggered_times.append(detection_time)
+                self._triggered_time_scales.append(detection_time_scale)
 
                 n_triggered += 1
 
-            n_tested += 1
+            if self._is_detected:
+
+                break
 
         self._extra_info["triggered_detectors"] = np.array(
             self._triggered_detectors, dtype="S10"
@@ -7,14 +7,15 @@ from cosmogrb.universe.universe import GRBWrapper, ParameterServer, Universe
 class GBM_CPL_Universe(Universe):
     """Documentation for GBM_CPL_Universe"""
 
-    def __init__(self, population, save_path="."):
+    def __init__(self, population, save_path=".", seed=None, store_file=None):
 
-        super(GBM_CPL_Universe, self).__init__(population, save_path=save_path)
+        super(GBM_CPL_Universe, self).__init__(
+            population, save_path=save_path, seed=seed, store_file=store_file
+        )
 
-    def _grb_wrapper(
-        self, parameter_server: ParameterServer, serial: bool = False
-    ):
-        return GBM_CPL_Wrapper(parameter_server, serial=serial)
+    @property
+    def _grb_wrapper_type(self):
+        return GBM_CPL_Wrapper
 
     def _process_populations(self):
 
@@ -62,6 +63,7 @@ class GBM_CPL_ParameterServer(ParameterServer):
         ep_tau,
         trise,
         tdecay,
+        seed=None,
     ):
         """FIXME! briefly describe function
 
@@ -77,6 +79,7 @@ class GBM_CPL_ParameterServer(ParameterServer):
         :param tau:
         :param trise:
         :param tdecay:
+        :param seed:
         :returns:
         :rtype:
 
@@ -95,6 +98,7 @@ class GBM_CPL_ParameterServer(ParameterServer):
             ep_tau=ep_tau,
             trise=trise,
             tdecay=tdecay,
+            seed=seed,
         )
 
 
@@ -107,14 +111,15 @@ class GBM_CPL_ParameterServer(ParameterServer):
 class GBM_CPL_Constant_Universe(Universe):
     """Documentation for GBM_CPL_Constant_Universe"""
 
-    def __init__(self, population, save_path="."):
+    def __init__(self, population, save_path=".", seed=None, store_file=None):
 
         super(GBM_CPL_Constant_Universe, self).__init__(
-            population, save_path=save_path
+            population, save_path=save_path, seed=seed, store_file=store_file
         )
 
-    def _grb_wrapper(self, parameter_server, serial=False):
-        return GBM_CPL_Constant_Wrapper(parameter_server, serial=serial)
+    @property
+    def _grb_wrapper_type(self):
+        return GBM_CPL_Constant_Wrapper
 
     def _process_populations(self):
 
@@ -145,7 +150,9 @@ class GBM_CPL_Constant_Wrapper(GRBWrapper):
 class GBM_CPL_Constant_ParameterServer(ParameterServer):
     """Documentation for GBM_CPL_Constant_ParameterServer"""
 
-    def __init__(self, name, ra, dec, z, duration, T0, peak_flux, alpha, ep):
+    def __init__(
+        self, name, ra, dec, z, duration, T0, peak_flux, alpha, ep, seed=None
+    ):
         """FIXME! briefly describe function
 
         :param name:
@@ -157,6 +164,7 @@ class GBM_CPL_Constant_ParameterServer(ParameterServer):
         :param peak_flux:
         :param alpha:
         :param ep:
+        :param seed:
         :returns:
         :rtype:
 
@@ -172,4 +180,5 @@ class GBM_CPL_Constant_ParameterServer(ParameterServer):
             peak_flux=peak_flux,
             alpha=alpha,
             ep=ep,
+            seed=seed,
         )
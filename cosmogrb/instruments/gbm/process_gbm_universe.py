@@ -1,4 +1,5 @@
 from cosmogrb.instruments.gbm.gbm_trigger import GBMTrigger
+from cosmogrb.utils.executor import executor_map
 
 
 def process_gbm_universe(
@@ -11,19 +12,13 @@ def process_gbm_universe(
             client is not None
         ), "One must provide a client to process in parallel"
 
-        args = []
-        for grb_file in grb_save_files:
-
-            args.append([grb_file, threshold])
-
-        futures = client.map(_submit, args)
-        client.gather(futures)
-
     else:
 
-        for grb_file in grb_save_files:
+        client = None
+
+    args = [[grb_file, threshold] for grb_file in grb_save_files]
 
-            _submit([grb_file, threshold])
+    executor_map(_submit, args, client)
 
 
 def _submit(args):
@@ -0,0 +1,261 @@
+import os
+from typing import Dict, List, Optional
+
+import h5py
+import numpy as np
+
+from cosmogrb import cosmogrb_config
+from cosmogrb.utils.hdf5_utils import read_dataset
+from cosmogrb.utils.logging import setup_logger
+from cosmogrb.utils.package_utils import get_path_of_user_dir
+
+logger = setup_logger(__name__)
+
+# the atlas holds the response of each detector on a grid of
+# spacecraft frame azimuths [0, 360) and elevations [-90, 90].
+# The matrices of a detector are one contiguous float32 dataset
+# of shape (n_el, n_az, n_mc_energies, n_channels) so that it
+# can be memory mapped
+
+
+class ResponseAtlas(object):
+    def __init__(self, file_name: str):
+        """
+        a precomputed atlas of the GBM responses. See
+        build_response_atlas for how it is made
+
+        :param file_name: the HDF5 file of the atlas
+        :returns:
+        :rtype:
+
+        """
+
+        self._file_name: str = str(file_name)
+
+        self._mc_energies: Dict[str, np.ndarray] = {}
+        self._ebounds: Dict[str, np.ndarray] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+
+        with h5py.File(self._file_name, "r") as f:
+
+            self._resolution: float = f.attrs["resolution"]
+            self._reference_time: float = f.attrs["reference_time"]
+
+            detectors = list(f.keys())
+
+            for det_name in detectors:
+
+                self._mc_energies[det_name] = f[det_name]["mc_energies"][()]
+                self._ebounds[det_name] = f[det_name]["ebounds"][()]
+
+        for det_name in detectors:
+
+            self._matrices[det_name] = read_dataset(
+                self._file_name, f"{det_name}/matrix"
+            )
+
+        self._n_az: int = int(round(360.0 / self._resolution))
+        self._n_el: int = int(round(180.0 / self._resolution)) + 1
+
+        logger.debug(
+            f"loaded a response atlas of {len(detectors)} detectors with "
+            f"a resolution of {self._resolution} deg"
+        )
+
+    @property
+    def detectors(self) -> List[str]:
+        return list(self._matrices.keys())
+
+    @property
+    def resolution(self) -> float:
+        return self._resolution
+
+    @property
+    def reference_time(self) -> float:
+        """
+        the orbit time whose earth position was used
+        for the atmospheric scattering
+        """
+        return self._reference_time
+
+    @property
+    def mc_energies(self) -> Dict[str, np.ndarray]:
+        return self._mc_energies
+
+    @property
+    def ebounds(self) -> Dict[str, np.ndarray]:
+        return self._ebounds
+
+    def interpolate(self, det_name: str, az: float, el: float) -> np.ndarray:
+        """
+        the response of a detector at a spacecraft frame position
+        blended from the four neighbouring grid points
+
+        :param det_name:
+        :param az: in degrees
+        :param el: in degrees
+        :returns: the matrix (n_mc_energies, n_channels)
+        :rtype:
+
+        """
+
+        assert det_name in self._matrices, f"{det_name} is not in the atlas"
+
+        matrices = self._matrices[det_name]
+
+        # the azimuth wraps around
+
+        x = (az % 360.0) / self._resolution
+
+        i0 = int(np.floor(x))
+
+        fx = x - i0
+
+        i0 = i0 % self._n_az
+        i1 = (i0 + 1) % self._n_az
+
+        y = (min(max(el, -90.0), 90.0) + 90.0) / self._resolution
+
+        j0 = min(int(np.floor(y)), self._n_el - 2)
+
+        fy = y - j0
+
+        lower = (1.0 - fx) * matrices[j0, i0] + fx * matrices[j0, i1]
+        upper = (1.0 - fx) * matrices[j0 + 1, i0] + fx * matrices[j0 + 1, i1]
+
+        return ((1.0 - fy) * lower + fy * upper).astype("f8")
+
+
+def build_response_atlas(
+    file_name: str,
+    resolution: float = 5.0,
+    reference_time: Optional[float] = None,
+    detectors: Optional[List[str]] = None,
+) -> None:
+    """
+    compute the responses of the GBM detectors on a grid of
+    spacecraft frame positions and write them into an atlas.
+    The atmospheric scattering depends on where the earth is
+    and is computed for the position of the reference time
+
+    :param file_name: the HDF5 file to write
+    :param resolution: the grid spacing in degrees
+    :param reference_time: the orbit time. defaults to gbm.orbit.default_time
+    :param detectors: the detectors to include. defaults to all
+    :returns:
+    :rtype:
+
+    """
+
+    from cosmogrb.instruments.gbm.response_generator import (
+        get_gbm_response_generator,
+    )
+
+    response_generator = get_gbm_response_generator()
+
+    n_az = 360.0 / resolution
+    n_el = 180.0 / resolution
+
+    assert np.isclose(n_az, round(n_az)) and np.isclose(
+        n_el, round(n_el)
+    ), "the resolution must divide 180 degrees"
+
+    n_az = int(round(n_az))
+    n_el = int(round(n_el)) + 1
+
+    az_grid = resolution * np.arange(n_az)
+    el_grid = -90.0 + resolution * np.arange(n_el)
+
+    if reference_time is None:
+
+        reference_time = cosmogrb_config.gbm.orbit.default_time
+
+    if detectors is None:
+
+        detectors = list(response_generator.detectors.keys())
+
+    with h5py.File(file_name, "w") as f:
+
+        f.attrs["resolution"] = resolution
+        f.attrs["reference_time"] = reference_time
+
+        for det_name in detectors:
+
+            logger.info(f"building the atlas of {det_name}")
+
+            det_group = f.create_group(det_name)
+
+            det_group.create_dataset(
+                "mc_energies", data=response_generator.mc_energies[det_name]
+            )
+            det_group.create_dataset(
+                "ebounds", data=response_generator.ebounds[det_name]
+            )
+
+            n_mc = len(response_generator.mc_energies[det_name]) - 1
+            n_channels = len(response_generator.ebounds[det_name]) - 1
+
+            # no chunks or compression so that it can be memory mapped
+
+            matrices = det_group.create_dataset(
+                "matrix", shape=(n_el, n_az, n_mc, n_channels), dtype="f4"
+            )
+
+            for j, el in enumerate(el_grid):
+
+                block = np.empty((n_az, n_mc, n_channels), dtype="f4")
+
+                for i, az in enumerate(az_grid):
+
+                    block[i] = response_generator.response_direct_sat_coord(
+                        az, el, reference_time, det_name
+                    )
+
+                matrices[j] = block
+
+
+_atlas_cache: Dict[str, ResponseAtlas] = {}
+
+
+def default_atlas_file() -> str:
+    """
+    the atlas file used when gbm.response_atlas.file_name
+    is not set
+
+    :returns:
+    :rtype:
+
+    """
+
+    return os.path.join(get_path_of_user_dir(), "gbm_response_atlas.h5")
+
+
+def get_response_atlas() -> ResponseAtlas:
+    """
+    the atlas of the configuration. It is opened once
+    per process
+
+    :returns:
+    :rtype:
+
+    """
+
+    file_name = cosmogrb_config.gbm.response_atlas.file_name
+
+    if not file_name:
+
+        file_name = default_atlas_file()
+
+    if file_name not in _atlas_cache:
+
+        _atlas_cache[file_name] = ResponseAtlas(file_name)
+
+    return _atlas_cache[file_name]
+
+
+__all__ = [
+    "ResponseAtlas",
+    "build_response_atlas",
+    "default_atlas_file",
+    "get_response_atlas",
+]
@@ -1,12 +1,26 @@
+import functools
+import inspect
 import os
+import threading
+import types
 
+import numba as nb
+import numpy as np
 from gbm_drm_gen import DRMGenTTE
 
 # TODO: add occult to config
 from cosmogrb import cosmogrb_config
-from cosmogrb.instruments.gbm.gbm_orbit import gbm_orbit
+from cosmogrb.instruments.gbm.gbm_geometry import (
+    earth_coordinates,
+    spacecraft_coordinates,
+)
+from cosmogrb.instruments.gbm.gbm_orbit import get_gbm_orbit
+from cosmogrb.response.response_cache import ResponseCache
 from cosmogrb.utils.logging import setup_logger
-from cosmogrb.utils.package_utils import get_path_of_data_file
+from cosmogrb.utils.package_utils import (
+    get_path_of_data_file,
+    get_path_of_user_dir,
+)
 
 logger = setup_logger(__name__)
 _det_translate = dict(
@@ -27,6 +41,179 @@ _det_translate = dict(
 )
 
 
+# the responses are made with the public set_time and
+# set_location of the DRM generators behind a lock. When this
+# version of gbm_drm_gen allows it, there is a faster path: its
+# DRM builder holds the GIL, so the same kernel is compiled here
+# without it (and cached) and run on the private parts of the
+# DRM generators that DetectorGeometry collects. Threads can
+# then build DRMs at once
+
+try:
+
+    from gbm_drm_gen.drmgen import _build_drm as _build_drm_gil
+
+    _build_drm = nb.njit(fastmath=True, nogil=True, cache=True)(
+        _build_drm_gil.py_func
+    )
+
+except (ImportError, AttributeError):
+
+    _build_drm = None
+
+
+class DetectorGeometry(object):
+    def __init__(self, drm_gen: DRMGenTTE):
+        """
+        the parts of a DRM generator that do not change: the
+        position history and the response database of the
+        detector. It is shared by all threads and never modified
+        so a response is a pure function of it. These are private
+        to gbm_drm_gen and an AttributeError is raised if this
+        version does not have them
+
+        :param drm_gen: the DRM generator of the detector
+        :returns:
+        :rtype:
+
+        """
+
+        if _build_drm is None:
+
+            raise AttributeError("gbm_drm_gen has no numba _build_drm")
+
+        self._position_interpolator = drm_gen.postion_interpolator
+
+        self._mc_energies: np.ndarray = drm_gen.monte_carlo_energies
+        self._ebounds: np.ndarray = drm_gen.ebounds
+
+        database = drm_gen._database_nb
+
+        in_edge = drm_gen._in_edge
+        nobins_in = drm_gen._nobins_in
+
+        # the photon bins of the scattering integration
+
+        n_tmp_phot_bin = 2 * nobins_in + nobins_in % 2
+
+        tmp_phot_bin = np.zeros(n_tmp_phot_bin)
+        tmp_phot_bin[::2] = in_edge[:-1]
+        tmp_phot_bin[1::2] = 10 ** (
+            (np.log10(in_edge[:-1]) + np.log10(in_edge[1:])) / 2.0
+        )
+
+        self._drm_arguments = types.MappingProxyType(
+            dict(
+                nobins_in=nobins_in,
+                nobins_out=drm_gen._nobins_out,
+                Azimuth=database.Azimuth,
+                Zenith=database.Zenith,
+                grid_points_list=database.grid_points_list,
+                milliaz=database.milliaz,
+                millizen=database.millizen,
+                in_edge=in_edge,
+                lat_edge=database.lat_edge,
+                lat_cent=database.lat_cent,
+                theta_cent=database.theta_cent,
+                phi_cent=database.phi_cent,
+                double_phi_cent=database.double_phi_cent,
+                ienerg=database.ienerg,
+                out_edge=drm_gen._out_edge,
+                ein=drm_gen._ein,
+                epx_lo=database.epx_lo,
+                epx_hi=database.epx_hi,
+                ichan=database.ichan,
+                matrix_type=drm_gen._matrix_type,
+                rsps=database.rsps,
+                n_tmp_phot_bin=n_tmp_phot_bin,
+                tmp_phot_bin=tmp_phot_bin,
+                at_scat_data=database.at_scat_data,
+                trigdat_precalc_rsps=drm_gen._database_precalc_trigdat.rsps,
+                trigdat=drm_gen._trigdat,
+                trigdat_mask=drm_gen._trigdat_mask,
+            )
+        )
+
+        # the kernel is called with keywords so their names
+        # must be those of this version of gbm_drm_gen
+
+        parameters = set(inspect.signature(_build_drm.py_func).parameters)
+
+        arguments = set(self._drm_arguments) | {
+            "src_az",
+            "src_el",
+            "geo_az",
+            "geo_el",
+        }
+
+        if parameters != arguments:
+
+            raise AttributeError(
+                "the arguments of _build_drm in gbm_drm_gen have changed"
+            )
+
+    @property
+    def mc_energies(self) -> np.ndarray:
+        return self._mc_energies
+
+    @property
+    def ebounds(self) -> np.ndarray:
+        return self._ebounds
+
+    def attitude(self, time: float):
+        """
+        the quaternion and position of the spacecraft
+
+        :param time: relative to T0
+        :returns: (quaternion, sc_pos)
+        :rtype:
+
+        """
+
+        return (
+            self._position_interpolator.quaternion(time),
+            self._position_interpolator.sc_pos(time),
+        )
+
+    def response_direct_sat_coord(
+        self, az: float, el: float, geo_az: float, geo_el: float
+    ) -> np.ndarray:
+        """
+        the response for a position and the earth in
+        the spacecraft frame
+
+        :param az: in degrees
+        :param el: in degrees
+        :param geo_az: in degrees
+        :param geo_el: in degrees
+        :returns: the matrix (n_mc_energies, n_channels)
+        :rtype:
+
+        """
+
+        return _build_drm(az, el, geo_az, geo_el, **self._drm_arguments)
+
+    def response(self, ra: float, dec: float, time: float) -> np.ndarray:
+        """
+        the response for a sky position at a time in the orbit
+
+        :param ra: in degrees
+        :param dec: in degrees
+        :param time: relative to T0
+        :returns: the matrix (n_mc_energies, n_channels)
+        :rtype:
+
+        """
+
+        quaternion, sc_pos = self.attitude(time)
+
+        az, el = spacecraft_coordinates(ra, dec, quaternion)
+
+        geo_az, geo_el = earth_coordinates(quaternion, sc_pos)
+
+        return self.response_direct_sat_coord(az, el, geo_az, geo_el)
+
+
 class SingletonMeta(type):
     def __call__(cls, *args, **kwargs):
         if not hasattr(cls, "_inst"):
@@ -41,12 +228,22 @@ class ResponseGenerator(object, metaclass=SingletonMeta):
         # this is the minimum MET in the orbit.
         # all response time are relative to this
 
-        T0 = gbm_orbit.T0
+        T0 = get_gbm_orbit().T0
 
         self._detectors = {}
+        self._geometries = {}
         self._mc_energies = {}
         self._ebounds = {}
 
+        # the DRM generators are changed by set_time and
+        # set_location so these are locked. The detectors with
+        # a geometry need no lock
+
+        self._lock = threading.Lock()
+
+        self._response_cache = None
+        self._response_cache_settings = None
+
         logger.debug("creating response generators")
 
         for k, v in _det_translate.items():
@@ -65,6 +262,18 @@ class ResponseGenerator(object, metaclass=SingletonMeta):
             logger.debug(f"created {k} rsp gen")
 
             self._detectors[k] = drm_gen
+
+            try:
+
+                self._geometries[k] = DetectorGeometry(drm_gen)
+
+            except AttributeError as e:
+
+                logger.debug(
+                    f"{k} responses are made with the locked DRM "
+                    f"generator: {e}"
+                )
+
             self._mc_energies[k] = drm_gen.monte_carlo_energies
             self._ebounds[k] = drm_gen.ebounds
 
@@ -72,6 +281,15 @@ class ResponseGenerator(object, metaclass=SingletonMeta):
     def detectors(self):
         return self._detectors
 
+    @property
+    def geometries(self):
+        """
+        the geometries of the detectors. A detector is missing
+        if its DRM generator could not give one
+        """
+
+        return self._geometries
+
     @property
     def mc_energies(self):
         return self._mc_energies
@@ -80,21 +298,130 @@ class ResponseGenerator(object, metaclass=SingletonMeta):
     def ebounds(self):
         return self._ebounds
 
+    @property
+    def response_cache(self):
+        """
+        the cache of the responses or None if it is
+        switched off in the configuration
+        """
+
+        config = cosmogrb_config.gbm.response_cache
+
+        if not config.on:
+
+            return None
+
+        settings = (
+            config.angular_tolerance,
+            config.time_tolerance,
+            config.max_entries,
+            config.disk,
+        )
+
+        if settings != self._response_cache_settings:
+
+            disk_path = None
+
+            if config.disk:
+
+                # the responses belong to this orbit
+
+                disk_path = os.path.join(
+                    get_path_of_user_dir(),
+                    "response_cache",
+                    f"gbm_{get_gbm_orbit().T0:.0f}",
+                )
+
+            self._response_cache = ResponseCache(
+                angular_tolerance=config.angular_tolerance,
+                time_tolerance=config.time_tolerance,
+                max_entries=config.max_entries,
+                time_range=(0.0, get_gbm_orbit().maximum_time),
+                disk_path=disk_path,
+            )
+
+            self._response_cache_settings = settings
+
+        return self._response_cache
+
     def generate_response(self, ra, dec, time, det_name):
+        """
+        the response of a detector for a sky position at a time
+        in the orbit. This does not change the generator and can
+        be called from many threads at once
+
+        :param ra:
+        :param dec:
+        :param time: relative to T0
+        :param det_name:
+        :returns: the matrix (n_mc_energies, n_channels)
+        :rtype:
+
+        """
 
         assert det_name in self._detectors
 
-        logger.debug(f"setting time of {det_name} to {time}")
+        response_cache = self.response_cache
+
+        if response_cache is None:
+
+            return self._compute_response(ra, dec, time, det_name)
+
+        return response_cache.get(
+            det_name,
+            ra,
+            dec,
+            time,
+            functools.partial(self._compute_response, det_name=det_name),
+        )
+
+    def _compute_response(self, ra, dec, time, det_name):
+
+        logger.debug(
+            f"generating the response of {det_name} at {ra}, {dec}, {time}"
+        )
+
+        if det_name in self._geometries:
+
+            return self._geometries[det_name].response(ra, dec, time)
+
+        with self._lock:
+
+            self._detectors[det_name].set_time(time)
+            self._detectors[det_name].set_location(ra, dec)
 
-        self._detectors[det_name].set_time(time)
+            return self._detectors[det_name].matrix.T
+
+    def response_direct_sat_coord(self, az, el, time, det_name):
+        """
+        the response of a detector for a position in the
+        spacecraft frame at a time in the orbit
+
+        :param az: in degrees
+        :param el: in degrees
+        :param time: relative to T0
+        :param det_name:
+        :returns: the matrix (n_mc_energies, n_channels)
+        :rtype:
+
+        """
 
         assert det_name in self._detectors
 
-        logger.debug(f"setting location of {det_name} to {ra}, {dec}")
+        if det_name in self._geometries:
 
-        self._detectors[det_name].set_location(ra, dec)
+            geometry = self._geometries[det_name]
 
-        return self._detectors[det_name].matrix.T
+            geo_az, geo_el = earth_coordinates(*geometry.attitude(time))
+
+            return geometry.response_direct_sat_coord(az, el, geo_az, geo_el)
+
+        with self._lock:
+
+            self._detectors[det_name].set_time(time)
+            self._detectors[det_name].set_location_direct_sat_coord(az, el)
+
+            return self._detectors[det_name].matrix.T
 
     def set_time(self, time, det_name):
         """
@@ -112,7 +439,9 @@ class ResponseGenerator(object, metaclass=SingletonMeta):
 
         logger.debug(f"setting time of {det_name} to {time}")
 
-        self._detectors[det_name].set_time(time)
+        with self._lock:
+
+            self._detectors[det_name].set_time(time)
 
     def set_location(self, ra, dec, det_name):
         """
@@ -130,9 +459,51 @@ class ResponseGenerator(object, metaclass=SingletonMeta):
 
         logger.debug(f"setting location of {det_name} to {ra}, {dec}")
 
-        self._detectors[det_name].set_location(ra, dec)
+        with self._lock:
+
+            self._detectors[det_name].set_location(ra, dec)
+
+            return self._detectors[det_name].matrix.T
+
+
+# building the 14 DRM generators reads the response database
+# and takes a while so it is done when first needed
+
+_gbm_response_generator = None
+
+_gbm_response_generator_lock = threading.Lock()
+
+
+def get_gbm_response_generator() -> ResponseGenerator:
+    """
+    the response generator of this process. It is built
+    on first use
+
+    :returns:
+    :rtype:
+
+    """
+
+    global _gbm_response_generator
+
+    if _gbm_response_generator is None:
+
+        with _gbm_response_generator_lock:
+
+            if _gbm_response_generator is None:
+
+                _gbm_response_generator = ResponseGenerator()
+
+    return _gbm_response_generator
+
+
+def __getattr__(name):
+
+    # gbm_response_generator is still a module attribute
+    # but is built lazily
 
-        return self._detectors[det_name].matrix.T
+    if name == "gbm_response_generator":
 
+        return get_gbm_response_generator()
 
-gbm_response_generator = ResponseGenerator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
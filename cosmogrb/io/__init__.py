@@ -1,4 +1,30 @@
-from cosmogrb.io.gbm_fits import grbsave_to_gbm_fits
-from cosmogrb.io.grb_save import GRBSave
+import importlib
+
+# writing the FITS files needs astropy so the savers are
+# imported when first used
+
+_lazy_attributes = {
+    "GRBSave": "cosmogrb.io.grb_save",
+    "grbsave_to_gbm_fits": "cosmogrb.io.gbm_fits",
+}
+
+
+def __getattr__(name):
+
+    if name not in _lazy_attributes:
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+
+    return sorted(list(globals()) + list(_lazy_attributes))
+
 
 __all__ = ["GRBSave", "grbsave_to_gbm_fits"]
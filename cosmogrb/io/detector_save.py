@@ -1,10 +1,12 @@
 import collections
 
-import h5py
 import pandas as pd
-from IPython.display import display
 
-from cosmogrb.utils.hdf5_utils import recursively_load_dict_contents_from_group
+from cosmogrb.io.store import open_location
+from cosmogrb.utils.hdf5_utils import (
+    recursively_load_dict_contents_from_group,
+    recursively_save_dict_contents_to_group,
+)
 
 
 class DetectorSave(object):
@@ -47,26 +49,77 @@ class DetectorSave(object):
     def extra_info(self):
         return self._extra_info
 
+    def to_group(self, f):
+        """
+        write the detection info into an open file or group
+
+        :param f:
+        :returns:
+        :rtype:
+
+        """
+
+        f.attrs["is_detected"] = self._is_detected
+        f.attrs["name"] = self._name
+        f.attrs["instrument"] = self._instrument
+
+        # store any extra info if there is
+        # some.
+
+        if self._extra_info:
+
+            recursively_save_dict_contents_to_group(
+                f, "extra_info", self._extra_info
+            )
+
+    def write(self, file_name):
+        """
+        write the detection info to a file or a group
+        of a store (file.h5::/group)
+
+        :param file_name:
+        :returns:
+        :rtype:
+
+        """
+
+        with open_location(file_name, "w") as f:
+
+            self.to_group(f)
+
     @classmethod
-    def from_file(cls, file_name):
+    def from_group(cls, f):
+        """
+        read the detection info from an open file or group
+
+        :param f:
+        :returns:
+        :rtype:
 
-        with h5py.File(file_name, "r") as f:
+        """
 
-            name = f.attrs["name"]
-            is_detected = f.attrs["is_detected"]
-            instrument = f.attrs["instrument"]
+        name = f.attrs["name"]
+        is_detected = f.attrs["is_detected"]
+        instrument = f.attrs["instrument"]
 
-            try:
+        try:
 
-                extra_info = recursively_load_dict_contents_from_group(
-                    f, "extra_info"
-                )
+            extra_info = recursively_load_dict_contents_from_group(
+                f, "extra_info"
+            )
+
+        except:
+
+            extra_info = None
 
-            except:
+        return cls(name, is_detected, instrument, extra_info)
 
-                extra_info = None
+    @classmethod
+    def from_file(cls, file_name):
 
-            return cls(name, is_detected, instrument, extra_info)
+        with open_location(file_name, "r") as f:
+
+            return cls.from_group(f)
 
     def __repr__(self):
         return self._output(as_display=False).to_string()
@@ -84,6 +137,8 @@ class DetectorSave(object):
 
         if as_display:
 
+            from IPython.display import display
+
             std_df = pd.Series(data=std_dict, index=std_dict.keys())
 
             display(std_df.to_frame())
@@ -1,14 +1,83 @@
 import collections
 
 import h5py
+import numpy as np
 import pandas as pd
-from IPython.display import display
 
-from cosmogrb.lightcurve.light_curve_storage import LightCurveStorage
+from cosmogrb.lightcurve.light_curve_storage import (
+    LazyLightCurveStorage,
+    LightCurveStorage,
+)
+from cosmogrb.io.store import open_location, split_location
 from cosmogrb.response.response import Response
 from cosmogrb.utils.hdf5_utils import recursively_load_dict_contents_from_group
 
 
+def _read_response(rsp_group):
+    """
+    build a response from its group in the file
+
+    :param rsp_group:
+    :returns:
+    :rtype:
+
+    """
+
+    matrix = rsp_group["matrix"][()]
+    energy_edges = rsp_group["energy_edges"][()]
+    channel_edges = rsp_group["channel_edges"][()]
+    geometric_area = rsp_group.attrs["geometric_area"]
+
+    return Response(
+        matrix=matrix,
+        geometric_area=geometric_area,
+        energy_edges=energy_edges,
+        channel_edges=channel_edges,
+    )
+
+
+class _ResponseLoader(object):
+    def __init__(self, file_name, group):
+        """
+        defers reading and building a response until
+        it is needed
+
+        :param file_name: the HDF5 file
+        :param group: the group of the response in the file
+        :returns:
+        :rtype:
+
+        """
+
+        self._file_name = file_name
+        self._group = group
+
+    def load(self):
+
+        with h5py.File(self._file_name, "r") as f:
+
+            return _read_response(f[self._group])
+
+
+class _DetectorEntry(collections.UserDict):
+    """
+    the light curve and response of a detector. A response
+    that was loaded lazily is built on first access
+    """
+
+    def __getitem__(self, key):
+
+        value = super(_DetectorEntry, self).__getitem__(key)
+
+        if isinstance(value, _ResponseLoader):
+
+            value = value.load()
+
+            self.data[key] = value
+
+        return value
+
+
 class GRBSave(collections.UserDict):
     def __init__(
         self,
@@ -49,7 +118,7 @@ class GRBSave(collections.UserDict):
 
         for k, v in responses.items():
 
-            assert isinstance(v, Response), print(
+            assert isinstance(v, (Response, _ResponseLoader)), print(
                 f"{k} is not of type Response"
             )
 
@@ -68,7 +137,7 @@ class GRBSave(collections.UserDict):
 
         for key in lightcurves.keys():
 
-            data[key] = dict(
+            data[key] = _DetectorEntry(
                 lightcurve=lightcurves[key], response=responses[key]
             )
 
@@ -144,12 +213,25 @@ class GRBSave(collections.UserDict):
         return self._source_params
 
     @classmethod
-    def from_file(cls, file_name):
+    def from_file(cls, file_name, lazy=False):
+        """
+        read a GRB from a file
+
+        :param file_name: the file or the location in a store
+        :param lazy: read the events and build the responses only when accessed
+        :returns:
+        :rtype:
+
+        """
 
         lightcurves = dict()
         responses = dict()
 
-        with h5py.File(file_name, "r") as f:
+        # the lazy parts reopen the file itself
+
+        store_file_name, _ = split_location(file_name)
+
+        with open_location(file_name, "r") as f:
 
             grb_name = f.attrs["grb_name"]
 
@@ -194,6 +276,43 @@ class GRBSave(collections.UserDict):
 
                 channels = lc_group["channels"]
 
+                if lazy:
+
+                    # only the sizes of the events are looked at
+
+                    channel_edges = lc_group["response"]["channel_edges"][()]
+
+                    responses[lc_name] = _ResponseLoader(
+                        store_file_name, lc_group["response"].name
+                    )
+
+                    lc_container = LazyLightCurveStorage(
+                        file_name=store_file_name,
+                        group=lc_group.name,
+                        name=lc_name,
+                        tstart=tstart,
+                        tstop=tstop,
+                        time_adjustment=time_adjustment,
+                        n_counts=lc_group["total_signal"]["times"].shape[0],
+                        n_counts_source=lc_group["source_signal"][
+                            "times"
+                        ].shape[0],
+                        n_counts_background=lc_group["background_signal"][
+                            "times"
+                        ].shape[0],
+                        channels=np.arange(
+                            len(channel_edges) - 1, dtype=np.int64
+                        ),
+                        ebounds=channel_edges.astype("f8"),
+                        T0=T0,
+                        instrument=instrument,
+                        extra_info=lc_extra_info,
+                    )
+
+                    lightcurves[lc_name] = lc_container
+
+                    continue
+
                 pha = lc_group["total_signal"]["pha"][()]
                 times = lc_group["total_signal"]["times"][()]
 
@@ -205,19 +324,7 @@ class GRBSave(collections.UserDict):
 
                 # now get the response info
 
-                rsp_group = lc_group["response"]
-
-                matrix = rsp_group["matrix"][()]
-                energy_edges = rsp_group["energy_edges"][()]
-                channel_edges = rsp_group["channel_edges"][()]
-                geometric_area = rsp_group.attrs["geometric_area"]
-
-                rsp = Response(
-                    matrix=matrix,
-                    geometric_area=geometric_area,
-                    energy_edges=energy_edges,
-                    channel_edges=channel_edges,
-                )
+                rsp = _read_response(lc_group["response"])
 
                 responses[lc_name] = rsp
 
@@ -275,6 +382,8 @@ class GRBSave(collections.UserDict):
 
         if as_display:
 
+            from IPython.display import display
+
             std_df = pd.Series(data=std_dict, index=std_dict.keys())
 
             display(std_df.to_frame())
@@ -0,0 +1,235 @@
+import collections
+import contextlib
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import h5py
+
+from cosmogrb.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# a location is either the name of an HDF5 file or
+# file.h5::/group for a group in a consolidated store
+
+_separator = "::"
+
+
+def make_location(file_name: Union[str, Path], group: Optional[str] = None):
+    """
+    build the location of a group in a store
+
+    :param file_name:
+    :param group:
+    :returns:
+    :rtype:
+
+    """
+
+    if group is None:
+
+        return str(file_name)
+
+    return f"{file_name}{_separator}/{group.strip('/')}"
+
+
+def split_location(location: Union[str, Path]) -> Tuple[str, Optional[str]]:
+    """
+    split a location into the file name and the group
+    which is None for a plain file
+
+    :param location:
+    :returns: (file_name, group)
+    :rtype:
+
+    """
+
+    location = str(location)
+
+    if _separator in location:
+
+        file_name, group = location.split(_separator, 1)
+
+        return file_name, group
+
+    return location, None
+
+
+def is_store_location(location: Union[str, Path]) -> bool:
+    """
+    is the location a group in a consolidated store
+
+    :param location:
+    :returns:
+    :rtype:
+
+    """
+
+    return split_location(location)[1] is not None
+
+
+def detection_location(location: Union[str, Path]) -> str:
+    """
+    the location of the detection info of a GRB. For a plain
+    file this is a file next to it and for a store it is a
+    group in the same store
+
+    :param location: the location of the GRB
+    :returns:
+    :rtype:
+
+    """
+
+    file_name, group = split_location(location)
+
+    if group is None:
+
+        file_name_head = ".".join(file_name.split(".")[:-1])
+
+        return f"{file_name_head}_detection_info.h5"
+
+    return make_location(file_name, f"detection_info/{group.strip('/')}")
+
+
+@contextlib.contextmanager
+def open_location(location: Union[str, Path], mode: str = "r"):
+    """
+    open a location for reading ("r") or writing ("w").
+    Writing to a group in a store replaces the group but
+    leaves the rest of the store alone
+
+    :param location:
+    :param mode: "r" or "w"
+    :returns:
+    :rtype:
+
+    """
+
+    assert mode in ("r", "w"), "a location can only be read or written"
+
+    file_name, group = split_location(location)
+
+    if group is None:
+
+        with h5py.File(file_name, mode) as f:
+
+            yield f
+
+    elif mode == "r":
+
+        with h5py.File(file_name, "r") as f:
+
+            yield f[group]
+
+    else:
+
+        with h5py.File(file_name, "a") as f:
+
+            if group in f:
+
+                del f[group]
+
+            yield f.create_group(group)
+
+
+def read_attribute(locations: List[str], key: str) -> List[Any]:
+    """
+    read an attribute from many locations. Each file is
+    opened only once no matter how many of the locations
+    are in it
+
+    :param locations:
+    :param key:
+    :returns:
+    :rtype:
+
+    """
+
+    by_file = collections.OrderedDict()
+
+    for i, location in enumerate(locations):
+
+        file_name, group = split_location(location)
+
+        by_file.setdefault(file_name, []).append((i, group))
+
+    out = [None] * len(locations)
+
+    for file_name, entries in by_file.items():
+
+        with h5py.File(file_name, "r") as f:
+
+            for i, group in entries:
+
+                node = f if group is None else f[group]
+
+                out[i] = node.attrs[key]
+
+    return out
+
+
+def shard_file_name(base: Union[str, Path]) -> str:
+    """
+    the shard that this worker writes to. Every process and
+    thread gets its own shard so that no two writers ever
+    share a file
+
+    :param base: the store file name without extension
+    :returns:
+    :rtype:
+
+    """
+
+    host = socket.gethostname()
+
+    return f"{base}_shard_{host}_{os.getpid()}_{threading.get_ident()}.h5"
+
+
+def merge_shards(
+    shard_files: List[str], store_file: Union[str, Path], remove: bool = True
+) -> None:
+    """
+    copy all the groups of the shards into a single store
+
+    :param shard_files:
+    :param store_file:
+    :param remove: delete the shards once merged
+    :returns:
+    :rtype:
+
+    """
+
+    with h5py.File(store_file, "a") as store:
+
+        for shard_file in shard_files:
+
+            logger.debug(f"merging {shard_file} into {store_file}")
+
+            with h5py.File(shard_file, "r") as shard:
+
+                for name in shard.keys():
+
+                    if name in store:
+
+                        del store[name]
+
+                    shard.copy(shard[name], store, name=name)
+
+            if remove:
+
+                os.remove(shard_file)
+
+
+__all__ = [
+    "make_location",
+    "split_location",
+    "is_store_location",
+    "detection_location",
+    "open_location",
+    "read_attribute",
+    "shard_file_name",
+    "merge_shards",
+]
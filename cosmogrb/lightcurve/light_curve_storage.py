@@ -1,12 +1,11 @@
 import collections
 import logging
 
-import matplotlib.pyplot as plt
 import numba as nb
 import numpy as np
 import pandas as pd
-from IPython.display import display
 
+from cosmogrb.utils.hdf5_utils import read_dataset
 from cosmogrb.utils.logging import setup_logger
 from cosmogrb.utils.plotting import channel_plot, step_plot
 
@@ -260,11 +259,11 @@ class LightCurveStorage(object):
 
         # histogram the counts and convert to a rate
 
-        counts, edges = np.histogram(times, bins=bins)
+        counts, _ = bin_events(times, bins, np.empty(0))
 
         rate = counts / dt
 
-        xbins = np.vstack([edges[:-1], edges[1:]]).T
+        xbins = np.vstack([bins[:-1], bins[1:]]).T
 
         return xbins, rate
 
@@ -293,6 +292,122 @@ class LightCurveStorage(object):
 
         return bins, counts
 
+    def binned_counts_and_weights(
+        self, dt, weights, emin=None, emax=None, tmin=None, tmax=None
+    ):
+        """
+
+        get the time bins, counts and the sum of a weight per event
+        (e.g. the dead time) for a given selection in one pass
+
+        :param dt:
+        :param weights: an array with one weight per event
+        :param emin:
+        :param emax:
+        :param tmin:
+        :param tmax:
+        :returns: (bins, counts, summed weights)
+        :rtype:
+
+        """
+
+        times = self._times
+
+        if tmin is None:
+            tmin = times.min()
+
+        if tmax is None:
+            tmax = times.max()
+
+        assert (
+            tmin < tmax
+        ), f"the specified tmin and tmax are out of order ({tmin} > {tmax})"
+
+        bins = np.arange(tmin, tmax, dt)
+
+        idx = self._select_channel(emin, emax, self._pha)
+
+        counts, summed_weights = bin_events(times[idx], bins, weights[idx])
+
+        xbins = np.vstack([bins[:-1], bins[1:]]).T
+
+        return xbins, counts, summed_weights
+
+    def _band_channels(self, emin, emax):
+        """
+        the exclusive channel bounds of an energy band as
+        selected by _select_channel
+
+        """
+
+        lo = -1
+        hi = len(self._ebounds) + 1
+
+        if emin is not None:
+
+            lo = self._ebounds.searchsorted(emin)
+
+        if emax is not None:
+
+            hi = self._ebounds.searchsorted(emax)
+
+        return lo, hi
+
+    def binned_counts_multi_band(
+        self, dt, energy_ranges, tmin=None, tmax=None, weights=None
+    ):
+        """
+
+        get the time bins, the counts of several energy bands
+        and the sum of a weight per event of all channels (e.g.
+        the dead time) in one pass over the events
+
+        :param dt: the cadence
+        :param energy_ranges: list of (emin, emax), either can be None
+        :param tmin:
+        :param tmax:
+        :param weights: an array with one weight per event or None
+        :returns: (bins, counts of shape (n bands, n bins), summed weights)
+        :rtype:
+
+        """
+
+        if weights is None:
+
+            weights = np.empty(0)
+
+        times = self._times
+
+        if tmin is None:
+            tmin = times.min()
+
+        if tmax is None:
+            tmax = times.max()
+
+        assert (
+            tmin < tmax
+        ), f"the specified tmin and tmax are out of order ({tmin} > {tmax})"
+
+        bins = np.arange(tmin, tmax, dt)
+
+        channel_bounds = np.array(
+            [self._band_channels(emin, emax) for emin, emax in energy_ranges],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+
+        counts, summed_weights = bin_events_multi_band(
+            times,
+            self._pha,
+            bins,
+            channel_bounds[:, 0],
+            channel_bounds[:, 1],
+            weights,
+        )
+
+        xbins = np.vstack([bins[:-1], bins[1:]]).T
+
+        return xbins, counts, summed_weights
+
     def _display_lightcurve(
         self,
         times,
@@ -308,6 +423,8 @@ class LightCurveStorage(object):
 
         if ax is None:
 
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots()
 
         else:
@@ -508,6 +625,8 @@ class LightCurveStorage(object):
 
         if ax is None:
 
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots()
 
         else:
@@ -618,6 +737,8 @@ class LightCurveStorage(object):
 
         if as_display:
 
+            from IPython.display import display
+
             std_df = pd.Series(data=std_dict, index=std_dict.keys())
 
             display(std_df.to_frame())
@@ -639,7 +760,279 @@ class LightCurveStorage(object):
         return pd.Series(data=std_dict, index=std_dict.keys())
 
 
-@nb.njit(fastmath=True, nogil=True, cache=False)
+class LazyLightCurveStorage(LightCurveStorage):
+    def __init__(
+        self,
+        file_name,
+        group,
+        name,
+        tstart,
+        tstop,
+        time_adjustment,
+        n_counts,
+        n_counts_source,
+        n_counts_background,
+        channels,
+        ebounds,
+        T0,
+        instrument,
+        extra_info,
+    ):
+        """
+        A light curve storage that reads its events from
+        the HDF5 file only when they are accessed
+
+        :param file_name: the HDF5 file
+        :param group: the group of the light curve in the file
+        :param n_counts:
+        :param n_counts_source:
+        :param n_counts_background:
+        :returns:
+        :rtype:
+
+        """
+
+        # the events are not passed so the parent
+        # constructor is skipped
+
+        self._file_name = file_name
+        self._group = group
+
+        self._name = name
+
+        self._tstart = tstart
+        self._tstop = tstop
+        self._time_adjustment = time_adjustment
+
+        self._n_counts = n_counts
+        self._n_counts_source = n_counts_source
+        self._n_counts_background = n_counts_background
+
+        self._channels = channels
+        self._ebounds = ebounds
+
+        self._T0 = T0
+
+        self._instrument = instrument
+
+        self._extra_info = extra_info
+
+        self._events = {}
+
+    def _load(self, path, dtype=None):
+        """
+        read the events on first access and keep them
+
+        :param path: the path of the dataset in the group
+        :param dtype: convert the events to this type once read
+        :returns:
+        :rtype:
+
+        """
+
+        if path not in self._events:
+
+            logger.debug(f"{self._name}: reading {path}")
+
+            events = read_dataset(self._file_name, f"{self._group}/{path}")
+
+            if dtype is not None:
+
+                events = events.astype(dtype)
+
+            self._events[path] = events
+
+        return self._events[path]
+
+    @property
+    def _pha(self):
+        return self._load("total_signal/pha", int)
+
+    @property
+    def _times(self):
+        return self._load("total_signal/times")
+
+    @property
+    def _pha_source(self):
+        return self._load("source_signal/pha")
+
+    @property
+    def _times_source(self):
+        return self._load("source_signal/times")
+
+    @property
+    def _pha_background(self):
+        return self._load("background_signal/pha")
+
+    @property
+    def _times_background(self):
+        return self._load("background_signal/times")
+
+
+@nb.njit(fastmath=True, nogil=True, cache=True)
+def _uniform_bin(t, edges, dt, n_bins):
+    """
+    the bin of a time within uniform edges found by index
+    arithmetic. The time must be between the first and the
+    last edge. As in np.histogram, the bins are half open
+    except for the last one
+
+    :param t:
+    :param edges: uniform time edges
+    :param dt: the width of the bins
+    :param n_bins:
+    :returns:
+    :rtype:
+
+    """
+
+    k = int((t - edges[0]) / dt)
+
+    # guard against round off at the edges
+
+    if k >= n_bins:
+        k = n_bins - 1
+
+    elif (k > 0) and (t < edges[k]):
+        k -= 1
+
+    elif (k < n_bins - 1) and (t >= edges[k + 1]):
+        k += 1
+
+    return k
+
+
+@nb.njit(fastmath=True, nogil=True, cache=True)
+def bin_events(times, edges, weights):
+    """
+    histogram the events into the uniform bins defined by edges
+    and sum their weights per bin in one pass. As in np.histogram,
+    the bins are half open except for the last one. If weights
+    is empty only the counts are summed
+
+    :param times:
+    :param edges: uniform time edges
+    :param weights:
+    :returns: (counts, summed weights)
+    :rtype:
+
+    """
+
+    n_bins = max(edges.shape[0] - 1, 0)
+
+    counts = np.zeros(n_bins, dtype=np.int64)
+    summed_weights = np.zeros(n_bins)
+
+    if n_bins == 0:
+        return counts, summed_weights
+
+    use_weights = weights.shape[0] > 0
+
+    tmin = edges[0]
+    tmax = edges[-1]
+
+    dt = edges[1] - edges[0]
+
+    for i in range(times.shape[0]):
+
+        t = times[i]
+
+        if (t < tmin) or (t > tmax):
+            continue
+
+        k = _uniform_bin(t, edges, dt, n_bins)
+
+        counts[k] += 1
+
+        if use_weights:
+            summed_weights[k] += weights[i]
+
+    return counts, summed_weights
+
+
+@nb.njit(fastmath=True, nogil=True, cache=True)
+def bin_events_multi_band(times, pha, edges, channel_lo, channel_hi, weights):
+    """
+    histogram the events into uniform time bins for several
+    bands of channels at once and sum the weights of all events
+    per bin in the same pass. An event is in a band if
+    channel_lo < pha < channel_hi. As in np.histogram, the
+    bins are half open except for the last one. If weights
+    is empty only the counts are summed
+
+    :param times:
+    :param pha:
+    :param edges: uniform time edges
+    :param channel_lo:
+    :param channel_hi:
+    :param weights:
+    :returns: (counts of shape (n bands, n bins), summed weights)
+    :rtype:
+
+    """
+
+    n_bins = max(edges.shape[0] - 1, 0)
+    n_bands = channel_lo.shape[0]
+
+    counts = np.zeros((n_bands, n_bins), dtype=np.int64)
+    summed_weights = np.zeros(n_bins)
+
+    if n_bins == 0:
+        return counts, summed_weights
+
+    use_weights = weights.shape[0] > 0
+
+    tmin = edges[0]
+    tmax = edges[-1]
+
+    dt = edges[1] - edges[0]
+
+    for i in range(times.shape[0]):
+
+        t = times[i]
+
+        if (t < tmin) or (t > tmax):
+            continue
+
+        k = _uniform_bin(t, edges, dt, n_bins)
+
+        if use_weights:
+            summed_weights[k] += weights[i]
+
+        for j in range(n_bands):
+
+            if (pha[i] > channel_lo[j]) and (pha[i] < channel_hi[j]):
+
+                counts[j, k] += 1
+
+    return counts, summed_weights
+
+
+def rebin_counts(counts, factor):
+    """
+    rebin counts to a coarser cadence by summing groups
+    of factor adjacent bins along the last axis. Bins
+    left over at the end are dropped
+
+    :param counts:
+    :param factor:
+    :returns:
+    :rtype:
+
+    """
+
+    assert factor >= 1, "the rebin factor must be at least one"
+
+    counts = np.asarray(counts)
+
+    n_bins = (counts.shape[-1] // factor) * factor
+
+    shape = counts.shape[:-1] + (n_bins // factor, factor)
+
+    return counts[..., :n_bins].reshape(shape).sum(axis=-1)
+
+
+@nb.njit(fastmath=True, nogil=True, cache=True)
 def select_time(tmin, tmax, times, original_idx=None):
 
     N = times.shape[0]
@@ -1,3 +1,4 @@
+import numba as nb
 import numpy as np
 
 from cosmogrb.lightcurve.light_curve_storage import LightCurveStorage
@@ -6,6 +7,57 @@ from cosmogrb.utils.logging import setup_logger
 logger = setup_logger(__name__)
 
 
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def merge_events(times_background, pha_background, times_source, pha_source):
+    """
+    merge the sorted background and source events into one
+    sorted stream in a single pass. Background events go first
+    when the times are equal
+
+    :param times_background:
+    :param pha_background:
+    :param times_source:
+    :param pha_source:
+    :returns: (times, pha, is_source)
+    :rtype:
+
+    """
+
+    n_background = times_background.shape[0]
+    n_source = times_source.shape[0]
+
+    N = n_background + n_source
+
+    times = np.empty(N)
+    pha = np.empty(N, dtype=np.int64)
+    is_source = np.empty(N, dtype=np.bool_)
+
+    i = 0
+    j = 0
+
+    for k in range(N):
+
+        if (j >= n_source) or (
+            (i < n_background) and (times_background[i] <= times_source[j])
+        ):
+
+            times[k] = times_background[i]
+            pha[k] = pha_background[i]
+            is_source[k] = False
+
+            i += 1
+
+        else:
+
+            times[k] = times_source[j]
+            pha[k] = pha_source[j]
+            is_source[k] = True
+
+            j += 1
+
+    return times, pha, is_source
+
+
 class LightCurve(object):
     def __init__(
         self,
@@ -57,6 +109,8 @@ class LightCurve(object):
 
         self._initial_source_channels = None
         self._initial_bkg_channels = None
+
+        self._is_source = None
         self._name = name
         self._grb_name = grb_name
         self._T0 = T0
@@ -118,15 +172,15 @@ class LightCurve(object):
 
         logger.debug(f"{self._grb_name} {self._name}: sampling background")
 
-        self._initial_bkg_light_curves = self._background.sample_times()
-        self._initial_bkg_channels = self._background.sample_channel(
-            size=len(self._initial_bkg_light_curves)
-        )
+        # the times come out sorted
 
-        idx = self._initial_bkg_light_curves.argsort()
+        (
+            self._initial_bkg_light_curves,
+            self._initial_bkg_channels,
+        ) = self._background.sample_events()
 
-        self._times_background = self._initial_bkg_light_curves[idx]
-        self._pha_background = self._initial_bkg_channels[idx]
+        self._times_background = self._initial_bkg_light_curves
+        self._pha_background = self._initial_bkg_channels
 
     def _combine(self):
         """
@@ -137,19 +191,15 @@ class LightCurve(object):
 
         """
 
-        self._times = np.append(
-            self._initial_bkg_light_curves, self._initial_source_light_curves
-        )
+        # both are already sorted so they are merged
 
-        self._pha = np.append(
-            self._initial_bkg_channels, self._initial_source_channels
+        self._times, self._pha, self._is_source = merge_events(
+            self._times_background,
+            self._pha_background,
+            self._times_source,
+            self._pha_source,
         )
 
-        idx = self._times.argsort()
-
-        self._times = self._times[idx]
-        self._pha = self._pha[idx]
-
         logger.debug(
             f"{self._grb_name} {self._name} has {len(self._pha)} counts after combining "
         )
@@ -177,6 +227,12 @@ class LightCurve(object):
             f"{self._grb_name} {self._name}: now has {len(self._pha)} counts after dead time filtering"
         )
 
+        # the origin of the events that survived the dead time
+        # splits them into source and background, so that the
+        # two add up to the total
+
+        is_background = ~self._is_source
+
         # now create a lightcurve storage
 
         lc_storage = LightCurveStorage(
@@ -186,10 +242,10 @@ class LightCurve(object):
             time_adjustment=self._time_adjustment,
             pha=self._pha,
             times=self._times,
-            pha_source=self._pha_source,
-            times_source=self._times_source,
-            pha_background=self._pha_background,
-            times_background=self._times_background,
+            pha_source=self._pha[self._is_source],
+            times_source=self._times[self._is_source],
+            pha_background=self._pha[is_background],
+            times_background=self._times[is_background],
             channels=self._response.channels,
             ebounds=self._response.channel_edges,
             T0=self._T0,
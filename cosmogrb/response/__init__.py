@@ -1,3 +1,4 @@
 from cosmogrb.response.response import Response
+from cosmogrb.response.response_cache import ResponseCache
 
-__all__ = ["Response"]
+__all__ = ["Response", "ResponseCache"]
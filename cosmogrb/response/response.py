@@ -5,22 +5,90 @@ from numba.typed import Dict
 
 from cosmogrb.utils.interpolation import Interp1D
 from cosmogrb.utils.response_file import RSP
+from cosmogrb.utils.rng import get_rng
 
 
-@nb.njit(fastmath=True, cache=False)
-def _digitize(photon_energies, energy_edges, cum_matrix):
+@nb.njit(fastmath=True, cache=True)
+def _photon_bins(photon_energies, energy_edges):
 
-    pha_channels = np.zeros(len(photon_energies))
-    for i in range(len(photon_energies)):
-        idx = np.searchsorted(energy_edges, photon_energies[i]) - 1
+    # photons on the edges of the matrix go in the outer bins
 
-        # get a uniform random number
-        r = np.random.random()
+    idx = np.searchsorted(energy_edges, photon_energies) - 1
 
-        # get the pha channel from the cumulative distribution
-        pha = int(np.abs(cum_matrix[idx] - r).argmin())
+    return np.clip(idx, 0, energy_edges.shape[0] - 2)
 
-        pha_channels[i] = pha
+
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def _digitize_grouped(photon_energies, energy_edges, cum_matrix, rng):
+    """
+    digitize the photons after grouping them by their
+    energy bin with a counting sort so that each row of
+    the cumulative matrix is only loaded once
+
+    :param photon_energies:
+    :param energy_edges:
+    :param cum_matrix:
+    :param rng:
+    :returns:
+    :rtype:
+
+    """
+
+    N = len(photon_energies)
+
+    n_bins = cum_matrix.shape[0]
+
+    photon_bins = _photon_bins(photon_energies, energy_edges)
+
+    # the start of each energy bin in the grouped order
+
+    offsets = np.zeros(n_bins + 1, dtype=np.int64)
+
+    for i in range(N):
+        offsets[photon_bins[i] + 1] += 1
+
+    for k in range(n_bins):
+        offsets[k + 1] += offsets[k]
+
+    fill = offsets[:-1].copy()
+
+    order = np.empty(N, dtype=np.int64)
+
+    for i in range(N):
+
+        k = photon_bins[i]
+
+        order[fill[k]] = i
+        fill[k] += 1
+
+    pha_channels = np.zeros(N, dtype=np.int64)
+
+    for k in range(n_bins):
+
+        n_k = offsets[k + 1] - offsets[k]
+
+        if n_k == 0:
+            continue
+
+        r = rng.random(n_k)
+
+        if cum_matrix[k, -1] <= 0.0:
+
+            # this bin cannot be detected
+            channels = np.zeros(n_k, dtype=np.int64)
+
+        else:
+
+            channels = np.searchsorted(cum_matrix[k], r, side="right")
+
+        for j in range(n_k):
+
+            pha = channels[j]
+
+            if pha > cum_matrix.shape[1] - 1:
+                pha = cum_matrix.shape[1] - 1
+
+            pha_channels[order[offsets[k] + j]] = pha
 
     return pha_channels
 
@@ -153,23 +221,23 @@ class Response(object):
             self._normed_probability_matrix, axis=1
         )
 
-    def digitize(self, photon_energies):
+    def digitize(self, photon_energies, rng=None):
         """
         digitze the photon into a energy bin
         via the energy dispersion
 
         :param photon_energy:
+        :param rng: the random Generator or a seed
         :returns: (pha_channel, detected)
         :rtype:
 
         """
 
-        np.random.seed()
-
-        pha_channels = _digitize(
+        pha_channels = _digitize_grouped(
             photon_energies,
             self._energy_edges,
             self._cumulative_maxtrix,
+            get_rng(rng),
         )
         return pha_channels
 
@@ -0,0 +1,270 @@
+import collections
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from cosmogrb.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ResponseCache(object):
+    def __init__(
+        self,
+        angular_tolerance: float,
+        time_tolerance: float,
+        max_entries: int,
+        time_range: Optional[Tuple[float, float]] = None,
+        disk_path: Optional[str] = None,
+    ):
+        """
+        a cache of response matrices. The sky is split into rings
+        of constant declination which are split into pixels of
+        about the same size and the time into bins. All GRBs
+        of the same pixel and time bin share the response which
+        is computed at the center of the pixel and bin so that the
+        cache does not depend on the order in which GRBs arrive
+
+        :param angular_tolerance: the size of a sky pixel in degrees
+        :param time_tolerance: the width of a time bin in seconds
+        :param max_entries: the number of matrices held in memory
+        :param time_range: the times the centers are clipped to
+        :param disk_path: if given, the matrices are also stored here
+        :returns:
+        :rtype:
+
+        """
+
+        assert angular_tolerance > 0, "the angular tolerance must be positive"
+        assert time_tolerance > 0, "the time tolerance must be positive"
+        assert max_entries > 0, "the cache must hold at least one matrix"
+
+        self._angular_tolerance: float = angular_tolerance
+        self._time_tolerance: float = time_tolerance
+        self._max_entries: int = max_entries
+        self._time_range = time_range
+
+        self._n_rings: int = int(np.ceil(180.0 / angular_tolerance))
+        self._ring_width: float = 180.0 / self._n_rings
+
+        self._disk_path: Optional[Path] = None
+
+        if disk_path is not None:
+
+            # different tolerances have different centers
+
+            self._disk_path = (
+                Path(disk_path).expanduser()
+                / f"a{angular_tolerance:g}_t{time_tolerance:g}"
+            )
+
+            self._disk_path.mkdir(parents=True, exist_ok=True)
+
+        self._entries = collections.OrderedDict()
+
+        self._lock = threading.Lock()
+
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self):
+
+        return len(self._entries)
+
+    def pixel(
+        self, ra: float, dec: float
+    ) -> Tuple[Tuple[int, int], float, float]:
+        """
+        the sky pixel of a position and its center
+
+        :param ra: in degrees
+        :param dec: in degrees
+        :returns: ((ring, index), ra_center, dec_center)
+        :rtype:
+
+        """
+
+        ring = int(np.floor((dec + 90.0) / self._ring_width))
+
+        ring = min(max(ring, 0), self._n_rings - 1)
+
+        dec_center = -90.0 + (ring + 0.5) * self._ring_width
+
+        n_pixels = max(
+            1,
+            int(
+                np.ceil(
+                    360.0
+                    * np.cos(np.deg2rad(dec_center))
+                    / self._angular_tolerance
+                )
+            ),
+        )
+
+        pixel_width = 360.0 / n_pixels
+
+        index = int(np.floor((ra % 360.0) / pixel_width)) % n_pixels
+
+        ra_center = (index + 0.5) * pixel_width
+
+        return (ring, index), ra_center, dec_center
+
+    def time_bin(self, time: float) -> Tuple[int, float]:
+        """
+        the time bin of a time and its center
+
+        :param time:
+        :returns: (bin, time_center)
+        :rtype:
+
+        """
+
+        idx = int(np.floor(time / self._time_tolerance))
+
+        time_center = (idx + 0.5) * self._time_tolerance
+
+        if self._time_range is not None:
+
+            time_center = min(
+                max(time_center, self._time_range[0]), self._time_range[1]
+            )
+
+        return idx, time_center
+
+    def get(
+        self,
+        det_name: str,
+        ra: float,
+        dec: float,
+        time: float,
+        compute: Callable[[float, float, float], np.ndarray],
+    ) -> np.ndarray:
+        """
+        the response of a detector for a position and time. If
+        it is neither in memory nor on disk it is computed with
+        compute(ra, dec, time) at the center of the pixel and bin
+
+        :param det_name:
+        :param ra:
+        :param dec:
+        :param time:
+        :param compute:
+        :returns:
+        :rtype:
+
+        """
+
+        (ring, index), ra_center, dec_center = self.pixel(ra, dec)
+
+        idx, time_center = self.time_bin(time)
+
+        key = (det_name, idx, ring, index)
+
+        with self._lock:
+
+            if key in self._entries:
+
+                self._entries.move_to_end(key)
+
+                self._hits += 1
+
+                return self._entries[key]
+
+        matrix = self._load(key)
+
+        if matrix is None:
+
+            logger.debug(f"computing the response of {key}")
+
+            matrix = np.ascontiguousarray(
+                compute(ra_center, dec_center, time_center)
+            )
+
+            self._store(key, matrix)
+
+            with self._lock:
+
+                self._misses += 1
+
+        else:
+
+            with self._lock:
+
+                self._hits += 1
+
+        # the matrices are shared so they must not be changed
+
+        matrix.flags.writeable = False
+
+        with self._lock:
+
+            self._entries[key] = matrix
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_entries:
+
+                self._entries.popitem(last=False)
+
+        return matrix
+
+    def clear(self) -> None:
+        """
+        empty the memory tier. The disk tier is left alone
+
+        :returns:
+        :rtype:
+
+        """
+
+        with self._lock:
+
+            self._entries.clear()
+
+    def _file_name(self, key) -> Path:
+
+        det_name, idx, ring, index = key
+
+        return self._disk_path / f"{det_name}_{idx}_{ring}_{index}.npy"
+
+    def _load(self, key) -> Optional[np.ndarray]:
+
+        if self._disk_path is None:
+
+            return None
+
+        file_name = self._file_name(key)
+
+        if not file_name.is_file():
+
+            return None
+
+        return np.load(file_name)
+
+    def _store(self, key, matrix: np.ndarray) -> None:
+
+        if self._disk_path is None:
+
+            return
+
+        # write to a temporary file first so that other
+        # processes never read a partial matrix
+
+        fd, tmp_name = tempfile.mkstemp(dir=self._disk_path, suffix=".npy")
+
+        with os.fdopen(fd, "wb") as f:
+
+            np.save(f, matrix)
+
+        os.replace(tmp_name, self._file_name(key))
@@ -3,45 +3,218 @@ import numba as nb
 import numpy as np
 
 from cosmogrb.utils.logging import setup_logger
-from cosmogrb.utils.numba_array import VectorFloat64
+from cosmogrb.utils.rng import get_rng
 
 from .sampler import Sampler
 
 logger = setup_logger(__name__)
 
 
-@nb.njit(fastmath=True)
-def background_poisson_generator(tstart, tstop, rate):
+@nb.njit(fastmath=True, cache=True)
+def sorted_uniform_times(tstart, tstop, n, rng):
     """
+    draw n sorted uniform times between tstart and tstop
+    without a sort. The normalized partial sums of n + 1
+    exponential spacings are distributed like the order
+    statistics of n uniforms
 
     :param tstart:
     :param tstop:
-    :param rate:
+    :param n:
+    :param rng:
+    :returns:
+    :rtype:
+
+    """
+
+    spacings = -np.log(rng.random(n + 1))
+
+    total = spacings.sum()
+
+    scale = (tstop - tstart) / total
+
+    arrival_times = np.empty(n)
+
+    cumulative = 0.0
+
+    for i in range(n):
+
+        cumulative += spacings[i]
+
+        arrival_times[i] = tstart + cumulative * scale
+
+    return arrival_times
+
+
+@nb.njit(fastmath=True, cache=True)
+def build_alias_table(weights):
+    """
+    build the Walker alias table of a discrete distribution
+    with Vose's method
+
+    :param weights: the (unnormalized) weights
+    :returns: (probability, alias)
+    :rtype:
+
+    """
+
+    n = weights.shape[0]
+
+    probability = weights * n / weights.sum()
+
+    alias = np.arange(n)
+
+    small = np.empty(n, dtype=np.int64)
+    large = np.empty(n, dtype=np.int64)
+
+    n_small = 0
+    n_large = 0
+
+    for i in range(n):
+
+        if probability[i] < 1.0:
+
+            small[n_small] = i
+            n_small += 1
+
+        else:
+
+            large[n_large] = i
+            n_large += 1
+
+    while (n_small > 0) and (n_large > 0):
+
+        n_small -= 1
+        n_large -= 1
+
+        s = small[n_small]
+        l = large[n_large]
+
+        alias[s] = l
+
+        probability[l] = (probability[l] + probability[s]) - 1.0
+
+        if probability[l] < 1.0:
+
+            small[n_small] = l
+            n_small += 1
+
+        else:
+
+            large[n_large] = l
+            n_large += 1
+
+    # what is left over is one up to round off
+
+    for i in range(n_large):
+        probability[large[i]] = 1.0
+
+    for i in range(n_small):
+        probability[small[i]] = 1.0
+
+    return probability, alias
+
+
+@nb.njit(fastmath=True, cache=True)
+def alias_draw(probability, alias, u):
+    """
+    draw an index from the alias table with a single
+    uniform number
+
+    :param probability:
+    :param alias:
+    :param u:
+    :returns:
+    :rtype:
+
+    """
+
+    x = u * probability.shape[0]
+
+    idx = int(x)
+
+    # guard against u * n rounding up to n
+
+    if idx >= probability.shape[0]:
+        idx = probability.shape[0] - 1
+
+    if x - idx < probability[idx]:
+
+        return idx
+
+    return alias[idx]
+
+
+@nb.njit(fastmath=True, cache=True)
+def alias_sample(channels, probability, alias, n, rng):
+    """
+    draw n channels from the alias table
+
+    :param channels:
+    :param probability:
+    :param alias:
+    :param n:
+    :param rng:
     :returns:
     :rtype:
 
     """
 
-    fmax = rate
+    u = rng.random(n)
 
-    time = tstart
+    out = np.empty(n, dtype=channels.dtype)
 
-    arrival_times = VectorFloat64(0)
-    arrival_times.append(time)
+    for i in range(n):
 
-    while True:
+        out[i] = channels[alias_draw(probability, alias, u[i])]
 
-        time = time - (1.0 / fmax) * np.log(np.random.rand())
-        if time > tstop:
-            break
-        test = np.random.rand()
+    return out
 
-        p_test = rate / fmax
 
-        if test <= p_test:
-            arrival_times.append(time)
+@nb.njit(fastmath=True, nogil=True, cache=True)
+def background_event_generator(
+    tstart, tstop, n, channels, probability, alias, rng
+):
+    """
+    draw n sorted uniform times between tstart and tstop
+    and their channels from the alias table
+
+    :param tstart:
+    :param tstop:
+    :param n:
+    :param channels:
+    :param probability:
+    :param alias:
+    :param rng:
+    :returns: (times, channels)
+    :rtype:
+
+    """
+
+    arrival_times = sorted_uniform_times(tstart, tstop, n, rng)
+
+    arrival_channels = alias_sample(channels, probability, alias, n, rng)
 
-    return arrival_times.arr
+    return arrival_times, arrival_channels
+
+
+def background_poisson_generator(tstart, tstop, rate, rng):
+    """
+    homogeneous poisson process generator. The number
+    of events is drawn first and then their sorted times
+
+    :param tstart:
+    :param tstop:
+    :param rate:
+    :param rng:
+    :returns:
+    :rtype:
+
+    """
+
+    n = rng.poisson(rate * (tstop - tstart))
+
+    return sorted_uniform_times(tstart, tstop, n, rng)
 
 
 class BackgroundSpectrumTemplate(object):
@@ -62,10 +235,14 @@ class BackgroundSpectrumTemplate(object):
         if start_at_one:
             j = 1
 
-        self._channels = [i + j for i in range(len(counts))]
+        self._channels = np.arange(len(counts), dtype=np.int64) + j
 
         self._normalize_counts()
 
+        self._probability, self._alias = build_alias_table(
+            self._weights.astype(np.float64)
+        )
+
     def _normalize_counts(self):
         """
         get weights by normalizing the counts
@@ -77,20 +254,60 @@ class BackgroundSpectrumTemplate(object):
 
         self._weights = self._counts / self._counts.sum()
 
-    def sample_channel(self, size=None):
+    def sample_channel(self, size=None, rng=None):
         """
         Sample from the background template
 
         :param size:
+        :param rng: the random Generator or a seed
         :returns:
         :rtype:
 
         """
 
-        np.random.seed()
-
         # sample a channel from the background
-        return np.random.choice(self._channels, size=size, p=self._weights)
+
+        if size is None:
+
+            return alias_sample(
+                self._channels, self._probability, self._alias, 1, get_rng(rng)
+            )[0]
+
+        return alias_sample(
+            self._channels, self._probability, self._alias, size, get_rng(rng)
+        )
+
+    def sample_events(self, tstart, tstop, n, rng=None):
+        """
+        sample n sorted uniform times and their channels
+        from the background template in one pass
+
+        :param tstart:
+        :param tstop:
+        :param n:
+        :param rng: the random Generator or a seed
+        :returns: (times, channels)
+        :rtype:
+
+        """
+
+        return background_event_generator(
+            tstart,
+            tstop,
+            n,
+            self._channels,
+            self._probability,
+            self._alias,
+            get_rng(rng),
+        )
+
+    @property
+    def channels(self):
+        return self._channels
+
+    @property
+    def weights(self):
+        return self._weights
 
     @classmethod
     def from_file(cls, file_name, start_at_one=False):
@@ -119,20 +336,22 @@ class Background(Sampler):
         tstop,
         average_rate=1000,
         background_spectrum_template=None,
+        rng=None,
     ):
 
+        super(Background, self).__init__(
+            tstart=tstart,
+            tstop=tstop,
+            rng=rng,
+        )
+
         # TODO: change this as it is currently stupid
-        self._background_rate = np.random.normal(average_rate, 10)
+        self._background_rate = self._rng.normal(average_rate, 10)
 
         self._background_spectrum_template = background_spectrum_template
 
         logger.debug(f"background rate is {self._background_rate}")
 
-        super(Background, self).__init__(
-            tstart=tstart,
-            tstop=tstop,
-        )
-
     def sample_times(self):
         """
         sample the background times
@@ -142,10 +361,8 @@ class Background(Sampler):
 
         """
 
-        np.random.seed()
-
         background_times = background_poisson_generator(
-            self._tstart, self._tstop, self._background_rate
+            self._tstart, self._tstop, self._background_rate, self._rng
         )
 
         logger.debug(f"created {len(background_times)} background counts")
@@ -163,12 +380,36 @@ class Background(Sampler):
 
         """
 
-        np.random.seed()
-
         if self._background_spectrum_template is not None:
 
-            return self._background_spectrum_template.sample_channel(size=size)
+            return self._background_spectrum_template.sample_channel(
+                size=size, rng=self._rng
+            )
 
         else:
 
             raise NotImplementedError()
+
+    def sample_events(self):
+        """
+        sample the background times and their channels
+        together. The times are sorted
+
+        :returns: (times, channels)
+        :rtype:
+
+        """
+
+        if self._background_spectrum_template is None:
+
+            raise NotImplementedError()
+
+        n = self._rng.poisson(
+            self._background_rate * (self._tstop - self._tstart)
+        )
+
+        logger.debug(f"created {n} background counts")
+
+        return self._background_spectrum_template.sample_events(
+            self._tstart, self._tstop, n, rng=self._rng
+        )
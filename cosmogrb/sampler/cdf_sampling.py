@@ -0,0 +1,76 @@
+import numba as nb
+import numpy as np
+
+
+@nb.njit(fastmath=True, cache=True)
+def build_cdf(x, y):
+    """
+    build the normalized cumulative distribution of a
+    density y tabulated on the grid x with the trapezoid rule
+
+    :param x:
+    :param y:
+    :returns:
+    :rtype:
+
+    """
+
+    M = x.shape[0]
+
+    cdf = np.empty(M)
+    cdf[0] = 0.0
+
+    for m in range(1, M):
+
+        cdf[m] = cdf[m - 1] + 0.5 * (y[m] + y[m - 1]) * (x[m] - x[m - 1])
+
+    total = cdf[-1]
+
+    if total > 0:
+
+        for m in range(M):
+            cdf[m] /= total
+
+    else:
+
+        # nothing to sample from, fall back to uniform
+
+        for m in range(M):
+            cdf[m] = (x[m] - x[0]) / (x[-1] - x[0])
+
+    return cdf
+
+
+@nb.njit(fastmath=True, cache=True)
+def sample_from_cdf(x, cdf, u):
+    """
+    invert the cumulative distribution at u with a binary
+    search and interpolate linearly within the bin
+
+    :param x:
+    :param cdf:
+    :param u:
+    :returns:
+    :rtype:
+
+    """
+
+    idx = np.searchsorted(cdf, u)
+
+    if idx < 1:
+        idx = 1
+
+    elif idx > x.shape[0] - 1:
+        idx = x.shape[0] - 1
+
+    width = cdf[idx] - cdf[idx - 1]
+
+    if width > 0:
+
+        w = (u - cdf[idx - 1]) / width
+
+    else:
+
+        w = 0.0
+
+    return x[idx - 1] + w * (x[idx] - x[idx - 1])
@@ -5,9 +5,12 @@ from cosmogrb.sampler.cpl_constant_functions import (
     cpl_evolution,
     energy_integrated_evolution,
     sample_energy,
+    sample_energy_cdf,
     sample_events,
+    sample_events_batched,
     time_integrated_evolution,
 )
+from cosmogrb.utils.rng import get_rng
 
 from .source_function import SourceFunction
 
@@ -80,7 +83,36 @@ class ConstantCPL(SourceFunction):
             z=self._z,
         )
 
-    def sample_events(self, tstart, tstop, fmax):
+    def energy_integrated_evolution_grid(self, times):
+
+        # the rate does not evolve
+
+        times = np.atleast_1d(times)
+
+        return np.full(
+            times.shape, self.energy_integrated_evolution(times[:1])
+        )
+
+    def sample_events(self, tstart, tstop, fmax, block_size=0, rng=None):
+
+        rng = get_rng(rng)
+
+        if block_size > 0:
+
+            return sample_events_batched(
+                tstart=tstart,
+                tstop=tstop,
+                peak_flux=self._peak_flux,
+                ep=self._ep,
+                alpha=self._alpha,
+                emin=self._emin,
+                emax=self._emax,
+                effective_area=self._response.effective_area_packed,
+                fmax=fmax,
+                z=self._z,
+                block_size=block_size,
+                rng=rng,
+            )
 
         return sample_events(
             tstart=tstart,
@@ -93,12 +125,31 @@ class ConstantCPL(SourceFunction):
             effective_area=self._response.effective_area_packed,
             fmax=fmax,
             z=self._z,
+            rng=rng,
         )
 
-    def sample_energy(self, times):
+    def sample_energy(self, times, cdf_resolution=0.0, rng=None):
+
+        rng = get_rng(rng)
 
         ea = self._response.effective_area_packed
 
+        if cdf_resolution > 0:
+
+            # the spectrum does not evolve, so the
+            # resolution does not matter
+
+            return sample_energy_cdf(
+                times=times,
+                ep=self._ep,
+                alpha=self._alpha,
+                emin=self._emin,
+                emax=self._emax,
+                effective_area=ea,
+                z=self._z,
+                rng=rng,
+            )
+
         return sample_energy(
             times=times,
             peak_flux=self._peak_flux,
@@ -108,4 +159,5 @@ class ConstantCPL(SourceFunction):
             emax=self._emax,
             effective_area=ea,
             z=self._z,
+            rng=rng,
         )
@@ -1,14 +1,13 @@
 import numba as nb
-import numba_scipy
 import numpy as np
 from interpolation import interp
-from scipy.special import gamma, gammaincc
 
-from cosmogrb.sampler.cpl_functions import cpl
+from cosmogrb.sampler.cdf_sampling import build_cdf, sample_from_cdf
+from cosmogrb.sampler.cpl_functions import cpl_cutoff, cpl_norm, cpl_shape
 from cosmogrb.utils.numba_array import VectorFloat64
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def cpl_evolution(energy, time, peak_flux, ep, alpha, emin, emax, z):
     """
     evolution of the CPL function with time
@@ -36,16 +35,21 @@ def cpl_evolution(energy, time, peak_flux, ep, alpha, emin, emax, z):
 
     out = np.empty((N, M))
 
+    # the spectrum does not evolve so the
+    # normalization is computed once
+
+    ec = cpl_cutoff(alpha, ep)
+
+    norm = cpl_norm(alpha, ec, peak_flux, a, b)
+
     for n in range(N):
         for m in range(M):
-            out[n, m] = cpl(
-                energy[m] * (1 + z), alpha=alpha, xp=ep, F=peak_flux, a=a, b=b
-            )
+            out[n, m] = norm * cpl_shape(energy[m] * (1 + z), alpha, ec)
 
     return out
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def folded_cpl_evolution(
     energy,
     time,
@@ -63,7 +67,7 @@ def folded_cpl_evolution(
     )
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True, nogil=True)
 def sample_events(
     emin,
     emax,
@@ -75,21 +79,21 @@ def sample_events(
     effective_area,
     fmax,
     z,
+    rng,
 ):
 
     time = tstart
 
     arrival_times = VectorFloat64(0)
-    arrival_times.append(time)
 
     vtime = np.empty(1)
     while True:
 
-        time = time - (1.0 / fmax) * np.log(np.random.rand())
+        time = time - (1.0 / fmax) * np.log(rng.random())
         if time > tstop:
             break
 
-        test = np.random.rand()
+        test = rng.random()
 
         vtime[0] = time
 
@@ -106,8 +110,73 @@ def sample_events(
     return arrival_times.arr
 
 
-@nb.njit(fastmath=True, cache=False)
-def sample_energy(times, peak_flux, ep, alpha, emin, emax, effective_area, z):
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def sample_events_batched(
+    emin,
+    emax,
+    tstart,
+    tstop,
+    peak_flux,
+    ep,
+    alpha,
+    effective_area,
+    fmax,
+    z,
+    block_size,
+    rng,
+):
+    """
+    thin the envelope process in blocks of candidate times.
+    The rate does not evolve so it is only evaluated once
+
+    :param block_size: the number of candidates per block
+    :param rng: the numpy random Generator
+    :returns:
+    :rtype:
+
+    """
+
+    time = tstart
+
+    arrival_times = VectorFloat64(0)
+
+    vtime = np.empty(1)
+    vtime[0] = tstart
+
+    p_test = (
+        energy_integrated_evolution(
+            emin, emax, vtime, peak_flux, ep, alpha, effective_area, z
+        )
+        / fmax
+    )
+
+    while True:
+
+        candidates = time - (1.0 / fmax) * np.cumsum(
+            np.log(rng.random(block_size))
+        )
+
+        n_valid = np.searchsorted(candidates, tstop, side="right")
+
+        tests = rng.random(n_valid)
+
+        for i in range(n_valid):
+
+            if tests[i] <= p_test:
+                arrival_times.append(candidates[i])
+
+        if n_valid < block_size:
+            break
+
+        time = candidates[-1]
+
+    return arrival_times.arr
+
+
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def sample_energy(
+    times, peak_flux, ep, alpha, emin, emax, effective_area, z, rng
+):
 
     N = times.shape[0]
 
@@ -145,14 +214,14 @@ def sample_energy(times, peak_flux, ep, alpha, emin, emax, effective_area, z):
         while True:
 
             # sample from a power law
-            u = np.random.uniform(0, 1)
+            u = rng.random()
             x[0] = np.power(
                 (np.power(emax, alpha + 1) - np.power(emin, alpha + 1)) * u
                 + np.power(emin, alpha + 1),
                 1.0 / (alpha + 1.0),
             )
 
-            y = np.random.uniform(0, 1) * C * np.power(x[0] / egrid[idx], alpha)
+            y = rng.random() * C * np.power(x[0] / egrid[idx], alpha)
 
             # here the vtime is just to trick this into being an array
 
@@ -178,7 +247,39 @@ def sample_energy(times, peak_flux, ep, alpha, emin, emax, effective_area, z):
     return out
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def sample_energy_cdf(times, ep, alpha, emin, emax, effective_area, z, rng):
+    """
+    sample the photon energies by inverting the cumulative
+    distribution of the folded spectrum. The spectrum does
+    not evolve so the CDF is built once
+
+    """
+
+    N = times.shape[0]
+
+    egrid = np.power(10.0, np.linspace(np.log10(emin), np.log10(emax), 500))
+
+    ec = cpl_cutoff(alpha, ep)
+
+    spectrum = interp(effective_area[0], effective_area[1], egrid)
+
+    for m in range(egrid.shape[0]):
+
+        spectrum[m] *= cpl_shape(egrid[m] * (1 + z), alpha, ec)
+
+    cdf = build_cdf(egrid, spectrum)
+
+    out = np.empty(N)
+
+    for i in range(N):
+
+        out[i] = sample_from_cdf(egrid, cdf, rng.random())
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
 def energy_integrated_evolution(
     emin, emax, time, peak_flux, ep, alpha, effective_area, z
 ):
@@ -196,7 +297,7 @@ def energy_integrated_evolution(
     return np.trapz(energy_slice[0, :], energy_grid)
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def time_integrated_evolution(
     tmin, tmax, energy, peak_flux, ep, alpha, emin, emax, effective_area, z
 ):
@@ -1,15 +1,16 @@
+import math
+
 import numba as nb
-import numba_scipy
 import numpy as np
 from interpolation import interp
-from scipy.special import gamma, gammaincc
 
+from cosmogrb.sampler.cdf_sampling import build_cdf, sample_from_cdf
 from cosmogrb.sampler.temporal_functions import norris
 from cosmogrb.utils.numba_array import VectorFloat64
 
 
-@nb.njit(fastmath=True, cache=False)
-def cpl(x, alpha, xp, F, a, b):
+@nb.njit(fastmath=True, cache=True)
+def cpl_cutoff(alpha, xp):
 
     if alpha == -2:
 
@@ -19,12 +20,98 @@ def cpl(x, alpha, xp, F, a, b):
 
         ec = xp / (2 + alpha)
 
-    # Cutoff power law
+    return ec
+
+
+@nb.njit(fastmath=True, cache=True)
+def upper_incomplete_gamma(s, x):
+    """
+    the upper incomplete gamma function Gamma(s, x) for s > 0.
+    This is gammaincc(s, x) * gamma(s) of scipy. It is written
+    out because the scipy functions cannot be cached by numba
+
+    :param s:
+    :param x:
+    :returns:
+    :rtype:
+
+    """
+
+    if s <= 0.0 or x < 0.0:
+
+        return np.nan
+
+    if x == 0.0:
+
+        return math.gamma(s)
+
+    log_prefactor = s * math.log(x) - x
+
+    if x < s + 1.0:
+
+        # the series of the lower incomplete gamma function
+
+        term = 1.0 / s
+        total = term
+        n = s
+
+        for _ in range(1000):
+
+            n += 1.0
+            term *= x / n
+            total += term
+
+            if abs(term) < abs(total) * 1e-16:
+
+                break
+
+        return math.gamma(s) - total * math.exp(log_prefactor)
+
+    # the continued fraction of the upper incomplete
+    # gamma function (modified Lentz)
+
+    tiny = 1e-300
+
+    b = x + 1.0 - s
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+
+    for i in range(1, 1000):
+
+        an = -i * (i - s)
+        b += 2.0
+
+        d = an * d + b
+
+        if abs(d) < tiny:
+
+            d = tiny
+
+        c = b + an / c
+
+        if abs(c) < tiny:
+
+            c = tiny
+
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1.0) < 1e-16:
+
+            break
+
+    return math.exp(log_prefactor) * h
+
+
+@nb.njit(fastmath=True, cache=True)
+def cpl_norm(alpha, ec, F, a, b):
 
     # get the intergrated flux
 
-    i1 = gammaincc(2.0 + alpha, a / ec) * gamma(2.0 + alpha)
-    i2 = gammaincc(2.0 + alpha, b / ec) * gamma(2.0 + alpha)
+    i1 = upper_incomplete_gamma(2.0 + alpha, a / ec)
+    i2 = upper_incomplete_gamma(2.0 + alpha, b / ec)
 
     intflux = -ec * ec * (i2 - i1)
 
@@ -32,19 +119,30 @@ def cpl(x, alpha, xp, F, a, b):
 
     erg2keV = 6.24151e8
 
-    norm = F * erg2keV / (intflux)
+    return F * erg2keV / (intflux)
+
+
+@nb.njit(fastmath=True, cache=True)
+def cpl_shape(x, alpha, ec):
 
     log_xc = np.log(ec)
 
     log_v = alpha * (np.log(x) - log_xc) - (x / ec)
-    flux = np.exp(log_v)
+
+    return np.exp(log_v)
+
+
+@nb.njit(fastmath=True, cache=True)
+def cpl(x, alpha, xp, F, a, b):
+
+    ec = cpl_cutoff(alpha, xp)
 
     # Cutoff power law
 
-    return norm * flux
+    return cpl_norm(alpha, ec, F, a, b) * cpl_shape(x, alpha, ec)
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def cpl_evolution(
     energy,
     time,
@@ -92,15 +190,19 @@ def cpl_evolution(
 
         ep = ep_start / (1 + time[n] / ep_tau)
 
+        # the normalization only changes with time
+
+        ec = cpl_cutoff(alpha, ep)
+
+        norm = cpl_norm(alpha, ec, K, a, b)
+
         for m in range(M):
-            out[n, m] = cpl(
-                energy[m] * (1 + z), alpha=alpha, xp=ep, F=K, a=a, b=b
-            )
+            out[n, m] = norm * cpl_shape(energy[m] * (1 + z), alpha, ec)
 
     return out
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def folded_cpl_evolution(
     energy,
     time,
@@ -131,7 +233,7 @@ def folded_cpl_evolution(
     )
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True, nogil=True)
 def sample_events(
     emin,
     emax,
@@ -146,22 +248,22 @@ def sample_events(
     effective_area,
     fmax,
     z,
+    rng,
 ):
 
     time = tstart
 
     arrival_times = VectorFloat64(0)
-    arrival_times.append(time)
 
     vtime = np.empty(1)
 
     while True:
 
-        time = time - (1.0 / fmax) * np.log(np.random.rand())
+        time = time - (1.0 / fmax) * np.log(rng.random())
         if time > tstop:
             break
 
-        test = np.random.rand()
+        test = rng.random()
 
         vtime[0] = time
 
@@ -188,7 +290,86 @@ def sample_events(
     return arrival_times.arr
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def sample_events_batched(
+    emin,
+    emax,
+    tstart,
+    tstop,
+    peak_flux,
+    ep_start,
+    ep_tau,
+    alpha,
+    trise,
+    tdecay,
+    effective_area,
+    fmax,
+    z,
+    block_size,
+    rng,
+):
+    """
+    thin the envelope process in blocks of candidate times.
+    each block is drawn from the homogeneous process with rate
+    fmax, the folded rate is evaluated for the whole block at
+    once and the block is accepted or rejected in one step.
+    This is the same process as sample_events.
+
+    :param block_size: the number of candidates per block
+    :param rng: the numpy random Generator
+    :returns:
+    :rtype:
+
+    """
+
+    time = tstart
+
+    arrival_times = VectorFloat64(0)
+
+    while True:
+
+        # the waiting times of the envelope process
+
+        candidates = time - (1.0 / fmax) * np.cumsum(
+            np.log(rng.random(block_size))
+        )
+
+        n_valid = np.searchsorted(candidates, tstop, side="right")
+
+        if n_valid > 0:
+
+            rates = energy_integrated_evolution_grid(
+                emin,
+                emax,
+                candidates[:n_valid],
+                peak_flux,
+                ep_start,
+                ep_tau,
+                alpha,
+                trise,
+                tdecay,
+                effective_area,
+                z,
+            )
+
+            tests = rng.random(n_valid)
+
+            for i in range(n_valid):
+
+                if tests[i] * fmax <= rates[i]:
+                    arrival_times.append(candidates[i])
+
+        # we walked past tstop
+
+        if n_valid < block_size:
+            break
+
+        time = candidates[-1]
+
+    return arrival_times.arr
+
+
+@nb.njit(fastmath=True, cache=True, nogil=True)
 def sample_energy(
     times,
     peak_flux,
@@ -201,6 +382,7 @@ def sample_energy(
     emax,
     effective_area,
     z,
+    rng,
 ):
 
     N = times.shape[0]
@@ -250,14 +432,14 @@ def sample_energy(
         while True:
 
             # sample from a power law
-            u = np.random.uniform(0, 1)
+            u = rng.random()
             x[0] = np.power(
                 (np.power(emax, alpha + 1) - np.power(emin, alpha + 1)) * u
                 + np.power(emin, alpha + 1),
                 1.0 / (alpha + 1.0),
             )
 
-            y = np.random.uniform(0, 1) * C * np.power(x[0] / egrid[idx], alpha)
+            y = rng.random() * C * np.power(x[0] / egrid[idx], alpha)
 
             # here the vtime is just to trick this into being an array
 
@@ -286,7 +468,87 @@ def sample_energy(
     return out
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def sample_energy_cdf(
+    times,
+    peak_flux,
+    ep_start,
+    ep_tau,
+    alpha,
+    trise,
+    tdecay,
+    emin,
+    emax,
+    effective_area,
+    z,
+    resolution,
+    rng,
+):
+    """
+    sample the photon energies by inverting the cumulative
+    distribution of the folded spectrum. The shape of the
+    spectrum only evolves through Ep, so the photons are grouped
+    into slices over which log(Ep) changes by less than resolution
+    and the CDF is built once per slice.
+
+    :param resolution: the width of a slice in log(Ep)
+    :param rng: the numpy random Generator
+    :returns:
+    :rtype:
+
+    """
+
+    N = times.shape[0]
+
+    out = np.zeros(N)
+
+    if N == 0:
+        return out
+
+    egrid = np.power(10.0, np.linspace(np.log10(emin), np.log10(emax), 500))
+
+    M = egrid.shape[0]
+
+    ea = interp(effective_area[0], effective_area[1], egrid)
+
+    log_ep = np.log(ep_start) - np.log(1.0 + times / ep_tau)
+
+    log_ep_max = log_ep.max()
+
+    slices = np.floor((log_ep_max - log_ep) / resolution).astype(np.int64)
+
+    order = np.argsort(slices, kind="mergesort")
+
+    spectrum = np.empty(M)
+
+    i = 0
+
+    while i < N:
+
+        k = slices[order[i]]
+
+        # the spectrum at the center of the slice
+
+        ep = np.exp(log_ep_max - (k + 0.5) * resolution)
+
+        ec = cpl_cutoff(alpha, ep)
+
+        for m in range(M):
+
+            spectrum[m] = ea[m] * cpl_shape(egrid[m] * (1 + z), alpha, ec)
+
+        cdf = build_cdf(egrid, spectrum)
+
+        while (i < N) and (slices[order[i]] == k):
+
+            out[order[i]] = sample_from_cdf(egrid, cdf, rng.random())
+
+            i += 1
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
 def energy_integrated_evolution(
     emin,
     emax,
@@ -301,6 +563,42 @@ def energy_integrated_evolution(
     z,
 ):
 
+    return energy_integrated_evolution_grid(
+        emin,
+        emax,
+        time,
+        peak_flux,
+        ep_start,
+        ep_tau,
+        alpha,
+        trise,
+        tdecay,
+        effective_area,
+        z,
+    )[0]
+
+
+@nb.njit(fastmath=True, cache=True)
+def energy_integrated_evolution_grid(
+    emin,
+    emax,
+    time,
+    peak_flux,
+    ep_start,
+    ep_tau,
+    alpha,
+    trise,
+    tdecay,
+    effective_area,
+    z,
+):
+    """
+    the energy integrated, folded flux for an array of
+    times. The energy grid and the effective area are only
+    built once for all times.
+
+    """
+
     n_energies = 75
 
     energy_grid = np.power(
@@ -322,10 +620,18 @@ def energy_integrated_evolution(
         z,
     )
 
-    return np.trapz(energy_slice[0, :], energy_grid)
+    N = time.shape[0]
+
+    out = np.empty(N)
+
+    for n in range(N):
+
+        out[n] = np.trapz(energy_slice[n, :], energy_grid)
+
+    return out
 
 
-@nb.njit(fastmath=True, cache=False)
+@nb.njit(fastmath=True, cache=True)
 def time_integrated_evolution(
     tmin,
     tmax,
@@ -3,11 +3,15 @@ import numpy as np
 from cosmogrb.sampler.cpl_functions import (
     cpl_evolution,
     energy_integrated_evolution,
+    energy_integrated_evolution_grid,
     sample_energy,
+    sample_energy_cdf,
     sample_events,
+    sample_events_batched,
     time_integrated_evolution,
 )
 from cosmogrb.utils.numba_array import VectorFloat64
+from cosmogrb.utils.rng import get_rng
 
 from .source_function import SourceFunction
 
@@ -95,7 +99,47 @@ class CPLSourceFunction(SourceFunction):
             z=self._z,
         )
 
-    def sample_events(self, tstart, tstop, fmax):
+    def energy_integrated_evolution_grid(self, times):
+
+        ea = self._response.effective_area_packed
+
+        return energy_integrated_evolution_grid(
+            time=np.atleast_1d(times),
+            peak_flux=self._peak_flux,
+            ep_start=self._ep_start,
+            ep_tau=self._ep_tau,
+            alpha=self._alpha,
+            trise=self._trise,
+            tdecay=self._tdecay,
+            emin=self._emin,
+            emax=self._emax,
+            effective_area=ea,
+            z=self._z,
+        )
+
+    def sample_events(self, tstart, tstop, fmax, block_size=0, rng=None):
+
+        rng = get_rng(rng)
+
+        if block_size > 0:
+
+            return sample_events_batched(
+                tstart=tstart,
+                tstop=tstop,
+                peak_flux=self._peak_flux,
+                ep_start=self._ep_start,
+                ep_tau=self._ep_tau,
+                alpha=self._alpha,
+                trise=self._trise,
+                tdecay=self._tdecay,
+                emin=self._emin,
+                emax=self._emax,
+                effective_area=self._response.effective_area_packed,
+                fmax=fmax,
+                z=self._z,
+                block_size=block_size,
+                rng=rng,
+            )
 
         return sample_events(
             tstart=tstart,
@@ -111,12 +155,33 @@ class CPLSourceFunction(SourceFunction):
             effective_area=self._response.effective_area_packed,
             fmax=fmax,
             z=self._z,
+            rng=rng,
         )
 
-    def sample_energy(self, times):
+    def sample_energy(self, times, cdf_resolution=0.0, rng=None):
+
+        rng = get_rng(rng)
 
         ea = self._response.effective_area_packed
 
+        if cdf_resolution > 0:
+
+            return sample_energy_cdf(
+                times=times,
+                peak_flux=self._peak_flux,
+                ep_start=self._ep_start,
+                ep_tau=self._ep_tau,
+                alpha=self._alpha,
+                trise=self._trise,
+                tdecay=self._tdecay,
+                emin=self._emin,
+                emax=self._emax,
+                effective_area=ea,
+                z=self._z,
+                resolution=cdf_resolution,
+                rng=rng,
+            )
+
         return sample_energy(
             times=times,
             peak_flux=self._peak_flux,
@@ -129,4 +194,5 @@ class CPLSourceFunction(SourceFunction):
             emax=self._emax,
             effective_area=ea,
             z=self._z,
+            rng=rng,
         )
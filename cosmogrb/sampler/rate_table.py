@@ -0,0 +1,210 @@
+import numba as nb
+import numpy as np
+
+from cosmogrb.utils.logging import setup_logger
+from cosmogrb.utils.numba_array import VectorFloat64
+from cosmogrb.utils.rng import get_rng
+
+logger = setup_logger(__name__)
+
+
+@nb.njit(fastmath=True, cache=True)
+def _interpolate_uniform(t, tstart, dt, rates):
+
+    # the grid is uniform so the bin is found by index arithmetic
+
+    x = (t - tstart) / dt
+
+    idx = int(x)
+
+    if idx < 0:
+        return rates[0]
+
+    if idx >= rates.shape[0] - 1:
+        return rates[-1]
+
+    w = x - idx
+
+    return (1.0 - w) * rates[idx] + w * rates[idx + 1]
+
+
+@nb.njit(fastmath=True, cache=True, nogil=True)
+def table_poisson_generator(tstart, tstop, dt, rates, fmax, block_size, rng):
+    """
+    Non-homogeneous poisson process generator where the
+    rate is linearly interpolated from a uniform grid of
+    rates starting at tstart with spacing dt.
+
+    :param tstart:
+    :param tstop:
+    :param dt:
+    :param rates:
+    :param fmax:
+    :param block_size:
+    :param rng:
+    :returns:
+    :rtype:
+
+    """
+
+    time = tstart
+
+    arrival_times = VectorFloat64(0)
+
+    while True:
+
+        candidates = time - (1.0 / fmax) * np.cumsum(
+            np.log(rng.random(block_size))
+        )
+
+        n_valid = np.searchsorted(candidates, tstop, side="right")
+
+        tests = rng.random(n_valid)
+
+        for i in range(n_valid):
+
+            rate = _interpolate_uniform(candidates[i], tstart, dt, rates)
+
+            if tests[i] * fmax <= rate:
+                arrival_times.append(candidates[i])
+
+        if n_valid < block_size:
+            break
+
+        time = candidates[-1]
+
+    return arrival_times.arr
+
+
+class RateTable(object):
+    def __init__(
+        self,
+        tstart,
+        tstop,
+        rate_function,
+        rtol=1e-3,
+        n_initial=65,
+        max_points=65537,
+    ):
+        """
+        A dense, uniform time grid of an energy integrated rate
+        that is linearly interpolated. The grid is refined by
+        halving the spacing until the interpolation error at
+        the mid points is below rtol times the maximum rate
+        or max_points is reached.
+
+        :param tstart:
+        :param tstop:
+        :param rate_function: function of an array of times returning the rates
+        :param rtol: the allowed interpolation error relative to the max rate
+        :param n_initial: the number of points of the first grid
+        :param max_points: the maximum number of grid points
+        :returns:
+        :rtype:
+
+        """
+
+        assert tstop > tstart, "tstop must be after tstart"
+        assert rtol > 0, "rtol must be positive"
+
+        self._tstart = tstart
+        self._tstop = tstop
+        self._rtol = rtol
+
+        self._build(rate_function, n_initial, max_points)
+
+    def _build(self, rate_function, n_initial, max_points):
+
+        times = np.linspace(self._tstart, self._tstop, n_initial)
+        rates = rate_function(times)
+
+        while True:
+
+            mid_times = 0.5 * (times[:-1] + times[1:])
+            mid_rates = rate_function(mid_times)
+
+            error = np.max(np.abs(mid_rates - 0.5 * (rates[:-1] + rates[1:])))
+
+            max_rate = max(rates.max(), mid_rates.max())
+
+            # the mid points have been computed, so use them
+
+            new_times = np.empty(2 * len(times) - 1)
+            new_times[::2] = times
+            new_times[1::2] = mid_times
+
+            new_rates = np.empty(2 * len(rates) - 1)
+            new_rates[::2] = rates
+            new_rates[1::2] = mid_rates
+
+            times = new_times
+            rates = new_rates
+
+            if error <= self._rtol * max_rate:
+
+                break
+
+            if 2 * len(times) - 1 > max_points:
+
+                logger.warning(
+                    f"rate table reached {len(times)} points with a relative error of {error / max_rate}"
+                )
+
+                break
+
+        logger.debug(f"built a rate table with {len(times)} points")
+
+        self._times = times
+        self._rates = rates
+        self._dt = times[1] - times[0]
+        self._max_rate = rates.max()
+
+    @property
+    def times(self):
+        return self._times
+
+    @property
+    def rates(self):
+        return self._rates
+
+    @property
+    def max_rate(self):
+        return self._max_rate
+
+    @property
+    def rtol(self):
+        return self._rtol
+
+    def evaluate(self, times):
+        """
+        interpolate the rate at the given times
+
+        :param times:
+        :returns:
+        :rtype:
+
+        """
+
+        return np.interp(times, self._times, self._rates)
+
+    def sample_events(self, block_size=1024, rng=None):
+        """
+        sample arrival times by thinning against the
+        interpolated rate
+
+        :param block_size:
+        :param rng: the random Generator or a seed
+        :returns:
+        :rtype:
+
+        """
+
+        return table_poisson_generator(
+            self._tstart,
+            self._tstop,
+            self._dt,
+            self._rates,
+            self._max_rate,
+            block_size,
+            get_rng(rng),
+        )
@@ -1,11 +1,15 @@
+from cosmogrb.utils.rng import get_rng
+
+
 class Sampler(object):
-    def __init__(self, tstart, tstop):
+    def __init__(self, tstart, tstop, rng=None):
         """
         Superclass of the background and source
         samplers
 
         :param tstart:
         :param tstop:
+        :param rng: the random Generator or a seed of the sampler
         :returns:
         :rtype:
 
@@ -14,6 +18,20 @@ class Sampler(object):
         self._tstart = tstart
         self._tstop = tstop
 
+        self._rng = get_rng(rng)
+
+    def set_rng(self, rng):
+        """
+        set the random Generator or a seed of the sampler
+
+        :param rng:
+        :returns:
+        :rtype:
+
+        """
+
+        self._rng = get_rng(rng)
+
     def sample_times(self):
 
         raise NotImplementedError()
@@ -30,6 +48,10 @@ class Sampler(object):
     def tstop(self):
         return self._tstop
 
+    @property
+    def rng(self):
+        return self._rng
+
     @property
     def times(self):
         return self._times
@@ -3,8 +3,10 @@ import functools
 import numpy as np
 import scipy.integrate as integrate
 
+from cosmogrb import cosmogrb_config
 from cosmogrb.utils.logging import setup_logger
 
+from .rate_table import RateTable
 from .sampler import Sampler
 
 logger = setup_logger(__name__)
@@ -14,7 +16,13 @@ logger = setup_logger(__name__)
 
 class Source(Sampler):
     def __init__(
-        self, tstart, tstop, source_function, z, use_plaw_sample=False
+        self,
+        tstart,
+        tstop,
+        source_function,
+        z,
+        use_plaw_sample=False,
+        rng=None,
     ):
 
         self._source_function = source_function
@@ -29,9 +37,11 @@ class Source(Sampler):
 
         self._z = z
 
+        self._rate_table = None
+
         # pass on tstart and tstop
 
-        super(Source, self).__init__(tstart=tstart, tstop=tstop)
+        super(Source, self).__init__(tstart=tstart, tstop=tstop, rng=rng)
 
         self._source_function.set_source(self)
 
@@ -97,18 +107,38 @@ class Source(Sampler):
 
         """
 
+        rtol = cosmogrb_config.sampling.rate_table_rtol
+
+        if rtol > 0:
+
+            # build a dense table of the folded rate that is
+            # used for both the envelope and the acceptance test
+
+            self._rate_table = RateTable(
+                self._tstart,
+                self._tstop,
+                self._source_function.energy_integrated_evolution_grid,
+                rtol=rtol,
+                max_points=cosmogrb_config.sampling.rate_table_max_points,
+            )
+
+            return self._rate_table.max_rate
+
         # need to find the energy integrated peak flux
         num_grid_points = 50
 
         time_grid = np.linspace(self._tstart, self._tstop, num_grid_points)
 
-        fluxes = [
-            self._source_function.energy_integrated_evolution(t)
-            for t in time_grid
-        ]
+        fluxes = self._source_function.energy_integrated_evolution_grid(
+            time_grid
+        )
 
         return np.max(fluxes)
 
+    @property
+    def rate_table(self):
+        return self._rate_table
+
     # def _propagate_photons(self, photons):
     #     """
     #     scale photon energy due to cosmological redshift
@@ -126,22 +156,34 @@ class Source(Sampler):
 
         """
 
-        np.random.seed()
+        block_size = cosmogrb_config.sampling.thinning_block_size
+
+        if self._rate_table is not None:
+
+            return self._rate_table.sample_events(
+                block_size=max(block_size, 1), rng=self._rng
+            )
 
         return self._source_function.sample_events(
-            self._tstart, self._tstop, self._fmax
+            self._tstart,
+            self._tstop,
+            self._fmax,
+            block_size=block_size,
+            rng=self._rng,
         )
 
     def sample_photons(self, times):
 
-        np.random.seed()
-
-        photons = self._source_function.sample_energy(times)
+        photons = self._source_function.sample_energy(
+            times,
+            cdf_resolution=cosmogrb_config.sampling.energy_cdf_resolution,
+            rng=self._rng,
+        )
 
         return photons
 
     def sample_channel(self, photons, response):
 
-        channel = response.digitize(photons)
+        channel = response.digitize(photons, rng=self._rng)
 
         return channel
@@ -1,6 +1,6 @@
 import abc
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from cosmogrb.utils.array_to_cmap import array_to_cmap
 
@@ -69,6 +69,20 @@ class SourceFunction(object, metaclass=abc.ABCMeta):
 
         # return integrate.simps(self.evolution(ene_grid, time)[0, :], ene_grid)
 
+    def energy_integrated_evolution_grid(self, times):
+        """
+        return the integral over energy for an array
+        of times. Subclasses should override this with
+        a vectorized version
+
+        :param times: the times of the pulse
+        :returns:
+        :rtype:
+
+        """
+
+        return np.array([self.energy_integrated_evolution(t) for t in times])
+
     @abc.abstractclassmethod
     def time_integrated_spectrum(self, energy, t1, t2):
         """
@@ -88,12 +102,36 @@ class SourceFunction(object, metaclass=abc.ABCMeta):
         # return integrate.simps(self.evolution(energy, time_grid)[:, 0], time_grid)
 
     @abc.abstractmethod
-    def sample_events(self, tstart, tstop, fmax):
+    def sample_events(self, tstart, tstop, fmax, block_size=0, rng=None):
+        """
+        sample the arrival times by thinning a homogeneous
+        process of rate fmax
+
+        :param tstart:
+        :param tstop:
+        :param fmax:
+        :param block_size: thin candidates in blocks of this size. 0 draws one at a time
+        :param rng: the random Generator or a seed
+        :returns:
+        :rtype:
+
+        """
 
         pass
 
     @abc.abstractmethod
-    def sample_energy(self, times):
+    def sample_energy(self, times, cdf_resolution=0.0, rng=None):
+        """
+        sample the photon energies at the given times
+
+        :param times: the arrival times of the photons
+        :param cdf_resolution: if positive, invert the CDF of the folded spectrum,
+        rebuilding it whenever log(Ep) changes by this much. Otherwise use rejection sampling
+        :param rng: the random Generator or a seed
+        :returns:
+        :rtype:
+
+        """
 
         pass
 
@@ -110,6 +148,8 @@ class SourceFunction(object, metaclass=abc.ABCMeta):
 
         if ax is None:
 
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots()
 
         else:
@@ -140,6 +180,8 @@ class SourceFunction(object, metaclass=abc.ABCMeta):
 
         if ax is None:
 
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots()
 
         else:
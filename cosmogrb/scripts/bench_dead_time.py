@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+
+from cosmogrb.instruments.gbm.gbm_lightcurve import _gbm_dead_time
+
+# this is a script that benchmarks the GBM dead time filter
+# on a homogeneous stream of events. it is meant to be run
+# from the top of the package
+
+
+def _make_events(n_events, rate, rng):
+
+    times = np.sort(rng.uniform(0, n_events / rate, size=n_events))
+    pha = rng.integers(0, 128, size=n_events)
+    is_source = np.zeros(n_events, dtype=bool)
+
+    return times, pha, is_source
+
+
+def bench_dead_time(n_events=1000000, rate=1e5, n_repeats=5, seed=1234):
+
+    rng = np.random.default_rng(seed)
+
+    # the first call compiles
+
+    _gbm_dead_time(*_make_events(1000, rate, rng))
+
+    timings = []
+
+    for _ in range(n_repeats):
+
+        times, pha, is_source = _make_events(n_events, rate, rng)
+
+        t0 = time.perf_counter()
+
+        n_selected = _gbm_dead_time(times, pha, is_source)
+
+        timings.append(time.perf_counter() - t0)
+
+    # the events are filtered in place, so no output arrays
+    # are allocated and the only memory is the input
+
+    input_bytes = times.nbytes + pha.nbytes + is_source.nbytes
+
+    return dict(
+        time_per_million=np.mean(timings) * 1e6 / n_events,
+        input_mb_per_million=input_bytes * 1e6 / n_events / 1024 ** 2,
+        dead_fraction=1 - n_selected / n_events,
+    )
+
+
+def main():
+
+    for rate in (1e3, 1e5, 1e6):
+
+        results = bench_dead_time(rate=rate)
+
+        print(
+            f"rate {rate:8.0e} cts/s: {results['time_per_million'] * 1e3:6.2f} ms per 1e6 events, "
+            f"{results['input_mb_per_million']:5.1f} MB in place, "
+            f"{results['dead_fraction'] * 100:5.2f}% dead"
+        )
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,130 @@
+import re
+import subprocess
+import sys
+
+import numpy as np
+
+# this is a script that tracks how long it takes to import
+# cosmogrb in a fresh interpreter. Each statement is timed
+# in its own process so nothing is already imported, and the
+# slowest top level imports are listed from -X importtime
+
+_statements = ("import cosmogrb", "import cosmogrb.io")
+
+_heavy_modules = (
+    "matplotlib",
+    "IPython",
+    "bokeh",
+    "popsynth",
+    "cosmogrb.instruments.gbm",
+)
+
+
+def _run(statement, *flags):
+
+    return subprocess.run(
+        [sys.executable, *flags, "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def time_import(statement, n_repeats=5):
+    """
+    the wall time of running the statement in a new interpreter
+
+    :param statement:
+    :param n_repeats:
+    :returns: the median in seconds
+    :rtype:
+
+    """
+
+    timer = (
+        "import time; t0 = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - t0)"
+    )
+
+    timings = [float(_run(timer).stdout) for _ in range(n_repeats)]
+
+    return np.median(timings)
+
+
+def loaded_heavy_modules(statement):
+    """
+    which of the heavy modules the statement imports
+
+    :param statement:
+    :returns:
+    :rtype:
+
+    """
+
+    check = (
+        f"import sys; {statement}; "
+        f"print(' '.join(m for m in {_heavy_modules!r} if m in sys.modules))"
+    )
+
+    return _run(check).stdout.split()
+
+
+def slowest_imports(statement, n_slowest=5):
+    """
+    the top level imports of the statement that take the longest
+
+    :param statement:
+    :param n_slowest:
+    :returns: a list of (cumulative time in s, module)
+    :rtype:
+
+    """
+
+    timings = []
+
+    for line in _run(statement, "-X", "importtime").stderr.splitlines():
+
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$", line)
+
+        if match is None:
+
+            continue
+
+        cumulative, indent, module = match.groups()
+
+        # everything up to site is the start of the interpreter
+
+        if module == "site" and not indent:
+
+            timings = []
+
+        # the statement itself and what it imports directly
+
+        elif len(indent) <= 2:
+
+            timings.append((int(cumulative) * 1e-6, module))
+
+    return sorted(timings, reverse=True)[:n_slowest]
+
+
+def main():
+
+    for statement in _statements:
+
+        elapsed = time_import(statement)
+
+        heavy = loaded_heavy_modules(statement) or ["none"]
+
+        print(f"{statement:>20}: {1e3 * elapsed:8.1f} ms")
+        print(f"{'heavy modules':>20}: {', '.join(heavy)}")
+
+        for cumulative, module in slowest_imports(statement):
+
+            print(f"{module:>20}: {1e3 * cumulative:8.1f} ms")
+
+        print()
+
+
+if __name__ == "__main__":
+
+    main()
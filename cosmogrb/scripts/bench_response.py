@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+
+from cosmogrb.instruments.gbm.gbm_orbit import get_gbm_orbit
+from cosmogrb.instruments.gbm.response_generator import (
+    get_gbm_response_generator,
+)
+from cosmogrb.utils.executor import executor_map, thread_pool
+
+# this is a script that compares the time it takes to set up
+# the 14 responses of a burst with the old stateful generators
+# (set_time and set_location) to the pure generate_response,
+# one detector after the other and in threads
+
+
+def _bursts(n_bursts, seed=1234):
+
+    rng = np.random.default_rng(seed)
+
+    return list(
+        zip(
+            rng.uniform(0, 360, n_bursts),
+            np.rad2deg(np.arcsin(rng.uniform(-1, 1, n_bursts))),
+            rng.uniform(0, get_gbm_orbit().maximum_time, n_bursts),
+        )
+    )
+
+
+def stateful(ra, dec, t):
+
+    gbm_response_generator = get_gbm_response_generator()
+
+    for det in gbm_response_generator.detectors:
+
+        gbm_response_generator.set_time(t, det)
+        gbm_response_generator.set_location(ra, dec, det)
+
+
+def pure(ra, dec, t, executor=None):
+
+    gbm_response_generator = get_gbm_response_generator()
+
+    executor_map(
+        lambda det: gbm_response_generator.generate_response(ra, dec, t, det),
+        list(gbm_response_generator.detectors),
+        executor,
+    )
+
+
+def bench(func, bursts, **kwargs):
+
+    t0 = time.perf_counter()
+
+    for ra, dec, t in bursts:
+
+        func(ra, dec, t, **kwargs)
+
+    return (time.perf_counter() - t0) / len(bursts)
+
+
+def main(n_bursts=10, n_threads=(2, 4, 8)):
+
+    bursts = _bursts(n_bursts)
+
+    # compile the kernels
+
+    stateful(*bursts[0])
+    pure(*bursts[0])
+
+    print(f"{'stateful':>16}: {1e3 * bench(stateful, bursts):8.1f} ms/burst")
+    print(f"{'pure':>16}: {1e3 * bench(pure, bursts):8.1f} ms/burst")
+
+    for n in n_threads:
+
+        with thread_pool(n) as executor:
+
+            elapsed = bench(pure, bursts, executor=executor)
+
+        label = f"pure, {n} threads"
+
+        print(f"{label:>16}: {1e3 * elapsed:8.1f} ms/burst")
+
+
+if __name__ == "__main__":
+
+    main()
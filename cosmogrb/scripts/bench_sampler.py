@@ -0,0 +1,153 @@
+import time
+
+import numpy as np
+
+from cosmogrb import cosmogrb_config
+from cosmogrb.instruments.gbm import GBMGRB_CPL, GBMGRB_CPL_Constant
+
+# this is a script that benchmarks the photon samplers on the
+# GRBs used in the pytest (see cosmogrb/test/conftest.py).
+# it is meant to be run from the top of the package
+
+cosmogrb_config["gbm"]["orbit"]["use_random_time"] = False
+
+_test_grbs = dict(
+    grb=(
+        GBMGRB_CPL,
+        dict(
+            ra=312.0,
+            dec=-62.0,
+            z=1.0,
+            peak_flux=1e-5,
+            alpha=-0.66,
+            ep_start=500.0,
+            ep_tau=2.0,
+            trise=0.1,
+            tdecay=1.0,
+            duration=2.0,
+            T0=0.1,
+        ),
+    ),
+    weak_grb=(
+        GBMGRB_CPL,
+        dict(
+            ra=312.0,
+            dec=-62.0,
+            z=1.0,
+            peak_flux=5e-20,
+            alpha=-0.66,
+            ep_start=500.0,
+            ep_tau=2.0,
+            trise=0.1,
+            tdecay=0.5,
+            duration=1.0,
+            T0=0.1,
+        ),
+    ),
+    grb_constant=(
+        GBMGRB_CPL_Constant,
+        dict(
+            ra=312.0,
+            dec=-62.0,
+            z=1.0,
+            peak_flux=5e-9,
+            alpha=-0.66,
+            ep=500.0,
+            duration=1.0,
+            T0=0.1,
+        ),
+    ),
+)
+
+
+def _time_it(func, n_repeats):
+
+    # the first call compiles
+
+    func()
+
+    n_events = []
+
+    t0 = time.perf_counter()
+
+    for _ in range(n_repeats):
+
+        n_events.append(len(func()))
+
+    return (time.perf_counter() - t0) / n_repeats, np.mean(n_events)
+
+
+def bench_thinning(source, n_repeats=5, block_size=1024):
+
+    sf = source._source_function
+
+    single = _time_it(
+        lambda: sf.sample_events(source.tstart, source.tstop, source._fmax),
+        n_repeats,
+    )
+
+    batched = _time_it(
+        lambda: sf.sample_events(
+            source.tstart, source.tstop, source._fmax, block_size=block_size
+        ),
+        n_repeats,
+    )
+
+    results = dict(single=single, batched=batched)
+
+    if source.rate_table is not None:
+
+        results["table"] = _time_it(
+            lambda: source.rate_table.sample_events(block_size=block_size),
+            n_repeats,
+        )
+
+    return results
+
+
+def bench_energy(source, times, n_repeats=5, cdf_resolution=0.01):
+
+    sf = source._source_function
+
+    rejection = _time_it(lambda: sf.sample_energy(times), n_repeats)
+
+    cdf = _time_it(
+        lambda: sf.sample_energy(times, cdf_resolution=cdf_resolution),
+        n_repeats,
+    )
+
+    return dict(rejection=rejection, cdf=cdf)
+
+
+def main(n_repeats=5):
+
+    for grb_name, (grb_type, params) in _test_grbs.items():
+
+        grb = grb_type(**params)
+
+        for det, lc in grb._lightcurves.items():
+
+            results = bench_thinning(lc._source, n_repeats=n_repeats)
+
+            line = " ".join(
+                f"{k}: {t * 1e3:8.2f} ms ({n:9.1f} evts)"
+                for k, (t, n) in results.items()
+            )
+
+            print(f"{grb_name:12s} {det}: {line}")
+
+            times = lc._source.sample_times()
+
+            results = bench_energy(lc._source, times, n_repeats=n_repeats)
+
+            line = " ".join(
+                f"{k}: {t * 1e3:8.2f} ms ({n:9.1f} photons)"
+                for k, (t, n) in results.items()
+            )
+
+            print(f"{grb_name:12s} {det}: {line}")
+
+
+if __name__ == "__main__":
+
+    main()
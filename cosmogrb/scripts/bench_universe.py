@@ -0,0 +1,70 @@
+import os
+import time
+from glob import glob
+
+from dask.distributed import Client, LocalCluster
+
+from cosmogrb import cosmogrb_config
+from cosmogrb.instruments.gbm.gbm_universe import GBM_CPL_Universe
+from cosmogrb.utils.package_utils import get_path_of_data_file
+
+# this is a script that compares the throughput of Universe.go
+# when every GRB is its own task to packing the GRBs into
+# batches. it is meant to be run from the top of the package
+
+
+def bench_universe(client, batch_size, population_file, seed=1234):
+
+    cosmogrb_config.multiprocess.grb_batch_size = batch_size
+
+    universe = GBM_CPL_Universe(
+        population_file, save_path="_bench_universe", seed=seed
+    )
+
+    t0 = time.perf_counter()
+
+    universe.go(client)
+
+    elapsed = time.perf_counter() - t0
+
+    for f in glob("_bench_universe/*.h5"):
+        os.remove(f)
+
+    return dict(elapsed=elapsed, grbs_per_second=universe._n_grbs / elapsed)
+
+
+def main(n_workers=4, population_file=None):
+
+    if population_file is None:
+
+        population_file = get_path_of_data_file("test_grb_pop.h5")
+
+    os.makedirs("_bench_universe", exist_ok=True)
+
+    cluster = LocalCluster(n_workers=n_workers, threads_per_worker=1)
+    client = Client(cluster)
+
+    # the first run compiles the kernels on the workers
+
+    bench_universe(client, 0, population_file)
+
+    for batch_size in (0, 2, 4, 8):
+
+        results = bench_universe(client, batch_size, population_file)
+
+        label = "per GRB" if batch_size == 0 else f"batches of ~{batch_size}"
+
+        print(
+            f"{label:>16}: {results['elapsed']:7.2f} s, "
+            f"{results['grbs_per_second']:6.2f} GRBs/s"
+        )
+
+    client.close()
+    cluster.close()
+
+    os.rmdir("_bench_universe")
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import time
+
+from cosmogrb.instruments.gbm.response_atlas import (
+    build_response_atlas,
+    default_atlas_file,
+)
+
+# this is a script that builds the atlas of GBM responses
+# used when gbm.response_atlas.on is set. The default 5 deg
+# grid of all 14 detectors takes about 2.7 GB (0.7 GB at 10 deg)
+# and has to be built only once
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="precompute the GBM responses on a grid of "
+        "spacecraft frame positions"
+    )
+
+    parser.add_argument("--file_name", default=default_atlas_file())
+    parser.add_argument("--resolution", type=float, default=5.0)
+    parser.add_argument("--reference_time", type=float, default=None)
+    parser.add_argument("--detectors", nargs="+", default=None)
+
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+
+    build_response_atlas(
+        args.file_name,
+        resolution=args.resolution,
+        reference_time=args.reference_time,
+        detectors=args.detectors,
+    )
+
+    print(f"wrote {args.file_name} in {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+
+    main()
@@ -1,4 +1,6 @@
 import os
+import subprocess
+import sys
 from glob import glob
 
 import numpy as np
@@ -63,6 +65,36 @@ def test_read_gbm_save(grb):
         os.remove(f)
 
 
+def test_read_gbm_save_lazy(grb):
+
+    path = "test_grb.h5"
+
+    grb = GRBSave.from_file(path)
+    lazy_grb = GRBSave.from_file(path, lazy=True)
+
+    assert grb.name == lazy_grb.name
+
+    for k, v in grb.items():
+
+        lc = v["lightcurve"]
+        lazy_lc = lazy_grb[k]["lightcurve"]
+
+        assert lazy_lc.n_counts == lc.n_counts
+        assert lazy_lc.n_counts_source == lc.n_counts_source
+        assert lazy_lc.n_counts_background == lc.n_counts_background
+
+        assert np.array_equal(lazy_lc.channels, lc.channels)
+        assert np.array_equal(lazy_lc.ebounds, lc.ebounds)
+        assert lazy_lc.extra_info.keys() == lc.extra_info.keys()
+
+        assert np.array_equal(lazy_lc.times, lc.times)
+        assert np.array_equal(lazy_lc.pha, lc.pha)
+        assert np.array_equal(lazy_lc.times_source, lc.times_source)
+        assert np.array_equal(lazy_lc.pha_background, lc.pha_background)
+
+        assert np.allclose(lazy_grb[k]["response"].matrix, v["response"].matrix)
+
+
 def test_constant_grb(grb_constant):
 
     file_name = "_cpl_const.h5"
@@ -70,3 +102,104 @@ def test_constant_grb(grb_constant):
     grb_constant.save(file_name)
 
     os.remove(file_name)
+
+
+def test_import_is_lazy():
+
+    # the GBM machinery and the plotting stack are
+    # only imported when they are used
+
+    heavy_modules = (
+        "matplotlib",
+        "IPython",
+        "popsynth",
+        "cosmogrb.instruments.gbm",
+        "cosmogrb.io.grb_save",
+    )
+
+    check = (
+        "import sys; import cosmogrb; "
+        "assert 'gbm' in dir(cosmogrb); "
+        f"print(' '.join(m for m in {heavy_modules!r} if m in sys.modules))"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", check],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert output.stdout.split() == []
+
+
+def test_jit_cache_dir(tmp_path):
+
+    env = {k: v for k, v in os.environ.items() if k != "NUMBA_CACHE_DIR"}
+    env["HOME"] = str(tmp_path)
+
+    check = (
+        "import os; import cosmogrb; print(cosmogrb.__version__); "
+        "print(os.environ.get('NUMBA_CACHE_DIR', 'unset'))"
+    )
+
+    def run():
+
+        return subprocess.run(
+            [sys.executable, "-c", check],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.split()
+
+    # the numba cache of the process is left alone by default
+
+    version, cache_dir = run()
+
+    assert cache_dir == "unset"
+
+    # if switched on, the kernels are cached per version below
+    # the home directory
+
+    config_path = tmp_path / ".config" / "cosomogrb"
+    config_path.mkdir(parents=True, exist_ok=True)
+
+    # yaml reads an unquoted on as true
+
+    (config_path / "cosmogrb_config.yml").write_text(
+        "jit_cache:\n  'on': true\n"
+    )
+
+    version, cache_dir = run()
+
+    assert cache_dir == os.path.join(
+        str(tmp_path), ".cosmogrb", "numba_cache", version
+    )
+
+
+def test_warmup(tmp_path):
+
+    env = dict(os.environ)
+    env["NUMBA_CACHE_DIR"] = str(tmp_path)
+
+    subprocess.run(
+        [sys.executable, "-c", "import cosmogrb; cosmogrb.warmup(gbm=False)"],
+        check=True,
+        env=env,
+    )
+
+    cached = {p.name.split("-")[0] for p in tmp_path.rglob("*.nbi")}
+
+    for kernel in (
+        "cpl_functions.folded_cpl_evolution",
+        "cpl_constant_functions.folded_cpl_evolution",
+        "rate_table.table_poisson_generator",
+        "response._digitize_grouped",
+        "background.background_event_generator",
+        "lightcurve.merge_events",
+        "gbm_lightcurve._gbm_dead_time",
+        "gbm_lightcurve_analyzer._run_trigger",
+    ):
+
+        assert kernel in cached
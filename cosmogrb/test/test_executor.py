@@ -0,0 +1,119 @@
+import concurrent.futures
+import sys
+
+import pytest
+
+from cosmogrb.utils.executor import (
+    executor_map,
+    is_dask_client,
+    process_pool,
+    thread_pool,
+)
+
+
+def _square(x):
+
+    return x * x
+
+
+class _CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    def __init__(self):
+
+        super(_CountingExecutor, self).__init__(max_workers=2)
+
+        self.pending = []
+        self.max_pending = 0
+
+    def submit(self, fn, *args, **kwargs):
+
+        future = super(_CountingExecutor, self).submit(fn, *args, **kwargs)
+
+        # a chunk counts as pending until its result was taken
+
+        future._collected = False
+
+        self.pending = [f for f in self.pending if not f._collected] + [
+            future
+        ]
+
+        self.max_pending = max(self.max_pending, len(self.pending))
+
+        result = future.result
+
+        def collect(*args, **kwargs):
+
+            future._collected = True
+
+            return result(*args, **kwargs)
+
+        future.result = collect
+
+        return future
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_executor_map(chunk_size):
+
+    items = list(range(50))
+
+    expected = [_square(x) for x in items]
+
+    assert executor_map(_square, items) == expected
+
+    with thread_pool(4) as executor:
+
+        assert not is_dask_client(executor)
+
+        assert (
+            executor_map(_square, items, executor, chunk_size=chunk_size)
+            == expected
+        )
+
+    with process_pool(2, warmup=False) as executor:
+
+        assert (
+            executor_map(_square, items, executor, chunk_size=chunk_size)
+            == expected
+        )
+
+
+def _gbm_response_built():
+
+    module = sys.modules.get("cosmogrb.instruments.gbm.response_generator")
+
+    return (module is not None) and (module._gbm_response_generator is not None)
+
+
+def test_process_pool_warmup():
+
+    # the workers only compile the kernels
+
+    with process_pool(1) as executor:
+
+        assert not executor.submit(_gbm_response_built).result()
+
+
+def test_executor_map_in_flight():
+
+    items = list(range(40))
+
+    with _CountingExecutor() as executor:
+
+        out = executor_map(
+            _square, items, executor, chunk_size=2, max_in_flight=3
+        )
+
+    assert out == [_square(x) for x in items]
+
+    assert executor.max_pending <= 3
+
+
+def test_executor_map_dask(client):
+
+    assert is_dask_client(client)
+
+    items = list(range(20))
+
+    assert executor_map(_square, items, client, chunk_size=3) == [
+        _square(x) for x in items
+    ]
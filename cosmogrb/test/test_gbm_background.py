@@ -24,3 +24,16 @@ def test_gbm_background_constructor():
 
         bkg = GBMBackground(-10, 10, average_rate=100.0, detector=det)
         bkg.sample_times()
+
+        times, channels = bkg.sample_events()
+
+        assert len(times) == len(channels)
+
+        # the templates are shared between backgrounds
+
+        other = GBMBackground(-10, 10, average_rate=100.0, detector=det)
+
+        assert (
+            other._background_spectrum_template
+            is bkg._background_spectrum_template
+        )
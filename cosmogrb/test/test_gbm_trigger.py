@@ -1,8 +1,16 @@
 import os
 from glob import glob
 
+import numpy as np
 from natsort import natsorted
 
+from cosmogrb.instruments.gbm.gbm_lightcurve_analyzer import (
+    _first_detections,
+    _first_detections_parallel,
+    _run_trigger,
+    _significance_cube,
+    _significance_cube_parallel,
+)
 from cosmogrb.instruments.gbm.gbm_trigger import GBMTrigger
 from cosmogrb.instruments.gbm.process_gbm_universe import process_gbm_universe
 from cosmogrb.universe.survey import Survey
@@ -52,6 +60,36 @@ def test_gbm_trigger_process(gbm_trigger):
     assert gbm_trigger.triggered_detectors[1] == "n0"
 
 
+def test_gbm_trigger_batched(grb):
+
+    gbm_trigger = GBMTrigger("test_grb.h5")
+
+    gbm_trigger.process()
+
+    for parallel in [False, True]:
+
+        batched_trigger = GBMTrigger(
+            "test_grb.h5", batched=True, parallel=parallel
+        )
+
+        batched_trigger.process()
+
+        assert batched_trigger.is_detected == gbm_trigger.is_detected
+
+        assert (
+            batched_trigger.triggered_detectors
+            == gbm_trigger.triggered_detectors
+        )
+
+        assert np.allclose(
+            batched_trigger.triggered_times, gbm_trigger.triggered_times
+        )
+        assert np.allclose(
+            batched_trigger.triggered_time_scales,
+            gbm_trigger.triggered_time_scales,
+        )
+
+
 def test_weak_gbm_trigger(weak_gbm_trigger):
 
     # make sure we do not trigger on weak
@@ -101,6 +139,40 @@ def test_process_survey(universe):
     # make  sure the loaded one is now processed
     assert survey2.is_processed
 
+    # the detections are the same as in the processed survey
+
+    assert np.array_equal(survey2.mask_detected_grbs, survey.mask_detected_grbs)
+    assert survey2.n_detected == survey.n_detected
+
+    detected = survey2.mask_detected_grbs
+
+    assert np.all(np.isnan(survey2.trigger_times[~detected]))
+    assert np.all(np.isfinite(survey2.trigger_times[detected]))
+
+    for detected, dets in zip(
+        survey2.mask_detected_grbs, survey2.triggered_detectors
+    ):
+
+        if detected:
+
+            assert len(dets) >= 2
+
+    # the catalog was stored with the survey
+
+    assert survey2.catalog.equals(survey.catalog)
+
+    detected_grbs = survey2.query("detected")
+
+    assert len(detected_grbs) == survey2.n_detected
+
+    selection = survey2.select("detected and z < 2")
+
+    for name, observation in selection.items():
+
+        assert survey2.catalog.loc[name, "z"] < 2
+
+        assert observation.grb.name == name
+
     files = glob("SynthGRB*store.h5")
 
     info_files = glob("SynthGRB*store_detection_info.h5")
@@ -117,3 +189,140 @@ def test_process_survey(universe):
         os.remove(y)
 
     os.remove("new_universe.h5")
+
+
+def test_run_trigger():
+
+    rng = np.random.default_rng(1234)
+
+    n_bins = 3000
+    n_bins_background = 500
+    n_bins_pre = 50
+    n_bins_sources = np.array([64, 16, 4, 1])
+    threshold = 4.5
+
+    starts = -10 + 0.016 * np.arange(n_bins)
+    exposure = np.full(n_bins, 0.016)
+
+    counts = rng.poisson(10.0, size=n_bins)
+
+    # add a pulse
+    counts[1500:1520] += 20
+
+    detected, times = _run_trigger(
+        n_bins_background,
+        n_bins_pre,
+        n_bins_sources,
+        starts,
+        counts,
+        exposure,
+        threshold,
+    )
+
+    assert np.any(detected)
+
+    # compare to the sums over each window
+
+    for n_src, is_detected, time in zip(n_bins_sources, detected, times):
+
+        expected_detected = False
+        expected_time = 0.0
+
+        for i in range(n_bins):
+
+            src_idx = i + n_bins_background + n_bins_pre
+
+            if src_idx + n_src >= n_bins:
+                break
+
+            off = counts[i : i + n_bins_background].sum()
+            on = counts[src_idx : src_idx + n_src].sum()
+
+            alpha = exposure[src_idx : src_idx + n_src].sum() / exposure[
+                i : i + n_bins_background
+            ].sum()
+
+            sig = (on - alpha * off) / np.sqrt(alpha * off)
+
+            if (sig >= threshold) and (starts[src_idx] > -1.0):
+
+                expected_detected = True
+                expected_time = starts[src_idx]
+
+                break
+
+        assert is_detected == expected_detected
+        assert np.isclose(time, expected_time)
+
+
+def test_significance_cube():
+
+    rng = np.random.default_rng(1234)
+
+    n_bins_background = 500
+    n_bins_pre = 50
+    n_bins_sources = np.array([64, 16, 4, 1])
+    threshold = 4.5
+
+    # detectors with different light curve lengths
+
+    n_bins = np.array([3000, 2500, 600], dtype=np.int64)
+
+    max_bins = n_bins.max()
+
+    starts = np.zeros((3, max_bins))
+    exposure = np.zeros((3, max_bins))
+    counts = np.zeros((3, max_bins), dtype=np.int64)
+
+    for d, N in enumerate(n_bins):
+
+        starts[d, :N] = -10 + 0.016 * np.arange(N)
+        exposure[d, :N] = 0.016
+        counts[d, :N] = rng.poisson(10.0, size=N)
+
+    counts[0, 1500:1520] += 20
+
+    for significance_cube, first_detections in [
+        (_significance_cube, _first_detections),
+        (_significance_cube_parallel, _first_detections_parallel),
+    ]:
+
+        sig = significance_cube(
+            n_bins_background,
+            n_bins_pre,
+            n_bins_sources,
+            n_bins,
+            counts,
+            exposure,
+        )
+
+        assert sig.shape == (3, max_bins, 4)
+
+        detected, times = first_detections(
+            sig,
+            starts,
+            n_bins,
+            n_bins_background,
+            n_bins_pre,
+            n_bins_sources,
+            threshold,
+        )
+
+        assert np.any(detected[0])
+
+        # each detector is the same as running the trigger alone
+
+        for d, N in enumerate(n_bins):
+
+            expected_detected, expected_times = _run_trigger(
+                n_bins_background,
+                n_bins_pre,
+                n_bins_sources,
+                starts[d, :N],
+                counts[d, :N],
+                exposure[d, :N],
+                threshold,
+            )
+
+            assert np.array_equal(detected[d], expected_detected)
+            assert np.allclose(times[d], expected_times)
@@ -1,4 +1,20 @@
+import numpy as np
+
+from cosmogrb.instruments.gbm.gbm_lightcurve import (
+    GBMLightCurve,
+    _gbm_dead_time,
+)
 from cosmogrb.io.grb_save import GRBSave
+from cosmogrb.lightcurve.light_curve_storage import (
+    bin_events,
+    bin_events_multi_band,
+    rebin_counts,
+)
+from cosmogrb.lightcurve.lightcurve import LightCurve, merge_events
+from cosmogrb.response.response import Response
+from cosmogrb.sampler.background import Background, BackgroundSpectrumTemplate
+from cosmogrb.sampler.constant_cpl import ConstantCPL
+from cosmogrb.sampler.source import Source
 from cosmogrb.utils.package_utils import get_path_of_data_file
 
 
@@ -41,3 +57,201 @@ def test_lightcurve_plotting(grb):
         lc.display_count_spectrum(tmin=0, tmax=10)
         lc.display_count_spectrum_background(tmin=0, tmax=10)
         lc.display_count_spectrum_source(tmin=0, tmax=10)
+
+
+def test_merge_events():
+
+    rng = np.random.default_rng(1234)
+
+    times_background = np.sort(rng.uniform(-10, 10, size=1000))
+    # make sure ties are handled
+    times_source = np.sort(
+        np.append(rng.uniform(0, 5, size=499), times_background[600])
+    )
+
+    pha_background = rng.integers(0, 128, size=1000)
+    pha_source = rng.integers(0, 128, size=500)
+
+    times, pha, is_source = merge_events(
+        times_background, pha_background, times_source, pha_source
+    )
+
+    assert len(times) == 1500
+    assert np.all(np.diff(times) >= 0)
+
+    assert np.array_equal(times[~is_source], times_background)
+    assert np.array_equal(pha[~is_source], pha_background)
+    assert np.array_equal(times[is_source], times_source)
+    assert np.array_equal(pha[is_source], pha_source)
+
+    # nothing to merge
+
+    times, pha, is_source = merge_events(
+        times_background, pha_background, times_source[:0], pha_source[:0]
+    )
+
+    assert np.array_equal(times, times_background)
+    assert not np.any(is_source)
+
+
+def test_gbm_dead_time():
+
+    # a normal event blocks 2.6 us and an overflow event 10.6 us
+
+    times = np.array([0.0, 1e-6, 3e-6, 4e-6, 10e-6, 14e-6, 20e-6])
+    pha = np.array([10, 10, 127, 10, 10, 10, 10])
+    is_source = np.array([True, False, True, False, True, False, True])
+
+    n_selected = _gbm_dead_time(times, pha, is_source)
+
+    assert n_selected == 4
+
+    assert np.allclose(times[:n_selected], [0.0, 3e-6, 14e-6, 20e-6])
+    assert np.array_equal(pha[:n_selected], [10, 127, 10, 10])
+    assert np.array_equal(is_source[:n_selected], [True, True, False, True])
+
+    assert _gbm_dead_time(times[:0], pha[:0], is_source[:0]) == 0
+
+
+class _DeadTimeLightCurve(LightCurve):
+
+    # a light curve with the GBM dead time but no GBM response
+
+    _filter_deadtime = GBMLightCurve._filter_deadtime
+
+
+def test_dead_time_splits_source_and_background():
+
+    energy_edges = np.logspace(1, 4, 129)
+
+    response = Response(
+        matrix=np.diag(np.full(128, 100.0)),
+        geometric_area=200.0,
+        energy_edges=energy_edges,
+        channel_edges=energy_edges.copy(),
+    )
+
+    rng = np.random.default_rng(1234)
+
+    source = Source(
+        0.0,
+        1.0,
+        ConstantCPL(peak_flux=1e-5, ep=300.0, alpha=-0.66, response=response),
+        z=1.0,
+        rng=rng,
+    )
+
+    # a background bright enough for the dead time to matter
+
+    background = Background(
+        -1.0,
+        1.0,
+        average_rate=1e5,
+        background_spectrum_template=BackgroundSpectrumTemplate(
+            np.ones(128)
+        ),
+        rng=rng,
+    )
+
+    lc = _DeadTimeLightCurve(
+        "n0", source, background, response, instrument="GBM", tstart=-1.0
+    )
+
+    storage = lc.process()
+
+    # the split is of the events that survived the dead time
+
+    n_sampled = len(lc._times_source) + len(lc._times_background)
+
+    assert storage.n_counts < n_sampled
+
+    assert (
+        storage.n_counts_source + storage.n_counts_background
+        == storage.n_counts
+    )
+
+    times, pha, _ = merge_events(
+        storage.times_background,
+        storage.pha_background,
+        storage.times_source,
+        storage.pha_source,
+    )
+
+    assert np.array_equal(times, storage.times)
+    assert np.array_equal(pha, storage.pha)
+
+
+def test_bin_events():
+
+    rng = np.random.default_rng(1234)
+
+    times = np.sort(rng.uniform(-10, 10, size=10000))
+    weights = rng.uniform(0, 1, size=10000)
+
+    edges = np.arange(-5, 5, 0.016)
+
+    counts, summed_weights = bin_events(times, edges, weights)
+
+    expected_counts, _ = np.histogram(times, bins=edges)
+    expected_weights, _ = np.histogram(times, bins=edges, weights=weights)
+
+    assert np.array_equal(counts, expected_counts)
+    assert np.allclose(summed_weights, expected_weights)
+
+    counts, _ = bin_events(times, edges, np.empty(0))
+
+    assert np.array_equal(counts, expected_counts)
+
+    # events on the edges land in the same bins as in numpy
+
+    counts, _ = bin_events(edges, edges, np.empty(0))
+
+    assert np.array_equal(counts, np.histogram(edges, bins=edges)[0])
+
+
+def test_bin_events_multi_band():
+
+    rng = np.random.default_rng(1234)
+
+    times = np.sort(rng.uniform(-10, 10, size=20000))
+    pha = rng.integers(0, 128, size=20000)
+    weights = rng.uniform(0, 1, size=20000)
+
+    edges = np.arange(-5, 5, 0.016)
+
+    channel_lo = np.array([-1, 10, 50])
+    channel_hi = np.array([129, 40, 128])
+
+    counts, summed_weights = bin_events_multi_band(
+        times, pha, edges, channel_lo, channel_hi, weights
+    )
+
+    assert counts.shape == (3, len(edges) - 1)
+
+    # the weights are summed over all channels
+
+    expected_weights, _ = np.histogram(times, bins=edges, weights=weights)
+
+    assert np.allclose(summed_weights, expected_weights)
+
+    assert np.array_equal(
+        bin_events_multi_band(
+            times, pha, edges, channel_lo, channel_hi, np.empty(0)
+        )[0],
+        counts,
+    )
+
+    for j in range(3):
+
+        idx = (pha > channel_lo[j]) & (pha < channel_hi[j])
+
+        expected, _ = np.histogram(times[idx], bins=edges)
+
+        assert np.array_equal(counts[j], expected)
+
+    # coarser bins come from summing the fine ones
+
+    coarse = rebin_counts(counts, 4)
+
+    assert coarse.shape == (3, (len(edges) - 1) // 4)
+    assert np.array_equal(coarse[:, 0], counts[:, :4].sum(axis=1))
@@ -0,0 +1,338 @@
+import threading
+import types
+
+import h5py
+import numpy as np
+import pytest
+from gbm_drm_gen.drmgen import DRMGen
+
+from cosmogrb.instruments.gbm.gbm_geometry import (
+    earth_coordinates,
+    spacecraft_coordinates,
+)
+from cosmogrb.instruments.gbm.response_atlas import ResponseAtlas
+from cosmogrb.instruments.gbm.response_generator import (
+    DetectorGeometry,
+    ResponseGenerator,
+    get_gbm_response_generator,
+)
+from cosmogrb.response.response import Response
+from cosmogrb.response.response_cache import ResponseCache
+from cosmogrb.utils.executor import executor_map, thread_pool
+from cosmogrb.utils.file_utils import file_existing_and_readable
+from cosmogrb.utils.package_utils import get_path_of_data_file
+
+
+def test_digitize():
+
+    energy_edges = np.logspace(1, 3, 17)
+    channel_edges = np.logspace(1, 3, 4)
+
+    # each photon bin spreads over the channels differently
+    # and the last bin cannot be detected
+
+    rows = np.array(
+        [
+            [10.0, 0.0, 0.0],
+            [5.0, 5.0, 0.0],
+            [2.0, 3.0, 5.0],
+            [0.0, 0.0, 0.0],
+        ]
+    )
+
+    matrix = np.tile(rows, (4, 1))
+
+    rsp = Response(
+        matrix=matrix,
+        geometric_area=20.0,
+        energy_edges=energy_edges,
+        channel_edges=channel_edges,
+    )
+
+    energy_mean = np.sqrt(energy_edges[:-1] * energy_edges[1:])
+
+    n_photons = 5000
+
+    for k, row in enumerate(matrix):
+
+        photons = np.full(n_photons, energy_mean[k])
+
+        pha = rsp.digitize(photons)
+
+        assert pha.dtype == np.int64
+        assert np.all(pha >= 0)
+        assert np.all(pha < len(channel_edges) - 1)
+
+        counts = np.bincount(pha, minlength=len(channel_edges) - 1)
+
+        if row.sum() == 0:
+
+            assert np.all(pha == 0)
+
+            continue
+
+        expected = n_photons * row / row.sum()
+
+        err = np.sqrt(expected + 1)
+
+        assert np.all(np.abs(counts - expected) < 6 * err)
+
+    # photons on the edges of the matrix
+
+    pha = rsp.digitize(np.array([energy_edges[0], energy_edges[-1]]))
+
+    assert pha[0] == 0
+
+
+def test_response_cache(tmp_path):
+
+    calls = []
+
+    def compute(ra, dec, time):
+
+        calls.append((ra, dec, time))
+
+        return np.full((3, 2), ra + dec + time)
+
+    cache = ResponseCache(
+        angular_tolerance=2.0,
+        time_tolerance=10.0,
+        max_entries=2,
+        time_range=(0.0, 92.0),
+        disk_path=tmp_path,
+    )
+
+    # nearby GRBs share the matrix computed at the center
+
+    a = cache.get("n0", 10.1, 20.1, 3.0, compute)
+    b = cache.get("n0", 10.4, 20.4, 7.0, compute)
+
+    assert a is b
+    assert len(calls) == 1
+
+    ra, dec, time = calls[0]
+
+    assert abs(ra - 10.1) < 2.0 and abs(dec - 20.1) < 2.0
+    assert time == 5.0
+
+    # the last bin is clipped to the time range
+
+    assert cache.time_bin(99.0)[1] == 92.0
+
+    # another detector or position is a new entry
+
+    cache.get("n1", 10.1, 20.1, 3.0, compute)
+    cache.get("n0", 200.0, -45.0, 3.0, compute)
+
+    assert len(calls) == 3
+    assert len(cache) == 2
+    assert cache.misses == 3
+
+    # the oldest was evicted from memory but is read from disk
+
+    c = cache.get("n0", 10.1, 20.1, 3.0, compute)
+
+    assert len(calls) == 3
+    assert np.array_equal(a, c)
+
+    # every position maps into a pixel whose center is close
+
+    rng = np.random.default_rng(1234)
+
+    for ra, dec in zip(rng.uniform(0, 360, 100), rng.uniform(-90, 90, 100)):
+
+        _, ra_center, dec_center = cache.pixel(ra, dec)
+
+        assert abs(dec - dec_center) <= 1.0
+
+        assert abs(ra - ra_center) * np.cos(np.deg2rad(dec_center)) <= 1.0
+
+
+def test_gbm_geometry():
+
+    rng = np.random.default_rng(1234)
+
+    for _ in range(20):
+
+        quaternion = rng.normal(size=4)
+        quaternion /= np.linalg.norm(quaternion)
+
+        sc_pos = 7000.0 * rng.normal(size=3)
+
+        ra = rng.uniform(0, 360)
+        dec = rng.uniform(-90, 90)
+
+        # the same angles as the DRM generator
+
+        drm_gen = types.SimpleNamespace(
+            _quaternions=quaternion, _sc_pos=sc_pos, _nobins_in=1, _nobins_out=1
+        )
+
+        DRMGen._compute_spacecraft_coordinates(drm_gen)
+
+        assert np.allclose(
+            spacecraft_coordinates(ra, dec, quaternion),
+            DRMGen._get_coords(drm_gen, ra, dec),
+        )
+
+        assert np.allclose(
+            earth_coordinates(quaternion, sc_pos),
+            (drm_gen._geo_az, drm_gen._geo_el),
+        )
+
+
+def test_response_atlas(tmp_path):
+
+    resolution = 10.0
+
+    az = resolution * np.arange(36)
+    el = -90.0 + resolution * np.arange(19)
+
+    # a response that is linear in el and smooth in az
+
+    values = np.cos(np.deg2rad(az))[None, :] + el[:, None] / 90.0
+
+    file_name = tmp_path / "atlas.h5"
+
+    with h5py.File(file_name, "w") as f:
+
+        f.attrs["resolution"] = resolution
+        f.attrs["reference_time"] = 0.0
+
+        det_group = f.create_group("n0")
+
+        det_group.create_dataset("mc_energies", data=np.arange(4.0))
+        det_group.create_dataset("ebounds", data=np.arange(3.0))
+
+        det_group.create_dataset(
+            "matrix",
+            data=np.broadcast_to(
+                values[:, :, None, None], (19, 36, 3, 2)
+            ).astype("f4"),
+        )
+
+    atlas = ResponseAtlas(file_name)
+
+    assert atlas.detectors == ["n0"]
+
+    # the grid points are returned exactly
+
+    matrix = atlas.interpolate("n0", 20.0, 30.0)
+
+    assert matrix.shape == (3, 2)
+    assert np.allclose(matrix, values[12, 2], rtol=1e-6)
+
+    # in between the neighbours are blended and the azimuth wraps
+
+    assert np.allclose(
+        atlas.interpolate("n0", 15.0, 35.0),
+        0.25 * (values[12, 1] + values[12, 2] + values[13, 1] + values[13, 2]),
+        rtol=1e-6,
+    )
+
+    assert np.allclose(
+        atlas.interpolate("n0", 355.0, 90.0),
+        0.5 * (values[18, 35] + values[18, 0]),
+        rtol=1e-6,
+    )
+
+
+@pytest.mark.skipif(
+    not file_existing_and_readable(get_path_of_data_file("posthist.fit")),
+    reason="the GBM position history is not available",
+)
+def test_generate_response_is_pure():
+
+    ra, dec, time = 312.0, -62.0, 1000.0
+
+    gbm_response_generator = get_gbm_response_generator()
+
+    detectors = list(gbm_response_generator.detectors)
+
+    expected = {}
+
+    for det in detectors:
+
+        gbm_response_generator.set_time(time, det)
+
+        expected[det] = gbm_response_generator.set_location(ra, dec, det)
+
+        # the state of the old generators does not matter
+
+        gbm_response_generator.set_time(time + 5000.0, det)
+
+    def generate(det):
+
+        return gbm_response_generator.generate_response(ra, dec, time, det)
+
+    with thread_pool(4) as executor:
+
+        matrices = executor_map(generate, detectors, executor)
+
+    for det, matrix in zip(detectors, matrices):
+
+        assert np.allclose(matrix, expected[det], rtol=1e-5, atol=1e-5)
+
+        assert np.array_equal(matrix, generate(det))
+
+
+class _StatefulDRMGen(object):
+
+    # the public interface of a gbm_drm_gen DRM generator
+
+    def __init__(self):
+
+        self._state = None
+
+    def set_time(self, time):
+
+        self._time = time
+
+    def set_location(self, ra, dec):
+
+        self._state = (ra, dec, self._time)
+
+    def set_location_direct_sat_coord(self, az, el):
+
+        self._state = (-az, -el, self._time)
+
+    @property
+    def matrix(self):
+
+        return np.full((2, 3), sum(self._state))
+
+
+def test_response_generator_without_geometries():
+
+    # a DRM generator without the private parts of gbm_drm_gen
+    # has no geometry
+
+    with pytest.raises(AttributeError):
+
+        DetectorGeometry(_StatefulDRMGen())
+
+    response_generator = object.__new__(ResponseGenerator)
+
+    response_generator._detectors = dict(n0=_StatefulDRMGen())
+    response_generator._geometries = {}
+    response_generator._lock = threading.Lock()
+    response_generator._response_cache = None
+    response_generator._response_cache_settings = None
+
+    def generate(time):
+
+        return response_generator.generate_response(10.0, 20.0, time, "n0")
+
+    with thread_pool(4) as executor:
+
+        matrices = executor_map(generate, np.arange(20.0), executor)
+
+    for time, matrix in enumerate(matrices):
+
+        assert matrix.shape == (3, 2)
+
+        assert np.all(matrix == 30.0 + time)
+
+    matrix = response_generator.response_direct_sat_coord(10.0, 20.0, 5.0, "n0")
+
+    assert np.all(matrix == -25.0)
@@ -0,0 +1,311 @@
+import numpy as np
+import pytest
+from scipy.special import gamma, gammaincc
+
+from cosmogrb.response.response import Response
+from cosmogrb.sampler.background import (
+    Background,
+    BackgroundSpectrumTemplate,
+    background_poisson_generator,
+)
+from cosmogrb.sampler.constant_cpl import ConstantCPL
+from cosmogrb.sampler.cpl_functions import upper_incomplete_gamma
+from cosmogrb.sampler.cpl_source import CPLSourceFunction
+from cosmogrb.sampler.source import Source
+
+
+@pytest.fixture(scope="module")
+def diagonal_response():
+
+    # a simple response with a smooth effective area
+    # and every photon landing in its own channel
+
+    energy_edges = np.logspace(1, 4, 129)
+    channel_edges = np.logspace(1, 4, 129)
+
+    energy_mean = np.sqrt(energy_edges[:-1] * energy_edges[1:])
+
+    ea = 100.0 * np.exp(-((np.log10(energy_mean) - 2.0) ** 2))
+
+    matrix = np.diag(ea)
+
+    return Response(
+        matrix=matrix,
+        geometric_area=200.0,
+        energy_edges=energy_edges,
+        channel_edges=channel_edges,
+    )
+
+
+def _cpl_source(response, duration=2.0, rng=None):
+
+    source_function = CPLSourceFunction(
+        peak_flux=5e-7,
+        ep_start=300.0,
+        ep_tau=2.0,
+        alpha=-0.66,
+        trise=0.1,
+        tdecay=1.0,
+        response=response,
+    )
+
+    return Source(0.0, duration, source_function, z=1.0, rng=rng)
+
+
+def _constant_source(response, duration=2.0, rng=None):
+
+    source_function = ConstantCPL(
+        peak_flux=5e-7, ep=300.0, alpha=-0.66, response=response
+    )
+
+    return Source(0.0, duration, source_function, z=1.0, rng=rng)
+
+
+@pytest.mark.parametrize("make_source", [_cpl_source, _constant_source])
+def test_batched_thinning_matches_single(diagonal_response, make_source):
+
+    source = make_source(diagonal_response)
+
+    sf = source._source_function
+
+    n_trials = 30
+
+    single = []
+    batched = []
+
+    for _ in range(n_trials):
+
+        times = sf.sample_events(source.tstart, source.tstop, source._fmax)
+
+        single.append(len(times))
+
+        times = sf.sample_events(
+            source.tstart, source.tstop, source._fmax, block_size=64
+        )
+
+        assert np.all(np.diff(times) >= 0)
+        assert times.max() <= source.tstop
+
+        batched.append(len(times))
+
+    single = np.array(single)
+    batched = np.array(batched)
+
+    # the means should agree within a few standard errors
+    err = np.sqrt((single.var() + batched.var()) / n_trials)
+
+    assert np.abs(single.mean() - batched.mean()) < 5 * err + 1
+
+
+@pytest.mark.parametrize("make_source", [_cpl_source, _constant_source])
+def test_source_has_no_seed_event(diagonal_response, make_source):
+
+    source = make_source(diagonal_response)
+
+    sf = source._source_function
+
+    # no event sits on tstart unless it was drawn there
+
+    for block_size in (0, 64):
+
+        times = sf.sample_events(
+            source.tstart, source.tstop, source._fmax, block_size=block_size
+        )
+
+        assert times.min() > source.tstart
+
+    if source.rate_table is not None:
+
+        table_times = source.rate_table.sample_events(block_size=64)
+
+        assert table_times.min() > source.tstart
+
+    # a source without flux has no events
+
+    empty = sf.sample_events(source.tstart, source.tstop, 1e-30, block_size=64)
+
+    assert len(empty) == 0
+
+
+def test_rate_table(diagonal_response):
+
+    source = _cpl_source(diagonal_response)
+
+    table = source.rate_table
+
+    assert table is not None
+    assert table.max_rate == source._fmax
+
+    # check the interpolation error off the grid
+
+    times = np.random.uniform(source.tstart, source.tstop, size=1000)
+
+    exact = source._source_function.energy_integrated_evolution_grid(times)
+
+    error = np.abs(table.evaluate(times) - exact).max()
+
+    assert error <= 2 * table.rtol * table.max_rate
+
+    n_trials = 30
+
+    exact_counts = []
+    table_counts = []
+
+    sf = source._source_function
+
+    for _ in range(n_trials):
+
+        exact_counts.append(
+            len(
+                sf.sample_events(
+                    source.tstart, source.tstop, source._fmax, block_size=64
+                )
+            )
+        )
+
+        times = table.sample_events(block_size=64)
+
+        assert np.all(np.diff(times) >= 0)
+
+        table_counts.append(len(times))
+
+    exact_counts = np.array(exact_counts)
+    table_counts = np.array(table_counts)
+
+    err = np.sqrt((exact_counts.var() + table_counts.var()) / n_trials)
+
+    assert np.abs(exact_counts.mean() - table_counts.mean()) < 5 * err + 1
+
+
+@pytest.mark.parametrize("make_source", [_cpl_source, _constant_source])
+def test_cdf_energy_sampler(diagonal_response, make_source):
+
+    source = make_source(diagonal_response)
+
+    sf = source._source_function
+
+    times = np.random.uniform(source.tstart, source.tstop, size=20000)
+
+    rejection = sf.sample_energy(times)
+    cdf = sf.sample_energy(times, cdf_resolution=0.01)
+
+    assert cdf.shape == times.shape
+    assert np.all(cdf >= sf.emin)
+    assert np.all(cdf <= sf.emax)
+
+    # compare the distributions in log energy
+
+    bins = np.linspace(np.log10(sf.emin), np.log10(sf.emax), 21)
+
+    h_rejection, _ = np.histogram(np.log10(rejection), bins=bins)
+    h_cdf, _ = np.histogram(np.log10(cdf), bins=bins)
+
+    err = np.sqrt(h_rejection + h_cdf + 1)
+
+    assert np.all(np.abs(h_rejection - h_cdf) < 6 * err)
+
+
+@pytest.mark.parametrize("make_source", [_cpl_source, _constant_source])
+def test_seeded_sources_replay(diagonal_response, make_source):
+
+    def sample(seed):
+
+        source = make_source(diagonal_response, rng=seed)
+
+        times = source.sample_times()
+        photons = source.sample_photons(times)
+        channels = source.sample_channel(photons, diagonal_response)
+
+        return times, photons, channels
+
+    first = sample(1234)
+    second = sample(1234)
+    other = sample(4321)
+
+    for a, b in zip(first, second):
+
+        assert np.array_equal(a, b)
+
+    assert not np.array_equal(first[0], other[0])
+
+
+def test_background_poisson_generator():
+
+    rng = np.random.default_rng(1234)
+
+    rate = 500.0
+    tstart = -100.0
+    tstop = 300.0
+
+    counts = []
+
+    for _ in range(20):
+
+        times = background_poisson_generator(tstart, tstop, rate, rng)
+
+        assert np.all(np.diff(times) >= 0)
+        assert times.min() >= tstart
+        assert times.max() <= tstop
+
+        counts.append(len(times))
+
+    expected = rate * (tstop - tstart)
+
+    assert np.abs(np.mean(counts) - expected) < 5 * np.sqrt(expected / 20)
+
+    # the times are uniform so the half way point splits them evenly
+
+    half = np.mean(times < 0.5 * (tstart + tstop))
+
+    assert np.abs(half - 0.5) < 0.01
+
+
+def test_background_template():
+
+    counts = np.random.default_rng(1).uniform(0, 100, size=128)
+    counts[10] = 0.0
+
+    template = BackgroundSpectrumTemplate(counts, start_at_one=True)
+
+    rng = np.random.default_rng(1234)
+
+    n = 200000
+
+    channels = template.sample_channel(size=n, rng=rng)
+
+    assert channels.min() >= 1
+    assert channels.max() <= 128
+    assert np.all(channels != 11)
+
+    hist = np.bincount(channels - 1, minlength=128)
+
+    expected = n * template.weights
+
+    assert np.all(np.abs(hist - expected) < 6 * np.sqrt(expected + 1))
+
+    bkg = Background(
+        -10.0, 10.0, average_rate=1000.0, background_spectrum_template=template
+    )
+
+    times, channels = bkg.sample_events()
+
+    assert len(times) == len(channels)
+    assert np.all(np.diff(times) >= 0)
+    assert np.all(channels >= 1)
+
+
+def test_upper_incomplete_gamma():
+
+    for s in np.linspace(0.05, 3.5, 25):
+        for x in np.logspace(-4, 3, 30):
+
+            expected = gammaincc(s, x) * gamma(s)
+
+            if expected > 1e-250:
+
+                assert np.isclose(
+                    upper_incomplete_gamma(s, x), expected, rtol=1e-12
+                )
+
+    assert np.isclose(upper_incomplete_gamma(1.5, 0.0), gamma(1.5))
+    assert np.isnan(upper_incomplete_gamma(-0.5, 1.0))
@@ -0,0 +1,144 @@
+import os
+
+import h5py
+import numpy as np
+
+from cosmogrb.io.detector_save import DetectorSave
+from cosmogrb.io.store import (
+    detection_location,
+    is_store_location,
+    make_location,
+    merge_shards,
+    open_location,
+    read_attribute,
+    shard_file_name,
+    split_location,
+)
+from cosmogrb.universe.survey import _read_detector_saves
+
+
+def test_locations():
+
+    assert split_location("grb.h5") == ("grb.h5", None)
+    assert not is_store_location("grb.h5")
+
+    location = make_location("store.h5", "SynthGRB_0")
+
+    assert location == "store.h5::/SynthGRB_0"
+    assert split_location(location) == ("store.h5", "/SynthGRB_0")
+    assert is_store_location(location)
+
+    assert detection_location("grb_store.h5") == "grb_store_detection_info.h5"
+    assert (
+        detection_location(location)
+        == "store.h5::/detection_info/SynthGRB_0"
+    )
+
+
+def test_shards_and_store():
+
+    base = "_test_store"
+
+    shard_files = [f"{base}_shard_{i}.h5" for i in range(3)]
+
+    # write the GRBs into the shards as the workers would
+
+    for i in range(6):
+
+        shard_file = shard_files[i % 3]
+
+        with open_location(make_location(shard_file, f"grb_{i}"), "w") as f:
+
+            f.attrs["grb_name"] = f"grb_{i}"
+            f.create_dataset("times", data=np.arange(i))
+
+    store_file = f"{base}.h5"
+
+    merge_shards(shard_files, store_file)
+
+    for shard_file in shard_files:
+
+        assert not os.path.exists(shard_file)
+
+    locations = [make_location(store_file, f"grb_{i}") for i in range(6)]
+
+    assert read_attribute(locations, "grb_name") == [
+        f"grb_{i}" for i in range(6)
+    ]
+
+    with open_location(locations[4], "r") as f:
+
+        assert np.array_equal(f["times"][()], np.arange(4))
+
+    # rewriting a group leaves the others alone
+
+    with open_location(locations[4], "w") as f:
+
+        f.attrs["grb_name"] = "new"
+
+    assert read_attribute(locations, "grb_name")[4] == "new"
+    assert read_attribute(locations, "grb_name")[3] == "grb_3"
+
+    # detection info lives in the same store
+
+    detector_save = DetectorSave(
+        "grb_0", True, "GBM", extra_info=dict(triggered_times=np.ones(2))
+    )
+
+    detector_save.write(detection_location(locations[0]))
+
+    reloaded = DetectorSave.from_file(detection_location(locations[0]))
+
+    assert reloaded.is_detected
+    assert reloaded.name == "grb_0"
+    assert np.array_equal(reloaded.extra_info["triggered_times"], np.ones(2))
+
+    with h5py.File(store_file, "r") as f:
+
+        assert len(f.keys()) == 7
+
+    os.remove(store_file)
+
+
+def test_shard_file_name():
+
+    # the same worker always writes to the same shard
+
+    assert shard_file_name("store") == shard_file_name("store")
+    assert shard_file_name("store").startswith("store_shard_")
+
+
+def test_read_detector_saves():
+
+    # a mix of plain files and groups of a store
+
+    store_file = "_test_detections.h5"
+
+    locations = []
+
+    for i in range(5):
+
+        if i % 2 == 0:
+
+            location = f"_test_grb_{i}_detection_info.h5"
+
+        else:
+
+            location = make_location(store_file, f"detection_info/grb_{i}")
+
+        DetectorSave(f"grb_{i}", i > 2, "GBM").write(location)
+
+        locations.append(location)
+
+    detector_saves = _read_detector_saves(locations)
+
+    assert [d.name for d in detector_saves] == [f"grb_{i}" for i in range(5)]
+    assert [d.is_detected for d in detector_saves] == [i > 2 for i in range(5)]
+
+    for location in locations:
+
+        file_name, _ = split_location(location)
+
+        if os.path.exists(file_name):
+
+            os.remove(file_name)
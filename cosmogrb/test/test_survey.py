@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from cosmogrb.universe.survey import Survey
+
+
+def test_survey_catalog_round_trip(tmp_path):
+
+    population_file = tmp_path / "population.h5"
+    population_file.touch()
+
+    names = ["SynthGRB_0", "SynthGRB_1", "SynthGRB_2"]
+    locations = [str(tmp_path / f"{name}_store.h5") for name in names]
+
+    # newer versions of pandas keep strings as a string dtype
+
+    catalog = pd.DataFrame(
+        dict(
+            name=pd.array(names, dtype="string"),
+            location=pd.array(locations, dtype="string"),
+            z=[0.5, 1.0, 2.0],
+            ra=[10.0, 20.0, 30.0],
+            dec=[-10.0, 0.0, 10.0],
+            detected=[True, False, True],
+            trigger_time=[0.1, np.nan, 0.3],
+            triggered_detectors=pd.array(
+                ["n0,n1", "", "n3,n4,b0"], dtype="string"
+            ),
+        )
+    ).set_index("name")
+
+    survey = Survey(
+        locations,
+        str(population_file),
+        grb_detector_files=[f"{x}_detection" for x in locations],
+        catalog=catalog,
+    )
+
+    survey.write(tmp_path / "survey.h5")
+
+    survey2 = Survey.from_file(tmp_path / "survey.h5")
+
+    catalog2 = survey2.catalog
+
+    assert list(catalog2.index) == names
+    assert list(catalog2["location"]) == locations
+    assert list(catalog2["triggered_detectors"]) == ["n0,n1", "", "n3,n4,b0"]
+
+    assert np.array_equal(catalog2["z"], catalog["z"])
+    assert np.array_equal(catalog2["detected"], catalog["detected"])
+
+    assert survey2.triggered_detectors[2] == ["n3", "n4", "b0"]
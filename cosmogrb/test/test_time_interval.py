@@ -2,6 +2,7 @@ from __future__ import print_function
 
 from builtins import zip
 
+import numpy as np
 import pytest
 
 from cosmogrb.utils.time_interval import (
@@ -495,3 +496,63 @@ def test_time_interval_sets_starts_stops():
 #         ts1 = TimeIntervalSet([t1, t2, t3])
 
 #         _ = ts1.time_edges
+
+
+def test_time_interval_set_columns():
+
+    starts = np.arange(0.0, 10.0, 1.0)
+    stops = starts + 1.0
+    counts = np.arange(10)
+    dead_time = np.full(10, 0.5)
+
+    ts = TimeIntervalSet.from_starts_and_stops(starts, stops, counts, dead_time)
+
+    assert len(ts) == 10
+    assert ts.is_sorted
+    assert ts.is_contiguous()
+
+    assert np.allclose(ts.exposures, 0.5)
+    assert np.allclose(ts.rates, counts / 0.5)
+    assert np.allclose(ts.widths, 1.0)
+    assert np.allclose(ts.edges, np.arange(0.0, 11.0, 1.0))
+
+    # intervals are built on demand
+
+    assert ts[3] == TimeInterval(3.0, 4.0)
+    assert ts[3].counts == 3
+    assert ts[3].dead_time == 0.5
+
+    sub_set = ts.containing_interval(2.0, 5.0)
+
+    assert len(sub_set) == 3
+    assert np.array_equal(sub_set.counts, [2, 3, 4])
+
+    shifted = ts + 10.0
+
+    assert shifted[0].start == 10.0
+    assert np.array_equal(shifted.counts, counts)
+
+    with pytest.raises(RuntimeError):
+
+        TimeIntervalSet.from_starts_and_stops([0.0, 1.0], [1.0, 0.5])
+
+
+def test_merging_chained_intervals():
+
+    # a chain of overlapping intervals merges into one
+    # and the counts and dead times add up
+
+    starts = [0.0, 1.0, 2.0, 3.0, 10.0]
+    stops = [1.5, 2.5, 3.5, 4.5, 11.0]
+
+    ts = TimeIntervalSet.from_starts_and_stops(
+        starts, stops, counts=[1, 2, 3, 4, 5], dead_time=[0.1] * 5
+    )
+
+    merged = ts.merge_intersecting_intervals()
+
+    assert len(merged) == 2
+    assert merged[0] == TimeInterval(0.0, 4.5)
+    assert merged[1] == TimeInterval(10.0, 11.0)
+    assert np.array_equal(merged.counts, [10, 5])
+    assert np.allclose(merged.dead_times, [0.4, 0.1])
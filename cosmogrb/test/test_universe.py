@@ -1,9 +1,21 @@
+import concurrent.futures
+import os
+import pickle
 from glob import glob
 
+import numpy as np
 import popsynth
 import pytest
 
+from cosmogrb import cosmogrb_config
+from cosmogrb.instruments.gbm import GBM_CPL_Universe
+from cosmogrb.instruments.gbm.gbm_trigger import GBMTrigger
+from cosmogrb.io.store import make_location, open_location, shard_file_name
+from cosmogrb.universe.survey import Survey
+from cosmogrb.universe.universe import balance_batches
+from cosmogrb.utils.executor import process_pool
 from cosmogrb.utils.file_utils import file_existing_and_readable
+from cosmogrb.utils.package_utils import get_path_of_data_file
 
 
 def test_gbm_universe(universe):
@@ -14,6 +26,247 @@ def test_gbm_universe(universe):
     assert universe._is_processed
 
 
+def test_gbm_universe_stale_shards(tmp_path):
+
+    population_file = get_path_of_data_file("test_grb_pop.h5")
+
+    # a shard left by an earlier run of this process and thread
+
+    stale_shard = shard_file_name(tmp_path / "store")
+
+    with open_location(make_location(stale_shard, "stale_grb"), "w") as f:
+
+        f.attrs["grb_name"] = "stale_grb"
+
+    universe = GBM_CPL_Universe(
+        population_file, save_path=str(tmp_path), store_file="store.h5"
+    )
+
+    other = GBM_CPL_Universe(
+        population_file, save_path=str(tmp_path), store_file="store.h5"
+    )
+
+    # every run has shards of its own
+
+    assert (
+        universe._parameter_servers[0].shard_base
+        != other._parameter_servers[0].shard_base
+    )
+
+    universe.go(client=None)
+
+    with open_location(str(tmp_path / "store.h5")) as f:
+
+        assert "stale_grb" not in f
+
+        assert len(f.keys()) == universe._n_grbs
+
+
 def test_gbm_universe_serial(universe):
 
     universe.go(client=None)
+
+
+def test_gbm_universe_store(client):
+
+    population_file = get_path_of_data_file("test_grb_pop.h5")
+
+    universe = GBM_CPL_Universe(population_file, store_file="_universe_store.h5")
+
+    universe.go(client)
+    universe.save("_universe_consolidated.h5")
+
+    # the shards were merged
+
+    assert len(glob("_universe_store_*_shard_*.h5")) == 0
+
+    survey = Survey.from_file("_universe_consolidated.h5")
+
+    survey.process(GBMTrigger, serial=True)
+
+    for k, v in survey.items():
+
+        assert v.grb.name == k
+
+        assert v.detector_info.name == k
+
+    # no per GRB files were written
+
+    assert len(glob("SynthGRB*_detection_info.h5")) == 0
+
+    os.remove("_universe_store.h5")
+    os.remove("_universe_consolidated.h5")
+
+
+def test_balance_batches():
+
+    rng = np.random.default_rng(1234)
+
+    costs = rng.lognormal(0, 2, size=101)
+
+    batches = balance_batches(costs, 8)
+
+    assert len(batches) == 8
+
+    # every GRB is in exactly one batch
+
+    assert sorted(i for batch in batches for i in batch) == list(range(101))
+
+    # no batch is heavier than the ideal plus the largest item
+
+    loads = np.array([costs[batch].sum() for batch in batches])
+
+    assert loads.max() <= costs.sum() / 8 + costs.max()
+
+    # more batches than items leaves none empty
+
+    assert len(balance_batches(costs[:3], 8)) == 3
+
+
+class _RecordingExecutor(object):
+
+    # records the size of every task without running it
+
+    def __init__(self):
+
+        self.task_sizes = []
+
+    def submit(self, fn, *args, **kwargs):
+
+        self.task_sizes.append(len(pickle.dumps((fn, args, kwargs))))
+
+        future = concurrent.futures.Future()
+
+        future.set_result([[] for _ in args[1]])
+
+        return future
+
+
+def test_universe_tasks_do_not_carry_the_universe():
+
+    population_file = get_path_of_data_file("test_grb_pop.h5")
+
+    universe = GBM_CPL_Universe(population_file)
+
+    executor = _RecordingExecutor()
+
+    universe.go(executor)
+
+    assert len(executor.task_sizes) == universe._n_grbs
+
+    # a task is the wrapper class and a parameter server
+
+    parameter_server_size = max(
+        len(pickle.dumps(ps)) for ps in universe._parameter_servers
+    )
+
+    assert max(executor.task_sizes) < parameter_server_size + 1024
+
+
+def test_gbm_universe_process_pool(tmp_path):
+
+    population_file = get_path_of_data_file("test_grb_pop.h5")
+
+    universe = GBM_CPL_Universe(population_file, save_path=str(tmp_path))
+
+    with process_pool(2, warmup=False) as executor:
+
+        universe.go(executor)
+
+    universe.save(str(tmp_path / "universe.h5"))
+
+    for i in range(universe._n_grbs):
+
+        assert file_existing_and_readable(
+            str(tmp_path / f"SynthGRB_{i}_store.h5")
+        )
+
+    survey = Survey.from_file(str(tmp_path / "universe.h5"))
+
+    assert len(survey) == universe._n_grbs
+
+
+def _saved_events(location):
+
+    events = {}
+
+    with open_location(location) as f:
+
+        for det, group in f["detectors"].items():
+
+            for signal in ("total_signal", "source_signal"):
+
+                for column in ("times", "pha"):
+
+                    key = f"{det}/{signal}/{column}"
+
+                    events[key] = group[signal][column][()]
+
+    return events
+
+
+def test_gbm_universe_batched(tmp_path):
+
+    # packing the GRBs into batches gives the same GRBs as
+    # one task per GRB, also when they go into one store
+
+    population_file = get_path_of_data_file("test_grb_pop.h5")
+
+    runs = {}
+
+    for batch_size, store_file in ((0, None), (2, None), (2, "store.h5")):
+
+        save_path = tmp_path / f"batch_size_{batch_size}_{store_file}"
+
+        save_path.mkdir()
+
+        universe = GBM_CPL_Universe(
+            population_file,
+            save_path=str(save_path),
+            seed=1234,
+            store_file=store_file,
+        )
+
+        cosmogrb_config["multiprocess"]["grb_batch_size"] = batch_size
+
+        try:
+
+            with process_pool(2, warmup=False) as executor:
+
+                universe.go(executor)
+
+        finally:
+
+            cosmogrb_config["multiprocess"]["grb_batch_size"] = 0
+
+        if store_file is None:
+
+            locations = [
+                str(save_path / f"SynthGRB_{i}_store.h5")
+                for i in range(universe._n_grbs)
+            ]
+
+        else:
+
+            # the shards were collected and merged
+
+            assert len(glob(str(save_path / "store_*_shard_*.h5"))) == 0
+
+            locations = [
+                make_location(str(save_path / store_file), name)
+                for name in universe._name
+            ]
+
+        runs[(batch_size, store_file)] = [
+            _saved_events(location) for location in locations
+        ]
+
+    for key, run in runs.items():
+
+        for per_grb, batched in zip(runs[(0, None)], run):
+
+            assert per_grb.keys() == batched.keys()
+
+            for column in per_grb:
+
+                assert np.array_equal(per_grb[column], batched[column])
@@ -1,19 +1,28 @@
 import collections
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import h5py
 import numpy as np
 import pandas as pd
-import popsynth
-from IPython.display import display
 from natsort import natsorted
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
 
 from cosmogrb.grb.grb_detector import GRBDetector
 from cosmogrb.io.detector_save import DetectorSave
 from cosmogrb.io.grb_save import GRBSave
+from cosmogrb.io.store import (
+    detection_location,
+    is_store_location,
+    split_location,
+)
+from cosmogrb.utils.executor import executor_map
 from cosmogrb.utils.file_utils import file_existing_and_readable
 from cosmogrb.utils.logging import setup_logger
 
+if TYPE_CHECKING:
+
+    import popsynth
+
 logger = setup_logger(__name__)
 
 
@@ -22,7 +31,7 @@ class Observation(object):
         self,
         grb_save_file: str,
         grb_detector_file: Optional[str] = None,
-        population: Optional[popsynth.Population] = None,
+        population: Optional["popsynth.Population"] = None,
         idx=None,
     ):
         """
@@ -41,9 +50,19 @@ class Observation(object):
 
         self._detector: str = grb_detector_file
 
+        self._grb_save: Optional[GRBSave] = None
+
     @property
     def grb(self):
-        return GRBSave.from_file(self._grb)
+
+        # the events are only read once they are used
+        # and the GRB is kept for the next access
+
+        if self._grb_save is None:
+
+            self._grb_save = GRBSave.from_file(self._grb, lazy=True)
+
+        return self._grb_save
 
     @property
     def detector_info(self):
@@ -62,15 +81,19 @@ class Survey(collections.OrderedDict):
         grb_save_files: List[str],
         population_file: str,
         grb_detector_files=None,
+        client=None,
+        catalog: Optional[pd.DataFrame] = None,
     ) -> None:
         """
         A container for a survey of observed GRBs. Holds file locations
         for all the GRBs created in the Universe. It also allows you to process
         the observations with a GRBDetector class.
 
-        :param grb_save_files: the file locations for the survey
+        :param grb_save_files: the file locations for the survey. These can be groups of a store (file.h5::/group)
         :param population_file: the population file used to generate the population
         :param grb_detector_files: the generated detector files
+        :param client: a dask client or an executor to read the detector files with
+        :param catalog: a catalog stored with the survey. If given no GRB or detector files are opened
         :returns:
         :rtype:
         """
@@ -81,29 +104,39 @@ class Survey(collections.OrderedDict):
         self._grb_save_files: List[str] = grb_save_files
         self._names: List[str] = []
 
-        # build  a population from the file
+        # the population is read from the file when it is
+        # first needed
+
+        self._population: Optional["popsynth.Population"] = None
 
         if file_existing_and_readable(population_file):
 
             self._population_file: Optional[str] = population_file
-            self._population: Optional[
-                popsynth.Population
-            ] = popsynth.Population.from_file(self._population_file)
 
         else:
 
             self._population_file = None
-            self._population = None
 
             logger.warnings(
                 f"{population_file} does not exist. Perhaps you moved it?"
             )
 
-        for f in self._grb_save_files:
+        # the catalog of the GRB properties is read once. A store
+        # is only opened once for all its GRBs
+
+        if catalog is None:
 
-            with h5py.File(f, "r") as f:
+            self._grb_table: pd.DataFrame = _build_grb_table(
+                self._grb_save_files, client=client
+            )
+
+        else:
 
-                self._names.append(f.attrs["grb_name"])
+            self._grb_table = catalog.drop(
+                columns=[c for c in _detection_columns if c in catalog]
+            ).reset_index()
+
+        self._names = list(self._grb_table["name"])
 
         # we start off with not being processed unless
         # we find that there are some detector files
@@ -111,6 +144,12 @@ class Survey(collections.OrderedDict):
         self._is_processed: bool = False
 
         self._detected = np.zeros(len(grb_save_files), dtype=bool)
+        self._trigger_times = np.full(len(grb_save_files), np.nan)
+        self._triggered_detectors = np.empty(len(grb_save_files), dtype=object)
+
+        for i in range(len(grb_save_files)):
+
+            self._triggered_detectors[i] = []
 
         self._grb_detector_files = None
 
@@ -126,12 +165,25 @@ class Survey(collections.OrderedDict):
 
             # fill in the detected ones
 
-            for i, f in enumerate(self._grb_detector_files):
+            if catalog is None:
+
+                detector_saves = _read_detector_saves(
+                    self._grb_detector_files, client=client
+                )
+
+                self._collect_detections(detector_saves)
 
-                tmp = DetectorSave.from_file(f)
-                if tmp.is_detected:
+            else:
 
-                    self._detected[i] = True
+                self._detected[:] = catalog["detected"].values
+
+                self._trigger_times[:] = catalog["trigger_time"].values
+
+                for i, dets in enumerate(catalog["triggered_detectors"]):
+
+                    self._triggered_detectors[i] = [
+                        x for x in dets.split(",") if x
+                    ]
 
             # now fill the dict
 
@@ -152,8 +204,98 @@ class Survey(collections.OrderedDict):
                     grb_save_file=grb_save_file, grb_detector_file=None
                 )
 
+    def _collect_detections(self, detector_saves: List[DetectorSave]) -> None:
+        """
+        gather the results of the detectors into arrays
+
+        :param detector_saves:
+        :returns:
+        :rtype:
+
+        """
+
+        for i, detector_save in enumerate(detector_saves):
+
+            self._detected[i] = detector_save.is_detected
+
+            extra_info = detector_save.extra_info
+
+            if not extra_info:
+
+                continue
+
+            self._triggered_detectors[i] = [
+                x.decode() if isinstance(x, bytes) else str(x)
+                for x in np.atleast_1d(
+                    extra_info.get("triggered_detectors", [])
+                )
+            ]
+
+            triggered_times = np.atleast_1d(
+                extra_info.get("triggered_times", [])
+            )
+
+            if detector_save.is_detected and len(triggered_times) > 0:
+
+                self._trigger_times[i] = triggered_times.min()
+
+    @property
+    def catalog(self) -> pd.DataFrame:
+        """
+        a table of the GRBs in the survey indexed by their name
+        with their location, parameters, source parameters and
+        detection results
+        """
+
+        catalog = self._grb_table.copy()
+
+        catalog["detected"] = self._detected
+        catalog["trigger_time"] = self._trigger_times
+        catalog["triggered_detectors"] = [
+            ",".join(dets) for dets in self._triggered_detectors
+        ]
+
+        return catalog.set_index("name")
+
+    def query(self, expr: str) -> pd.DataFrame:
+        """
+        filter the catalog with a pandas query such as
+        "detected and z < 2 and peak_flux > 1e-7"
+
+        :param expr: the query
+        :returns:
+        :rtype:
+
+        """
+
+        return self.catalog.query(expr)
+
+    def select(self, expr: str) -> collections.OrderedDict:
+        """
+        the observations of the GRBs that match the query. Nothing
+        is read from the GRB files until an observation is accessed
+
+        :param expr: the query
+        :returns:
+        :rtype:
+
+        """
+
+        return collections.OrderedDict(
+            (name, self[name]) for name in self.query(expr).index
+        )
+
     @property
-    def population(self) -> Optional[popsynth.Population]:
+    def population(self) -> Optional["popsynth.Population"]:
+
+        if (self._population is None) and (self._population_file is not None):
+
+            import popsynth
+
+            self._population = popsynth.Population.from_file(
+                self._population_file
+            )
+
         return self._population
 
     @property
@@ -178,6 +320,21 @@ class Survey(collections.OrderedDict):
         #True: GRB was detected, False: GRB was NOT detected
         return self._detected
 
+    @property
+    def trigger_times(self) -> np.ndarray:
+        """
+        the time of the first trigger of each GRB and
+        NaN if it was not detected
+        """
+        return self._trigger_times
+
+    @property
+    def triggered_detectors(self) -> np.ndarray:
+        """
+        the detectors that triggered for each GRB
+        """
+        return self._triggered_detectors
+
     @property
     def grb_save_files(self):
         return np.array(self._grb_save_files)
@@ -205,6 +362,8 @@ class Survey(collections.OrderedDict):
 
         df = pd.Series(data=generic_info, index=generic_info.keys())
 
+        from IPython.display import display
+
         display(df.to_frame())
 
     def process(
@@ -215,8 +374,8 @@ class Survey(collections.OrderedDict):
         GRBDetector type on each of the GRBs and prepares the information
 
         :param detector_type: a **class** of GRBDetector type
-        :param client: the dask client
-        :param serial: True/False for if the survey is processed without dask
+        :param client: a dask client or a concurrent.futures executor
+        :param serial: True/False for if the survey is processed in this process
         :returns:
         :rtype:
 
@@ -232,19 +391,21 @@ class Survey(collections.OrderedDict):
                 client is not None
             ), "One must provide a client to process in parallel"
 
-            args = []
-            for grb_file in self._grb_save_files:
+        else:
 
-                args.append([grb_file, detector_type, kwargs])
+            client = None
 
-            futures = client.map(_submit, args)
-            client.gather(futures)
+        args = [
+            [grb_file, detector_type, kwargs]
+            for grb_file in self._grb_save_files
+        ]
 
-        else:
+        detector_saves = executor_map(_submit, args, client)
 
-            for grb_file in self._grb_save_files:
+        # the workers do not write into a store so
+        # the results are written here, one store at a time
 
-                _submit([grb_file, detector_type, kwargs])
+        _write_detector_saves(self._grb_save_files, detector_saves)
 
         # the survey has now had its triggers run
         # so lets flip its status and make sure that
@@ -252,27 +413,14 @@ class Survey(collections.OrderedDict):
 
         self._is_processed = True
 
-        self._grb_detector_files = []
+        self._grb_detector_files = [
+            detection_location(file_name) for file_name in self._grb_save_files
+        ]
 
-        for file_name in self._grb_save_files:
+        # the results came back from the detectors
+        # so nothing has to be read again
 
-            file_name_head = ".".join(file_name.split(".")[:-1])
-
-            out_file_name = f"{file_name_head}_detection_info.h5"
-
-            self._grb_detector_files.append(out_file_name)
-
-            # now update the survey
-            # fill in the detected ones
-
-            for i, f in enumerate(self._grb_detector_files):
-
-                tmp = DetectorSave.from_file(f)
-                if tmp.is_detected:
-
-                    self._detected[i] = True
-
-            # now fill the dict
+        self._collect_detections(detector_saves)
 
         logger.debug("assigning detected grbs to survey")
 
@@ -320,13 +468,42 @@ class Survey(collections.OrderedDict):
                     data=np.array(self._grb_detector_files, dtype=dt)
                 )
 
+            # store the catalog so that the survey can be
+            # reloaded without opening any GRB files
+
+            catalog = self.catalog.reset_index()
+
+            catalog_group = f.create_group("catalog")
+
+            # the file does not keep the order of the columns
+
+            catalog_group.attrs["columns"] = np.array(
+                catalog.columns, dtype=str
+            ).astype(dt)
+
+            for column, values in catalog.items():
+
+                # strings may be object or string dtype depending
+                # on the version of pandas
+
+                if is_numeric_dtype(values) or is_bool_dtype(values):
+
+                    catalog_group.create_dataset(column, data=values.to_numpy())
+
+                else:
+
+                    catalog_group.create_dataset(
+                        column, data=values.astype(str).to_numpy().astype(dt)
+                    )
+
     @classmethod
-    def from_file(cls, file_name):
+    def from_file(cls, file_name, client=None):
         """
         create a survey
 
         :param cls:
         :param file_name:
+        :param client: a dask client or an executor to read the detector files with
         :returns:
         :rtype:
 
@@ -346,7 +523,24 @@ class Survey(collections.OrderedDict):
 
                 grb_dets = f["grb_dets"][()].astype(str)
 
-        return cls(grb_files, population_file, grb_dets)
+            catalog = None
+
+            if "catalog" in f:
+
+                catalog_group = f["catalog"]
+
+                catalog = pd.DataFrame(
+                    {
+                        column: _decode_column(catalog_group[column][()])
+                        for column in _decode_column(
+                            catalog_group.attrs["columns"]
+                        )
+                    }
+                ).set_index("name")
+
+        return cls(
+            grb_files, population_file, grb_dets, client=client, catalog=catalog
+        )
 
 
 def _submit(args):
@@ -355,4 +549,199 @@ def _submit(args):
 
     processor = detector_type(grb_save_file_name=grb_file, **kwargs)
     processor.process()
-    processor.save()
+
+    # GRBs in a store are written by the driver
+
+    if not is_store_location(grb_file):
+
+        processor.save()
+
+    return processor.to_detector_save()
+
+
+# the columns of the catalog that come from the detectors
+
+_detection_columns = ["detected", "trigger_time", "triggered_detectors"]
+
+
+def _decode_column(values):
+
+    if values.dtype == object:
+
+        return np.array(
+            [x.decode() if isinstance(x, bytes) else x for x in values]
+        )
+
+    return values
+
+
+def _read_grb_info_batch(args):
+    """
+    read the parameters of several GRBs of the same file
+
+    :param args: (file_name, groups)
+    :returns:
+    :rtype:
+
+    """
+
+    file_name, groups = args
+
+    out = []
+
+    with h5py.File(file_name, "r") as f:
+
+        for group in groups:
+
+            node = f if group is None else f[group]
+
+            info = collections.OrderedDict()
+
+            info["name"] = node.attrs["grb_name"]
+
+            for key in ["z", "ra", "dec", "duration", "T0"]:
+
+                info[key] = node.attrs[key]
+
+            # only the scalar source parameters fit in the table
+
+            for key, value in node["source"].items():
+
+                if isinstance(value, h5py.Dataset) and value.shape == ():
+
+                    info[key] = value[()]
+
+            out.append(info)
+
+    return out
+
+
+def _map_locations(locations, read_batch, client=None):
+    """
+    read something from many locations. The locations are
+    grouped by file so that each file is opened once and the
+    files are read in parallel if a client is given
+
+    :param locations:
+    :param read_batch: reads the groups of one file
+    :param client:
+    :returns:
+    :rtype:
+
+    """
+
+    by_file = collections.OrderedDict()
+
+    for i, location in enumerate(locations):
+
+        file_name, group = split_location(location)
+
+        by_file.setdefault(file_name, ([], []))
+
+        by_file[file_name][0].append(i)
+        by_file[file_name][1].append(group)
+
+    args = [(file_name, groups) for file_name, (_, groups) in by_file.items()]
+
+    batches = executor_map(read_batch, args, client)
+
+    out = [None] * len(locations)
+
+    for (idx, _), batch in zip(by_file.values(), batches):
+
+        for i, x in zip(idx, batch):
+
+            out[i] = x
+
+    return out
+
+
+def _build_grb_table(locations, client=None) -> pd.DataFrame:
+    """
+    build the table of the GRB parameters
+
+    :param locations:
+    :param client:
+    :returns:
+    :rtype:
+
+    """
+
+    grb_info = _map_locations(locations, _read_grb_info_batch, client)
+
+    table = pd.DataFrame(grb_info)
+
+    table.insert(1, "location", [str(x) for x in locations])
+
+    return table
+
+
+def _read_detector_batch(args):
+    """
+    read the detection info of several groups of the same file
+
+    :param args: (file_name, groups)
+    :returns:
+    :rtype:
+
+    """
+
+    file_name, groups = args
+
+    with h5py.File(file_name, "r") as f:
+
+        return [
+            DetectorSave.from_group(f if group is None else f[group])
+            for group in groups
+        ]
+
+
+def _read_detector_saves(locations, client=None):
+    """
+    read the detection info of all the GRBs. Every file
+    is opened once and the files are read in parallel
+    if a client is given
+
+    :param locations:
+    :param client:
+    :returns:
+    :rtype:
+
+    """
+
+    return _map_locations(locations, _read_detector_batch, client)
+
+
+def _write_detector_saves(grb_save_files, detector_saves):
+    """
+    write the detection info of the GRBs that live in a store
+    into the same store. Each store is opened only once
+
+    :param grb_save_files:
+    :param detector_saves:
+    :returns:
+    :rtype:
+
+    """
+
+    by_file = collections.OrderedDict()
+
+    for grb_file, detector_save in zip(grb_save_files, detector_saves):
+
+        if is_store_location(grb_file):
+
+            file_name, group = split_location(detection_location(grb_file))
+
+            by_file.setdefault(file_name, []).append((group, detector_save))
+
+    for file_name, entries in by_file.items():
+
+        with h5py.File(file_name, "a") as f:
+
+            for group, detector_save in entries:
+
+                if group in f:
+
+                    del f[group]
+
+                detector_save.to_group(f.create_group(group))
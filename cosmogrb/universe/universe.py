@@ -1,15 +1,25 @@
 import abc
+import functools
+import heapq
 import logging
 import os
+import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 import numpy as np
-import popsynth
 from numpy.typing import ArrayLike
 
+from cosmogrb import cosmogrb_config
+from cosmogrb.io.store import make_location, merge_shards, shard_file_name
 from cosmogrb.universe.survey import Survey
+from cosmogrb.utils.executor import executor_map, is_dask_client
 from cosmogrb.utils.logging import setup_logger
+from cosmogrb.utils.rng import get_seed_sequence, spawn_seed_sequences
+
+if TYPE_CHECKING:
+
+    import popsynth
 
 logger = setup_logger(__name__)
 
@@ -22,6 +32,8 @@ class Universe(object, metaclass=abc.ABCMeta):
         population_file: str,
         grb_base_name: str = "SynthGRB",
         save_path: str = ".",
+        seed: Optional[int] = None,
+        store_file: Optional[str] = None,
     ):
 
         """
@@ -34,14 +46,27 @@ class Universe(object, metaclass=abc.ABCMeta):
         :type grb_base_name: str
         :param save_path: path where GRB files are stored
         :type save_path: str
+        :param seed: master seed from which the streams of each GRB are spawned
+        :type seed: int
+        :param store_file: if given, all GRBs are saved as groups of this single file in the save path
+        :type store_file: str
         :returns:
 
         """
+
+        # passing the same seed replays the universe exactly
+        # no matter how the GRBs are distributed over workers
+
+        self._seed_sequence: np.random.SeedSequence = get_seed_sequence(seed)
+
+        logger.debug(f"The Universe seed is {self._seed_sequence.entropy}")
         # we want to store the absolute path so that we can find it later
         self._population_file: Path = Path(population_file).absolute()
 
         self._is_processed: bool = False
 
+        import popsynth
+
         self._population: popsynth.Population = popsynth.Population.from_file(
             population_file
         ).to_sub_population()
@@ -50,6 +75,16 @@ class Universe(object, metaclass=abc.ABCMeta):
 
         self._save_path: Path = Path(save_path)
 
+        # the GRBs can either go into their own files or
+        # into one consolidated store. In the latter case each
+        # worker writes its own shard and these are merged
+
+        self._store_file: Optional[Path] = None
+
+        if store_file is not None:
+
+            self._store_file = self._save_path / store_file
+
         assert sum(self._population.selection) == len(
             self._population.selection
         ), "The population seems to have had a prior selection on it. This is not good"
@@ -89,6 +124,19 @@ class Universe(object, metaclass=abc.ABCMeta):
 
     def _contstruct_parameter_servers(self) -> None:
 
+        grb_seeds = spawn_seed_sequences(self._seed_sequence, self._n_grbs)
+
+        if self._store_file is not None:
+
+            # the shards are named after this universe so that
+            # the shards left by another run, whose process and
+            # thread ids may be reused, are never appended to or
+            # merged into the store
+
+            shard_base = Path(
+                f"{self._store_file.with_suffix('')}_{uuid.uuid4().hex}"
+            )
+
         for i in range(self._n_grbs):
             param_dict: Dict[str, float] = {}
 
@@ -101,6 +149,8 @@ class Universe(object, metaclass=abc.ABCMeta):
             # this is temporary
             param_dict["T0"] = 0.0
 
+            param_dict["seed"] = grb_seeds[i]
+
             for k, v in self._local_parameters.items():
 
                 param_dict[k] = v[i]
@@ -109,9 +159,15 @@ class Universe(object, metaclass=abc.ABCMeta):
                 **param_dict
             )
 
-            file_name: Path = self._save_path / f"{self._name[i]}_store.h5"
+            if self._store_file is None:
+
+                file_name: Path = self._save_path / f"{self._name[i]}_store.h5"
+
+                param_server.set_file_path(file_name)
+
+            else:
 
-            param_server.set_file_path(file_name)
+                param_server.set_shard_base(shard_base)
 
             self._parameter_servers.append(param_server)
 
@@ -125,29 +181,86 @@ class Universe(object, metaclass=abc.ABCMeta):
         Launch the creation of the Universe of GRBs.
         If no client is passed, it is done serially.
 
-        :param client:
+        :param client: a dask client or a concurrent.futures executor
         :returns:
         :rtype:
 
         """
 
-        if client is not None:
+        batch_size: int = cosmogrb_config.multiprocess.grb_batch_size
 
-            futures = client.map(self._grb_wrapper, self._parameter_servers)
-            res = client.gather(futures)
+        # only dask tasks can submit the detectors as tasks of their
+        # own. In a local pool they are simulated inside the task
 
-            del futures
-            del res
+        serial: bool = not is_dask_client(client)
 
-        else:
+        # the tasks only carry the wrapper class and the
+        # parameter servers, never the universe itself
+
+        if (client is not None) and (batch_size > 0):
+
+            # pack the GRBs into batches of about the same cost
+            # each of which is a single task
+
+            n_batches = int(np.ceil(self._n_grbs / batch_size))
+
+            costs = np.array([ps.cost for ps in self._parameter_servers])
+
+            batches = [
+                [self._parameter_servers[i] for i in batch]
+                for batch in balance_batches(costs, n_batches)
+            ]
+
+            logger.debug(f"submitting {len(batches)} batches of GRBs")
 
             res = [
-                self._grb_wrapper(ps, serial=True)
-                for ps in self._parameter_servers
+                wrapper
+                for batch in executor_map(
+                    functools.partial(
+                        _simulate_grb_batch, self._grb_wrapper_type
+                    ),
+                    batches,
+                    client,
+                    chunk_size=1,
+                )
+                for wrapper in batch
             ]
 
+        else:
+
+            res = executor_map(
+                functools.partial(
+                    _simulate_grb, self._grb_wrapper_type, serial=serial
+                ),
+                self._parameter_servers,
+                client,
+            )
+
+        if self._store_file is not None:
+
+            # collect the shards the workers wrote to
+
+            shard_files = list(
+                dict.fromkeys(wrapper.shard_file for wrapper in res)
+            )
+
+            logger.debug(
+                f"merging {len(shard_files)} shards into {self._store_file}"
+            )
+
+            merge_shards(shard_files, self._store_file)
+
+        del res
+
         self._is_processed = True
 
+    @property
+    def seed(self) -> int:
+        """
+        the entropy of the master seed
+        """
+        return self._seed_sequence.entropy
+
     def save(self, file_name: Union[str, Path]) -> None:
         """
 
@@ -162,12 +275,21 @@ class Universe(object, metaclass=abc.ABCMeta):
 
         if self._is_processed:
 
-            grb_save_files = [
-                (
-                    self._save_path / f"{self._grb_base_name}_{i}_store.h5"
-                ).absolute()
-                for i in range(self._n_grbs)
-            ]
+            if self._store_file is None:
+
+                grb_save_files = [
+                    (
+                        self._save_path / f"{self._grb_base_name}_{i}_store.h5"
+                    ).absolute()
+                    for i in range(self._n_grbs)
+                ]
+
+            else:
+
+                grb_save_files = [
+                    make_location(self._store_file.absolute(), name)
+                    for name in self._name
+                ]
 
             # create a survey file to save all the information from the run
 
@@ -178,8 +300,12 @@ class Universe(object, metaclass=abc.ABCMeta):
 
             survey.write(file_name)
 
+    @property
     @abc.abstractmethod
-    def _grb_wrapper(self, parameter_server, serial=False):
+    def _grb_wrapper_type(self):
+        """
+        the GRBWrapper class that simulates and saves a GRB
+        """
 
         NotImplementedError()
 
@@ -189,6 +315,69 @@ class Universe(object, metaclass=abc.ABCMeta):
         NotImplementedError()
 
 
+def _simulate_grb(wrapper_type, parameter_server, serial=False):
+    """
+    simulate and save one GRB. This is the task that is
+    sent to the workers
+
+    :param wrapper_type: the GRBWrapper class
+    :param parameter_server:
+    :param serial: process the detectors one after the other
+    :returns:
+    :rtype:
+
+    """
+
+    return wrapper_type(parameter_server, serial=serial)
+
+
+def _simulate_grb_batch(wrapper_type, parameter_servers):
+    """
+    simulate a batch of GRBs in one task. The detectors
+    are processed here rather than in nested tasks
+
+    :param wrapper_type: the GRBWrapper class
+    :param parameter_servers:
+    :returns:
+    :rtype:
+
+    """
+
+    return [wrapper_type(ps, serial=True) for ps in parameter_servers]
+
+
+def balance_batches(costs: ArrayLike, n_batches: int) -> List[List[int]]:
+    """
+    split items into batches of about the same total cost.
+    The most expensive items are placed first, each into the
+    batch with the lowest cost so far
+
+    :param costs: the cost of each item
+    :param n_batches: the number of batches
+    :returns: the indices of the items in each non-empty batch
+    :rtype:
+
+    """
+
+    costs = np.asarray(costs, dtype=float)
+
+    assert n_batches > 0, "there must be at least one batch"
+
+    batches: List[List[int]] = [[] for _ in range(n_batches)]
+
+    loads = [(0.0, b) for b in range(n_batches)]
+
+    for i in np.argsort(-costs, kind="stable"):
+
+        load, b = heapq.heappop(loads)
+
+        batches[b].append(int(i))
+
+        heapq.heappush(loads, (load + costs[i], b))
+
+    return [sorted(batch) for batch in batches if batch]
+
+
 class ParameterServer(object):
     def __init__(
         self,
@@ -222,6 +411,7 @@ class ParameterServer(object):
             self._parameters[k] = v
 
         self._file_path: Optional[Path] = None
+        self._shard_base: Optional[Path] = None
 
     @property
     def parameters(self) -> Dict[str, float]:
@@ -235,6 +425,34 @@ class ParameterServer(object):
     def file_path(self) -> Path:
         return self._file_path
 
+    @property
+    def cost(self) -> float:
+        """
+        a rough estimate of how expensive the GRB is
+        to simulate: duration x peak flux
+        """
+
+        return self._parameters["duration"] * self._parameters.get(
+            "peak_flux", 1.0
+        )
+
+    def set_shard_base(self, shard_base: Path) -> None:
+        """
+        save the GRB into a shard of a consolidated
+        store rather than its own file
+
+        :param shard_base: the store file name without extension
+        :returns:
+        :rtype:
+
+        """
+
+        self._shard_base: Path = shard_base
+
+    @property
+    def shard_base(self) -> Optional[Path]:
+        return self._shard_base
+
     def __repr__(self):
 
         sep = "\n"
@@ -261,10 +479,29 @@ class GRBWrapper(object, metaclass=abc.ABCMeta):
 
             grb.go(serial=serial)
 
-        grb.save(parameter_server.file_path, clean_up=True)
+        self._shard_file: Optional[str] = None
+
+        if parameter_server.shard_base is not None:
+
+            # each worker has its own shard in which
+            # the GRB gets a group
+
+            self._shard_file = shard_file_name(parameter_server.shard_base)
+
+            location = make_location(self._shard_file, grb.name)
+
+        else:
+
+            location = parameter_server.file_path
+
+        grb.save(location, clean_up=True)
 
         del grb
 
+    @property
+    def shard_file(self) -> Optional[str]:
+        return self._shard_file
+
     @abc.abstractmethod
     def _grb_type(self, **kwargs):
 
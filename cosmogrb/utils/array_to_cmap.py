@@ -1,7 +1,3 @@
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-
-
 def array_to_cmap(values, cmap, use_log=False):
     """
     Generates a color map and color list that is normalized
@@ -14,6 +10,9 @@ def array_to_cmap(values, cmap, use_log=False):
 
     """
 
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
     if use_log:
 
         norm = mpl.colors.LogNorm(vmin=min(values), vmax=max(values))
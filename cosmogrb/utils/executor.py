@@ -0,0 +1,194 @@
+import collections
+import concurrent.futures
+import itertools
+from typing import Any, Callable, Iterable, List, Optional
+
+from cosmogrb import cosmogrb_config
+from cosmogrb.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# the work of a run can be handed to a dask client or to any
+# concurrent.futures style executor (a process or thread pool).
+# Both have a submit method returning futures with a result
+# method, which is all that is used here
+
+
+def is_dask_client(executor) -> bool:
+    """
+    is the executor a dask client. This is checked without
+    importing dask
+
+    :param executor:
+    :returns:
+    :rtype:
+
+    """
+
+    return type(executor).__module__.split(".")[0] == "distributed"
+
+
+def _map_chunk(func: Callable, chunk: List[Any]) -> List[Any]:
+
+    return [func(item) for item in chunk]
+
+
+def _chunks(items: Iterable, chunk_size: int):
+
+    iterator = iter(items)
+
+    while True:
+
+        chunk = list(itertools.islice(iterator, chunk_size))
+
+        if not chunk:
+
+            return
+
+        yield chunk
+
+
+def executor_map(
+    func: Callable,
+    items: Iterable,
+    executor=None,
+    chunk_size: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> List[Any]:
+    """
+    map a function over items with an executor. The items are
+    submitted in chunks and at most max_in_flight chunks are
+    waited on at any time so that the results of a large run
+    do not pile up. The results are in the order of the items
+
+    :param func: a picklable function of one item
+    :param items:
+    :param executor: a dask client, an executor or None to run serially
+    :param chunk_size: the number of items per task
+    :param max_in_flight: the number of tasks submitted but not yet collected
+    :returns:
+    :rtype:
+
+    """
+
+    if executor is None:
+
+        return [func(item) for item in items]
+
+    if chunk_size is None:
+
+        chunk_size = cosmogrb_config.multiprocess.chunk_size
+
+    if max_in_flight is None:
+
+        max_in_flight = cosmogrb_config.multiprocess.max_in_flight
+
+    assert chunk_size > 0, "the chunk size must be positive"
+    assert max_in_flight > 0, "at least one task must be in flight"
+
+    # dask would otherwise merge tasks with the same arguments
+
+    kwargs = dict(pure=False) if is_dask_client(executor) else {}
+
+    in_flight = collections.deque()
+
+    results = []
+
+    for chunk in _chunks(items, chunk_size):
+
+        if len(in_flight) >= max_in_flight:
+
+            results.extend(in_flight.popleft().result())
+
+        in_flight.append(executor.submit(_map_chunk, func, chunk, **kwargs))
+
+    while in_flight:
+
+        results.extend(in_flight.popleft().result())
+
+    return results
+
+
+def initialize_worker(gbm_response: bool = False) -> None:
+    """
+    prepare a worker process of a pool. The numba kernels are
+    compiled (or loaded from the on-disk cache) once per process
+    rather than in the first task. The GBM response generator is
+    otherwise built when it is first used
+
+    :param gbm_response: also build the GBM response generator
+    :returns:
+    :rtype:
+
+    """
+
+    from cosmogrb.utils.jit_warmup import warmup
+
+    logger.debug("warming up a worker")
+
+    warmup(gbm=False)
+
+    if gbm_response:
+
+        from cosmogrb.instruments.gbm.response_generator import (
+            get_gbm_response_generator,
+        )
+
+        get_gbm_response_generator()
+
+
+def process_pool(
+    n_workers: Optional[int] = None,
+    warmup: bool = True,
+    gbm_response: bool = False,
+) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    a local process pool to run a universe or a survey
+    without a dask scheduler
+
+    :param n_workers: the number of processes (n_grb_workers by default)
+    :param warmup: compile the kernels in each process when it starts
+    :param gbm_response: also build the GBM response generator in each process
+    :returns:
+    :rtype:
+
+    """
+
+    if n_workers is None:
+
+        n_workers = cosmogrb_config.multiprocess.n_grb_workers
+
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=initialize_worker if warmup else None,
+        initargs=(gbm_response,) if warmup else (),
+    )
+
+
+def thread_pool(
+    n_workers: Optional[int] = None,
+) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    a local thread pool. This only helps for the parts of
+    the work that release the GIL
+
+    :param n_workers: the number of threads (n_grb_workers by default)
+    :returns:
+    :rtype:
+
+    """
+
+    if n_workers is None:
+
+        n_workers = cosmogrb_config.multiprocess.n_grb_workers
+
+    return concurrent.futures.ThreadPoolExecutor(max_workers=n_workers)
+
+
+__all__ = [
+    "is_dask_client",
+    "executor_map",
+    "initialize_worker",
+    "process_pool",
+    "thread_pool",
+]
@@ -51,3 +51,41 @@ def recursively_load_dict_contents_from_group(h5file, path):
                 h5file, path + "/" + key + "/"
             )
     return ans
+
+
+def read_dataset(file_name, path, mmap=True):
+    """
+
+    read a dataset from an HDF5 file. Contiguous, uncompressed
+    datasets are memory mapped instead of read
+
+    :param file_name:
+    :param path:
+    :param mmap: memory map the dataset if possible
+    :returns:
+    :rtype:
+
+    """
+
+    with h5py.File(file_name, "r") as f:
+
+        dataset = f[path]
+
+        offset = dataset.id.get_offset()
+
+        if (
+            mmap
+            and (offset is not None)
+            and (dataset.chunks is None)
+            and (dataset.size > 0)
+        ):
+
+            return np.memmap(
+                file_name,
+                dtype=dataset.dtype,
+                mode="r",
+                offset=offset,
+                shape=dataset.shape,
+            )
+
+        return dataset[()]
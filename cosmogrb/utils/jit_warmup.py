@@ -0,0 +1,174 @@
+import numpy as np
+
+from cosmogrb.lightcurve.lightcurve import LightCurve, merge_events
+from cosmogrb.response.response import Response
+from cosmogrb.sampler.background import Background, BackgroundSpectrumTemplate
+from cosmogrb.sampler.constant_cpl import ConstantCPL
+from cosmogrb.sampler.cpl_source import CPLSourceFunction
+from cosmogrb.sampler.source import Source
+from cosmogrb.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# the kernels are compiled by running the same code as a
+# simulation so that they get the same types as in production
+
+
+def _warmup_response():
+
+    # every photon lands in its own channel
+
+    energy_edges = np.logspace(1, 4, 129)
+
+    energy_mean = np.sqrt(energy_edges[:-1] * energy_edges[1:])
+
+    matrix = np.diag(100.0 * np.exp(-((np.log10(energy_mean) - 2.0) ** 2)))
+
+    return Response(
+        matrix=matrix,
+        geometric_area=200.0,
+        energy_edges=energy_edges,
+        channel_edges=energy_edges.copy(),
+    )
+
+
+def _warmup_light_curves(seed):
+    """
+    simulate a light curve of each source function with a
+    synthetic response and background
+
+    :param seed:
+    :returns: the light curve storages
+    :rtype:
+
+    """
+
+    response = _warmup_response()
+
+    template = BackgroundSpectrumTemplate(np.ones(128))
+
+    source_functions = (
+        CPLSourceFunction(
+            peak_flux=1e-6,
+            ep_start=300.0,
+            ep_tau=2.0,
+            alpha=-0.66,
+            trise=0.1,
+            tdecay=0.5,
+            response=response,
+        ),
+        ConstantCPL(peak_flux=1e-6, ep=300.0, alpha=-0.66, response=response),
+    )
+
+    rng = np.random.default_rng(seed)
+
+    storages = []
+
+    for source_function in source_functions:
+
+        source = Source(
+            0.0, 1.0, source_function, z=1.0, use_plaw_sample=True, rng=rng
+        )
+
+        background = Background(
+            -5.0,
+            5.0,
+            average_rate=500,
+            background_spectrum_template=template,
+            rng=rng,
+        )
+
+        lc = LightCurve(
+            "warmup",
+            source,
+            background,
+            response,
+            instrument="GBM",
+            tstart=-5.0,
+            tstop=5.0,
+        )
+
+        storages.append(lc.process())
+
+    return storages
+
+
+def _warmup_gbm(seed):
+
+    from cosmogrb.instruments.gbm.gbm_grb import (
+        GBMGRB_CPL,
+        GBMGRB_CPL_Constant,
+    )
+
+    params = dict(
+        name="warmup",
+        ra=312.0,
+        dec=-62.0,
+        z=1.0,
+        peak_flux=1e-7,
+        alpha=-0.66,
+        duration=1.0,
+        T0=0.0,
+        seed=seed,
+    )
+
+    GBMGRB_CPL(
+        ep_start=500.0, ep_tau=2.0, trise=0.1, tdecay=0.5, **params
+    ).go(serial=True)
+
+    GBMGRB_CPL_Constant(ep=500.0, **params).go(serial=True)
+
+
+def warmup(gbm: bool = True, seed: int = 1234) -> None:
+    """
+    compile the numba kernels of the samplers, the light curves
+    and the GBM trigger. They are written to the on-disk cache
+    of numba (see jit_cache in the configuration for where) so
+    that other processes load them instead of compiling. It is
+    enough to run this once per version of cosmogrb
+
+    :param gbm: also simulate a short GBM GRB. This needs the
+    GBM orbit and response data
+    :param seed: the seed of the simulations
+    :returns:
+    :rtype:
+
+    """
+
+    from cosmogrb.instruments.gbm.gbm_lightcurve import _gbm_dead_time
+    from cosmogrb.instruments.gbm.gbm_lightcurve_analyzer import (
+        GBMLightCurveAnalyzer,
+        evaluate_detectors,
+    )
+
+    logger.debug("compiling the sampler and light curve kernels")
+
+    storages = _warmup_light_curves(seed)
+
+    for lc in storages:
+
+        _gbm_dead_time(
+            *merge_events(
+                lc.times_background,
+                lc.pha_background,
+                lc.times_source,
+                lc.pha_source,
+            )
+        )
+
+        GBMLightCurveAnalyzer(lc)
+
+        lc.binned_counts(0.064, 8.0, 1000.0)
+
+        lc.get_idx_over_interval(-1.0, 1.0)
+
+    evaluate_detectors(storages)
+
+    if gbm:
+
+        logger.debug("compiling the GBM kernels")
+
+        _warmup_gbm(seed)
+
+
+__all__ = ["warmup"]
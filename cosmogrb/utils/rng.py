@@ -0,0 +1,73 @@
+from typing import List, Optional, Union
+
+import numpy as np
+
+from cosmogrb.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+SeedLike = Optional[Union[int, np.random.SeedSequence]]
+
+
+def get_seed_sequence(seed: SeedLike = None) -> np.random.SeedSequence:
+    """
+    turn a seed into a SeedSequence. If no seed is given
+    one is drawn from the OS entropy and logged so that
+    the run can be replayed
+
+    :param seed: an integer, a SeedSequence or None
+    :returns:
+    :rtype:
+
+    """
+
+    if isinstance(seed, np.random.SeedSequence):
+
+        return seed
+
+    seed_sequence = np.random.SeedSequence(seed)
+
+    if seed is None:
+
+        logger.debug(f"drew the master seed {seed_sequence.entropy}")
+
+    return seed_sequence
+
+
+def spawn_seed_sequences(
+    seed: SeedLike, n: int
+) -> List[np.random.SeedSequence]:
+    """
+    derive n independent streams from a seed
+
+    :param seed: an integer, a SeedSequence or None
+    :param n: number of streams
+    :returns:
+    :rtype:
+
+    """
+
+    return get_seed_sequence(seed).spawn(n)
+
+
+def get_rng(
+    rng: Optional[Union[np.random.Generator, int, np.random.SeedSequence]] = None
+) -> np.random.Generator:
+    """
+    return a random number generator. Generators are passed
+    through, anything else is used as a seed
+
+    :param rng:
+    :returns:
+    :rtype:
+
+    """
+
+    if isinstance(rng, np.random.Generator):
+
+        return rng
+
+    return np.random.default_rng(get_seed_sequence(rng))
+
+
+__all__ = ["get_seed_sequence", "spawn_seed_sequences", "get_rng"]
@@ -1,9 +1,5 @@
 # from 3ML
 
-import copy
-from operator import attrgetter, itemgetter
-
-import matplotlib.pyplot as plt
 import numpy as np
 
 from cosmogrb.utils.plotting import step_plot
@@ -218,13 +214,54 @@ class TimeInterval(object):
 
 class TimeIntervalSet(object):
     """
-    A set of intervals
+    A set of intervals. The starts, stops, counts and dead times
+    are stored as arrays and TimeInterval objects are only
+    created when they are requested
 
     """
 
     def __init__(self, list_of_intervals=()):
 
-        self._intervals = list(list_of_intervals)
+        list_of_intervals = list(list_of_intervals)
+
+        counts = [interval.counts for interval in list_of_intervals]
+
+        if any(c is None for c in counts):
+
+            counts = None
+
+        self._set_arrays(
+            [interval.start for interval in list_of_intervals],
+            [interval.stop for interval in list_of_intervals],
+            counts,
+            [interval.dead_time for interval in list_of_intervals],
+        )
+
+    def _set_arrays(self, starts, stops, counts=None, dead_times=None):
+
+        self._starts = np.array(starts, dtype=float).reshape(-1)
+        self._stops = np.array(stops, dtype=float).reshape(-1)
+
+        if counts is not None:
+
+            counts = np.asarray(counts).reshape(-1)
+
+        self._counts = counts
+
+        if dead_times is None:
+
+            dead_times = np.zeros_like(self._starts)
+
+        self._dead_times = np.array(dead_times, dtype=float).reshape(-1)
+
+    @classmethod
+    def _from_arrays(cls, starts, stops, counts=None, dead_times=None):
+
+        new_set = cls.__new__(cls)
+
+        new_set._set_arrays(starts, stops, counts, dead_times)
+
+        return new_set
 
     @classmethod
     def from_starts_and_stops(cls, starts, stops, counts=None, dead_time=None):
@@ -253,10 +290,6 @@ class TimeIntervalSet(object):
                 % (len(starts), len(counts))
             )
 
-        else:
-
-            counts = [None] * len(starts)
-
         if dead_time is not None:
 
             assert len(starts) == len(dead_time), (
@@ -264,16 +297,15 @@ class TimeIntervalSet(object):
                 % (len(starts), len(dead_time))
             )
 
-        else:
-
-            dead_time = [0] * len(starts)
+        new_set = cls._from_arrays(starts, stops, counts, dead_time)
 
-        list_of_intervals = []
+        if np.any(new_set._stops < new_set._starts):
 
-        for imin, imax, ic, idt in zip(starts, stops, counts, dead_time):
-            list_of_intervals.append(TimeInterval(imin, imax, ic, idt))
+            raise RuntimeError(
+                "Invalid time interval! TSTART must be before TSTOP and TSTOP-TSTART >0. "
+            )
 
-        return cls(list_of_intervals)
+        return new_set
 
     @classmethod
     def from_list_of_edges(cls, edges):
@@ -289,17 +321,6 @@ class TimeIntervalSet(object):
 
         raise NotImplementedError()
 
-        # # sort the time edges
-
-        # edges.sort()
-
-        # list_of_intervals = []
-
-        # for imin, imax in zip(edges[:-1], edges[1:]):
-        #     list_of_intervals.append(cls.new_interval(imin, imax))
-
-        # return cls(list_of_intervals)
-
     def merge_intersecting_intervals(self, in_place=False):
         """
 
@@ -309,107 +330,156 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        # get a copy of the sorted intervals
+        idx = self.argsort()
 
-        sorted_intervals = self.sort()
+        starts = self._starts[idx]
+        stops = self._stops[idx]
 
-        new_intervals = []
+        if len(starts) > 0:
 
-        while len(sorted_intervals) > 1:
+            # an interval starts a new group if it begins after
+            # all the previous intervals have stopped
 
-            # pop the first interval off the stack
+            running_stop = np.maximum.accumulate(stops)
 
-            this_interval = sorted_intervals.pop(0)
-
-            # see if that interval overlaps with the the next one
+            new_group = np.ones(len(starts), dtype=bool)
+            new_group[1:] = (starts[1:] >= running_stop[:-1]) & (
+                starts[1:] != starts[:-1]
+            )
 
-            if this_interval.overlaps_with(sorted_intervals[0]):
+            group_idx = np.flatnonzero(new_group)
 
-                # if so, pop the next one
+            new_starts = starts[group_idx]
+            new_stops = np.maximum.reduceat(stops, group_idx)
 
-                next_interval = sorted_intervals.pop(0)
+            new_dead_times = np.add.reduceat(self._dead_times[idx], group_idx)
 
-                # and merge the two, appending them to the new intervals
+            if self._counts is not None:
 
-                new_intervals.append(this_interval.merge(next_interval))
+                new_counts = np.add.reduceat(self._counts[idx], group_idx)
 
             else:
 
-                # otherwise just append this interval
+                new_counts = None
 
-                new_intervals.append(this_interval)
+        else:
 
-                # now if there is only one interval left
-                # it should not overlap with any other interval
-                # and the loop will stop
-                # otherwise, we continue
+            new_starts, new_stops, new_counts, new_dead_times = (
+                starts,
+                stops,
+                None,
+                None,
+            )
 
-        # if there was only one interval
-        # or a leftover from the merge
-        # we append it
-        if sorted_intervals:
+        if in_place:
 
-            assert (
-                len(sorted_intervals) == 1
-            ), "there should only be one interval left over, this is a bug"  # pragma: no cover
+            self._set_arrays(new_starts, new_stops, new_counts, new_dead_times)
 
-            # we want to make sure that the last new interval did not
-            # overlap with the final interval
-            if new_intervals:
+        else:
 
-                if new_intervals[-1].overlaps_with(sorted_intervals[0]):
+            return TimeIntervalSet._from_arrays(
+                new_starts, new_stops, new_counts, new_dead_times
+            )
 
-                    new_intervals[-1] = new_intervals[-1].merge(
-                        sorted_intervals[0]
-                    )
+    def extend(self, list_of_intervals):
 
-                else:
+        if not isinstance(list_of_intervals, TimeIntervalSet):
 
-                    new_intervals.append(sorted_intervals[0])
+            list_of_intervals = TimeIntervalSet(list_of_intervals)
 
-            else:
+        if (self._counts is not None) and (
+            list_of_intervals._counts is not None
+        ):
 
-                new_intervals.append(sorted_intervals[0])
+            counts = np.append(self._counts, list_of_intervals._counts)
 
-        if in_place:
+        else:
 
-            self.__init__(new_intervals)
+            counts = None
 
-        else:
+        self._set_arrays(
+            np.append(self._starts, list_of_intervals._starts),
+            np.append(self._stops, list_of_intervals._stops),
+            counts,
+            np.append(self._dead_times, list_of_intervals._dead_times),
+        )
 
-            return TimeIntervalSet(new_intervals)
+    def _get_interval(self, i):
 
-    def extend(self, list_of_intervals):
+        counts = None
+
+        if self._counts is not None:
+
+            counts = self._counts[i]
+
+        return TimeInterval(
+            self._starts[i], self._stops[i], counts, self._dead_times[i]
+        )
 
-        self._intervals.extend(list_of_intervals)
+    def _select(self, item):
+
+        counts = None
+
+        if self._counts is not None:
+
+            counts = self._counts[item]
+
+        return TimeIntervalSet._from_arrays(
+            self._starts[item],
+            self._stops[item],
+            counts,
+            self._dead_times[item],
+        )
 
     def __len__(self):
 
-        return len(self._intervals)
+        return len(self._starts)
 
     def __iter__(self):
 
-        for interval in self._intervals:
-            yield interval
+        for i in range(len(self)):
+            yield self._get_interval(i)
 
     def __getitem__(self, item):
 
-        return self._intervals[item]
+        if np.isscalar(item):
+
+            return self._get_interval(item)
+
+        # slices and masks give a new set
+
+        return self._select(item)
 
     def __eq__(self, other):
 
-        for interval_this, interval_other in zip(
-            self.argsort(), other.argsort()
-        ):
+        if len(self) != len(other):
+
+            return False
 
-            if not self[interval_this] == other[interval_other]:
-                return False
+        this = self.sort()
+        other = other.sort()
 
-        return True
+        return np.all(this.starts == other.starts) and np.all(
+            this.stops == other.stops
+        )
 
     def pop(self, index):
 
-        return self._intervals.pop(index)
+        interval = self._get_interval(index)
+
+        keep = np.ones(len(self), dtype=bool)
+        keep[index] = False
+
+        selected = self._select(keep)
+
+        self._set_arrays(
+            selected._starts,
+            selected._stops,
+            selected._counts,
+            selected._dead_times,
+        )
+
+        return interval
 
     def sort(self):
         """
@@ -418,15 +488,7 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        if self.is_sorted:
-
-            return copy.deepcopy(self)
-
-        else:
-
-            return TimeIntervalSet(
-                np.atleast_1d(itemgetter(*self.argsort())(self._intervals))
-            )
+        return self._select(self.argsort())
 
     def argsort(self):
         """
@@ -435,10 +497,7 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        # Gather all tstarts
-        tstarts = [x.start for x in self._intervals]
-
-        return [x[0] for x in sorted(enumerate(tstarts), key=itemgetter(1))]
+        return np.argsort(self._starts, kind="stable").tolist()
 
     def is_contiguous(self, relative_tolerance=1e-5):
         """
@@ -448,10 +507,9 @@ class TimeIntervalSet(object):
         :return: True or False
         """
 
-        starts = [attrgetter("start")(x) for x in self._intervals]
-        stops = [attrgetter("stop")(x) for x in self._intervals]
-
-        return np.allclose(starts[1:], stops[:-1], rtol=relative_tolerance)
+        return np.allclose(
+            self._starts[1:], self._stops[:-1], rtol=relative_tolerance
+        )
 
     @property
     def is_sorted(self):
@@ -460,7 +518,7 @@ class TimeIntervalSet(object):
         :return: True or False
         """
 
-        return np.all(self.argsort() == np.arange(len(self)))
+        return bool(np.all(np.diff(self._starts) >= 0))
 
     def containing_bin(self, value):
         """
@@ -471,7 +529,7 @@ class TimeIntervalSet(object):
 
         # Get the index of the first ebounds upper bound larger than energy
         # (but never go below zero or above the last channel)
-        idx = min(max(0, np.searchsorted(self.edges, value) - 1), len(self))
+        idx = np.clip(np.searchsorted(self.edges, value) - 1, 0, len(self))
 
         return idx
 
@@ -488,12 +546,11 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        # loop only once because every call unpacks the array
         # we need to round for the comparison because we may have read from
         # strings which are rounded to six decimals
 
-        starts = np.round(self.starts, decimals=6)
-        stops = np.round(self.stops, decimals=6)
+        starts = np.round(self._starts, decimals=6)
+        stops = np.round(self._stops, decimals=6)
 
         start = np.round(start, decimals=6)
         stop = np.round(stop, decimals=6)
@@ -517,7 +574,7 @@ class TimeIntervalSet(object):
 
         else:
 
-            return TimeIntervalSet(np.asarray(self._intervals)[condition])
+            return self._select(condition)
 
     @property
     def starts(self):
@@ -527,7 +584,7 @@ class TimeIntervalSet(object):
         :return: list of start times
         """
 
-        return np.array([interval.start for interval in self._intervals])
+        return self._starts
 
     @property
     def stops(self):
@@ -537,32 +594,45 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        return np.array([interval.stop for interval in self._intervals])
+        return self._stops
 
     @property
     def counts(self):
 
-        return np.array([interval.counts for interval in self._intervals])
+        if self._counts is None:
+
+            return np.full(len(self), None)
+
+        return self._counts
+
+    @property
+    def dead_times(self):
+
+        return self._dead_times
 
     @property
     def rates(self):
 
-        return np.array([interval.rate for interval in self._intervals])
+        if self._counts is None:
+
+            return np.full(len(self), None)
+
+        return self._counts / self.exposures
 
     @property
     def exposures(self):
 
-        return np.array([interval.exposure for interval in self._intervals])
+        return (self._stops - self._starts) - self._dead_times
 
     @property
     def mid_points(self):
 
-        return np.array([interval.mid_point for interval in self._intervals])
+        return (self._starts + self._stops) / 2.0
 
     @property
     def widths(self):
 
-        return np.array([interval._get_width() for interval in self._intervals])
+        return self._stops - self._starts
 
     @property
     def absolute_start(self):
@@ -571,7 +641,7 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        return min(self.starts)
+        return self._starts.min()
 
     @property
     def absolute_stop(self):
@@ -580,7 +650,7 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        return max(self.stops)
+        return self._stops.max()
 
     @property
     def edges(self):
@@ -591,16 +661,7 @@ class TimeIntervalSet(object):
 
         if self.is_contiguous() and self.is_sorted:
 
-            edges = [
-                interval.start
-                for interval in itemgetter(*self.argsort())(self._intervals)
-            ]
-            edges.append(
-                [
-                    interval.stop
-                    for interval in itemgetter(*self.argsort())(self._intervals)
-                ][-1]
-            )
+            edges = np.append(self._starts, self._stops[-1])
 
         else:
 
@@ -618,7 +679,10 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        return ",".join([interval.to_string() for interval in self._intervals])
+        return ",".join(
+            "%f-%f" % (start, stop)
+            for start, stop in zip(self._starts, self._stops)
+        )
 
     @property
     def bin_stack(self):
@@ -630,7 +694,7 @@ class TimeIntervalSet(object):
         :return:
         """
 
-        return np.vstack((self.starts, self.stops)).T
+        return np.vstack((self._starts, self._stops)).T
 
     def __add__(self, number):
         """
@@ -640,13 +704,13 @@ class TimeIntervalSet(object):
         :return: new TimeIntervalSet instance
         """
 
-        new_set = TimeIntervalSet()
-        new_set.extend(
-            [time_interval + number for time_interval in self._intervals]
+        return TimeIntervalSet._from_arrays(
+            self._starts + number,
+            self._stops + number,
+            self._counts,
+            self._dead_times,
         )
 
-        return new_set
-
     def __sub__(self, number):
         """
         Shift all time intervals to the left by number (in place)
@@ -655,11 +719,7 @@ class TimeIntervalSet(object):
         :return: new TimeIntervalSet instance
         """
 
-        new_set = TimeIntervalSet(
-            [time_interval - number for time_interval in self._intervals]
-        )
-
-        return new_set
+        return self + (-number)
 
     def plot_intervals(self, as_rates=True, ax=None, **kwargs):
         """
@@ -674,6 +734,8 @@ class TimeIntervalSet(object):
 
         if ax is None:
 
+            import matplotlib.pyplot as plt
+
             fig, ax = plt.subplots()
 
         else: